@@ -0,0 +1,92 @@
+# autosave.py
+# 機能：オートセーブのタイミングを決める
+#
+# バトル終了やメニューを閉じたときに「変更あり」の印をつけるだけで、
+# すぐには書き込まない。続けて何度印がついても1回のセーブにまとめ、
+# 前回のセーブから min_interval 秒たつまでは書き込まない。
+# さらに、フレームの処理時間に余裕があるときか、
+# 落ち着いたシーン（フィールド・メニューなど）にいるときにだけセーブする。
+
+import time
+
+DEFAULT_MIN_INTERVAL = 60.0     # セーブの最短間隔（秒）
+DEFAULT_SETTLE_DELAY = 0.5      # 最後の印から待つ時間（秒）。連続した印をまとめる
+DEFAULT_FRAME_BUDGET_MS = 1000 / 60
+DEFAULT_SPARE_RATIO = 0.5       # 直前のフレームがこの割合以下の処理時間なら「余裕あり」
+
+
+class AutosaveScheduler:
+    """オートセーブの予約と実行を管理するクラス"""
+    def __init__(self, save_func, is_busy=None, min_interval=DEFAULT_MIN_INTERVAL,
+                 settle_delay=DEFAULT_SETTLE_DELAY, frame_budget_ms=DEFAULT_FRAME_BUDGET_MS,
+                 spare_ratio=DEFAULT_SPARE_RATIO, clock=time.monotonic):
+        """
+        save_func: セーブを行う関数（成功したら True を返す）
+        is_busy: 前のセーブをまだ書き込み中なら True を返す関数
+        """
+        self.save_func = save_func
+        self.is_busy = is_busy
+        self.min_interval = min_interval
+        self.settle_delay = settle_delay
+        self.frame_budget_ms = frame_budget_ms
+        self.spare_ratio = spare_ratio
+        self.clock = clock
+        self.enabled = True
+
+        self.dirty = False
+        self.dirty_reasons = []      # まとめられた印の理由（ログ用）
+        self._last_dirty_time = 0.0
+        self._last_save_time = clock()
+
+        # 統計
+        self.trigger_count = 0  # 印がついた回数
+        self.save_count = 0     # 実際にセーブした回数
+
+    def mark_dirty(self, reason=""):
+        """状態が変わったことを記録する（書き込みはしない）"""
+        self.dirty = True
+        self.dirty_reasons.append(reason)
+        self._last_dirty_time = self.clock()
+        self.trigger_count += 1
+
+    def mark_clean(self):
+        """手動セーブやロードの直後など、ディスクと状態が一致したときに呼ぶ"""
+        self.dirty = False
+        self.dirty_reasons = []
+        self._last_save_time = self.clock()
+
+    def has_spare_budget(self, raw_frame_ms):
+        """直前のフレームの処理時間に余裕があったかどうか"""
+        return raw_frame_ms <= self.frame_budget_ms * self.spare_ratio
+
+    def is_due(self):
+        """時間の条件（まとめ待ち・最短間隔）を満たしているかどうか"""
+        if not (self.enabled and self.dirty):
+            return False
+        now = self.clock()
+        if now - self._last_dirty_time < self.settle_delay:
+            return False
+        return now - self._last_save_time >= self.min_interval
+
+    def update(self, raw_frame_ms, quiet_scene):
+        """
+        毎フレーム呼ぶ。条件がそろったらセーブして True を返す。
+        raw_frame_ms: 直前のフレームの処理時間（clock.get_rawtime()）
+        quiet_scene: 落ち着いたシーンにいるかどうか
+        """
+        if not self.is_due():
+            return False
+        if not (quiet_scene or self.has_spare_budget(raw_frame_ms)):
+            return False
+        if self.is_busy and self.is_busy():
+            return False  # 前の書き込みが終わるまで待つ（その間の変更もまとめて書く）
+
+        reasons = ", ".join(r for r in self.dirty_reasons if r)
+        print(f"オートセーブ ({reasons})" if reasons else "オートセーブ")
+        if self.save_func():
+            self.mark_clean()
+            self.save_count += 1
+            return True
+        # 失敗したときは最短間隔だけ待ってからやり直す
+        self._last_save_time = self.clock()
+        return False
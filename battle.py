@@ -1,6 +1,7 @@
 # battle.py
 # 機能：戦闘に関する全てのロジックを管理する
 
+import heapq
 import random
 from monster import Monster
 from types_data import get_effectiveness
@@ -231,6 +232,73 @@ class Battle:
         messages, new_move = self.player_monster.gain_exp(exp_yield)
         return messages, new_move
 
+    def _effective_speed(self, monster):
+        """行動順の判定に使うすばやさ（まひ状態なら半減）"""
+        speed = monster.speed
+        if monster.status_condition == "paralysis": speed /= 2
+        return speed
+
+    def _is_enemy(self, monster):
+        """相手側のモンスターかどうか（メッセージの「あいての」表示用）"""
+        return monster is self.enemy_monster
+
+    def _execute_action(self, attacker, defender, move):
+        """1体のモンスターが1回の攻撃を行う処理。相手がひんしになったかを返す。"""
+        # 行動開始前の状態異常チェック（こおり、ねむり、まひ）
+        if attacker.status_condition == "freeze":
+            if random.random() < 0.2:
+                self._log_message(f"{attacker.name} の こおりが とけた！")
+                attacker.status_condition = None
+            else:
+                self._log_message(f"{attacker.name} は こおってて うごけない！")
+                return defender.is_fainted() # 攻撃失敗
+        
+        if attacker.status_condition == "sleep":
+            if attacker.sleep_counter > 0:
+                self._log_message(f"{attacker.name} は ぐうぐう ねむっている！")
+                attacker.sleep_counter -= 1 # 睡眠ターンを1減らす
+                return defender.is_fainted() # 攻撃失敗
+            else:
+                self._log_message(f"{attacker.name} は めを さました！")
+                attacker.status_condition = None # ねむり状態を解除
+        
+        if attacker.status_condition == "paralysis":
+            if random.random() < 0.25:
+                self._log_message(f"{attacker.name} は からだがしびれて うごけない！")
+                return defender.is_fainted() # 攻撃失敗
+        
+        self._log_message(f"{attacker.name} の {move['name']}！")
+
+        # 命中判定を全ての技に適用
+        if 'accuracy' in move and random.random() > move['accuracy']:
+            self._log_message("しかし こうげきは はずれた！")
+            return defender.is_fainted() # 攻撃失敗
+
+        # 技のカテゴリに応じて処理を分岐
+        if move['category'] in ['physical', 'special']:
+            damage = self._calculate_damage(attacker, defender, move)
+            
+            # ダメージ処理
+            defender.take_damage(damage)
+            # UIに表示するためのメッセージをログに追加
+            # 誰がダメージを受けたか分かりやすくする
+            defender_name = f"あいての {defender.name}" if self._is_enemy(defender) else defender.name
+            self._log_message(f"{defender_name} は {damage} のダメージをうけた！")
+            
+            # 相手が倒れていなければ、追加効果の処理を行う
+            if not defender.is_fainted():
+                if defender.status_condition == "freeze" and move['type'] == 'fire':
+                    self._log_message(f"{defender.name} の こおりが とけた！")
+                    defender.status_condition = None
+                self._apply_status_effect(defender, move)
+        
+        elif move['category'] == 'status':
+            target = attacker if move["effect"].get("target") == "self" else defender
+            self._handle_status_move(attacker, target, move)
+
+        # 関数の最後に、相手がひんしになったかどうかを必ず返す
+        return defender.is_fainted()
+
     def execute_turn(self, player_move):
         """
         1ターン分の戦闘の流れを管理・実行する。
@@ -240,71 +308,10 @@ class Battle:
         print(f"\n--- ターン {self.turn} ---")
 
         # 1. すばやさを比較して行動順を決定
-        player_speed = self.player_monster.speed
-        if self.player_monster.status_condition == "paralysis": player_speed /= 2
-        enemy_speed = self.enemy_monster.speed
-        if self.enemy_monster.status_condition == "paralysis": enemy_speed /= 2
-        player_goes_first = player_speed >= enemy_speed
+        player_goes_first = self._effective_speed(self.player_monster) >= self._effective_speed(self.enemy_monster)
         
         enemy_move = random.choice(self.enemy_monster.moves)
 
-        def attack(attacker, defender, move):
-            """1体のモンスターが1回の攻撃を行う処理。"""
-            # 行動開始前の状態異常チェック（こおり、ねむり、まひ）
-            if attacker.status_condition == "freeze":
-                if random.random() < 0.2:
-                    self._log_message(f"{attacker.name} の こおりが とけた！")
-                    attacker.status_condition = None
-                else:
-                    self._log_message(f"{attacker.name} は こおってて うごけない！")
-                    return defender.is_fainted() # 攻撃失敗
-            
-            if attacker.status_condition == "sleep":
-                if attacker.sleep_counter > 0:
-                    self._log_message(f"{attacker.name} は ぐうぐう ねむっている！")
-                    attacker.sleep_counter -= 1 # 睡眠ターンを1減らす
-                    return defender.is_fainted() # 攻撃失敗
-                else:
-                    self._log_message(f"{attacker.name} は めを さました！")
-                    attacker.status_condition = None # ねむり状態を解除
-            
-            if attacker.status_condition == "paralysis":
-                if random.random() < 0.25:
-                    self._log_message(f"{attacker.name} は からだがしびれて うごけない！")
-                    return defender.is_fainted() # 攻撃失敗
-            
-            self._log_message(f"{attacker.name} の {move['name']}！")
-
-            # 命中判定を全ての技に適用
-            if 'accuracy' in move and random.random() > move['accuracy']:
-                self._log_message("しかし こうげきは はずれた！")
-                return defender.is_fainted() # 攻撃失敗
-
-            # 技のカテゴリに応じて処理を分岐
-            if move['category'] in ['physical', 'special']:
-                damage = self._calculate_damage(attacker, defender, move)
-                
-                # ダメージ処理
-                defender.take_damage(damage)
-                # UIに表示するためのメッセージをログに追加
-                # 誰がダメージを受けたか分かりやすくする
-                defender_name = f"あいての {defender.name}" if defender == self.enemy_monster else defender.name
-                self._log_message(f"{defender_name} は {damage} のダメージをうけた！")
-                
-                # 相手が倒れていなければ、追加効果の処理を行う
-                if not defender.is_fainted():
-                    if defender.status_condition == "freeze" and move['type'] == 'fire':
-                        self._log_message(f"{defender.name} の こおりが とけた！")
-                        defender.status_condition = None
-                    self._apply_status_effect(defender, move)
-            
-            elif move['category'] == 'status':
-                target = attacker if move["effect"].get("target") == "self" else defender
-                self._handle_status_move(attacker, target, move)
-
-            # 関数の最後に、相手がひんしになったかどうかを必ず返す
-            return defender.is_fainted()
-
         # 2. 行動順に沿って攻撃処理を実行
         attacker_1, defender_1, move_1 = (self.player_monster, self.enemy_monster, player_move) if player_goes_first else (self.enemy_monster, self.player_monster, enemy_move)
         attacker_2, defender_2, move_2 = (self.enemy_monster, self.player_monster, enemy_move) if player_goes_first else (self.player_monster, self.enemy_monster, player_move)
@@ -313,11 +320,11 @@ class Battle:
         else: print("(あいてが先手！)")
         
         # 1体目の攻撃
-        is_defender_1_fainted = attack(attacker_1, defender_1, move_1)
+        is_defender_1_fainted = self._execute_action(attacker_1, defender_1, move_1)
         
         # もし1体目の攻撃で相手が倒れたら、2体目の攻撃は行わない
         if not is_defender_1_fainted:
-            is_defender_2_fainted = attack(attacker_2, defender_2, move_2)
+            is_defender_2_fainted = self._execute_action(attacker_2, defender_2, move_2)
 
         # 3. ターン終了時の状態異常ダメージなどを処理
         # どちらかのポケモンが倒れていない場合のみ実行
@@ -364,4 +371,106 @@ class Battle:
 
     def is_battle_over(self):
         """戦闘が終了したかどうかを判定する。（現在この関数は未使用）"""
-        return self.player_monster.is_fainted() or self.enemy_monster.is_fainted()
\ No newline at end of file
+        return self.player_monster.is_fainted() or self.enemy_monster.is_fainted()
+
+
+class MultiBattle(Battle):
+    """
+    N対Nの戦闘を管理するクラス（ダブルバトル・ボス戦用）。
+    sides[0] がプレイヤー側、sides[1] が相手側の場に出ているモンスターのリスト。
+    技の対象は (陣営, 位置) のインデックスで指定する。
+    """
+    def __init__(self, player_monsters, enemy_monsters):
+        super().__init__(player_monsters[0], enemy_monsters[0])
+        self.sides = [list(player_monsters), list(enemy_monsters)]
+        self._enemy_ids = {id(monster) for monster in self.sides[1]}
+
+    def _is_enemy(self, monster):
+        return id(monster) in self._enemy_ids
+
+    def get_monster(self, side, slot):
+        """指定した位置のモンスターを返す"""
+        return self.sides[side][slot]
+
+    def get_living_slots(self, side):
+        """指定した陣営で、ひんしでないモンスターの位置のリストを返す"""
+        return [slot for slot, monster in enumerate(self.sides[side]) if not monster.is_fainted()]
+
+    def is_side_defeated(self, side):
+        """指定した陣営が全員ひんしかどうか"""
+        for monster in self.sides[side]:
+            if not monster.is_fainted():
+                return False
+        return True
+
+    def is_battle_over(self):
+        return self.is_side_defeated(0) or self.is_side_defeated(1)
+
+    def _resolve_target(self, target_side, target_slot):
+        """対象がすでにひんしなら、同じ陣営の生き残りに対象を移す（全滅ならNone）"""
+        target = self.sides[target_side][target_slot]
+        if not target.is_fainted():
+            return target
+        for monster in self.sides[target_side]:
+            if not monster.is_fainted():
+                return monster
+        return None
+
+    def choose_enemy_actions(self):
+        """相手側の行動をランダムに決める。(陣営, 位置, 技, 対象の陣営, 対象の位置) のリストを返す"""
+        actions = []
+        player_slots = self.get_living_slots(0)
+        if not player_slots:
+            return actions
+        for slot in self.get_living_slots(1):
+            monster = self.sides[1][slot]
+            actions.append((1, slot, random.choice(monster.moves), 0, random.choice(player_slots)))
+        return actions
+
+    def execute_multi_turn(self, actions):
+        """
+        N体ぶんの行動を1ターン分実行する。
+        actions: (陣営, 位置, 技, 対象の陣営, 対象の位置) のリスト
+        行動順は「技の優先度 → すばやさ → 入力順」のヒープで決める。
+        ヒープの構築は線形時間で、場に出ているのは最大でも数体なので、
+        1ターンのコストは参加数に対してほぼ線形に収まる。
+        """
+        self.message_log.clear()
+        print(f"\n--- ターン {self.turn} ---")
+
+        # 1. 行動順をヒープに積む（すばやさはターン開始時の値で判定する）
+        action_heap = []
+        for order, (side, slot, move, target_side, target_slot) in enumerate(actions):
+            user = self.sides[side][slot]
+            if user.is_fainted():
+                continue
+            priority = move.get('priority', 0)
+            action_heap.append((-priority, -self._effective_speed(user), order, side, slot, move, target_side, target_slot))
+        heapq.heapify(action_heap)
+
+        # 2. 行動順に沿って攻撃処理を実行
+        while action_heap:
+            _, _, _, side, slot, move, target_side, target_slot = heapq.heappop(action_heap)
+            user = self.sides[side][slot]
+            # このターン中に先に倒された場合は行動しない
+            if user.is_fainted():
+                continue
+            target = self._resolve_target(target_side, target_slot)
+            if target is None:
+                continue
+            self._execute_action(user, target, move)
+            if self.is_battle_over():
+                break
+
+        # 3. ターン終了時の状態異常ダメージなどを処理
+        if not self.is_battle_over():
+            print("\n-ターン終了時-")
+            for side in (0, 1):
+                for monster in self.sides[side]:
+                    if not monster.is_fainted():
+                        self._handle_end_of_turn_status(monster)
+                if self.is_side_defeated(side):
+                    break
+
+        self.turn += 1
+        return self.message_log
@@ -0,0 +1,84 @@
+# bench_blit.py
+# 機能：画像の形式（surface_alpha.py）による描画速度の違いを測る
+# バトル画面とフィールド画面を、形式の変換なし（すべてピクセルごとのアルファ合成）と
+# 変換あり（不透明 / カラーキー+RLE / アルファ合成）で描画し、1フレームあたりの時間を比べる。
+# 最後に、画像ごとにどの形式を選んだかを表示する。
+#
+# 使い方: python bench_blit.py [--frames 300]
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+# 画面を開かずに測れるようにする
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from inventory import Inventory
+from monster import create_monster
+from party import Party
+from scenes.battle_scene import BattleScene
+from scenes.field_scene import FieldScene
+from sprite_cache import get_sprite_cache
+from surface_alpha import clear_alpha_report, get_alpha_report, set_alpha_optimization
+from ui.components import clear_ui_image_cache
+
+
+def _quiet():
+    """ゲーム側の print を計測に混ぜない"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _time_draws(scene, frames):
+    """draw() 1回あたりの平均時間（秒）。最初の1回（拡大や変換が起きる）は含めない"""
+    scene.draw()
+    start = time.perf_counter()
+    for _ in range(frames):
+        scene.draw()
+    return (time.perf_counter() - start) / frames
+
+
+def bench_scenes(screen, font, frames, optimize):
+    """形式の変換の有無を切り替えて、各シーンの描画時間を測る"""
+    set_alpha_optimization(optimize)
+    clear_ui_image_cache()
+    get_sprite_cache().clear()  # 拡大済みフレームも作り直させる
+    clear_alpha_report()
+
+    party = Party()
+    party.add_monster(create_monster("charmander", 5))
+    with _quiet():
+        battle = BattleScene(screen, font, party, Inventory(), create_monster("pidgey", 7))
+        field = FieldScene(screen, font, party, 200, 200)
+        field.show_message = True
+        field.message_box.add_message("やせいの ポケモンに きをつけて！")
+        return {"battle": _time_draws(battle, frames), "field": _time_draws(field, frames)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="画像の形式による描画速度のベンチマーク")
+    parser.add_argument("--frames", type=int, default=300, help="各シーンを描画する回数")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    font = pygame.font.Font("pkmn_w.ttf", 40) if os.path.exists("pkmn_w.ttf") else pygame.font.Font(None, 40)
+
+    before = bench_scenes(screen, font, args.frames, optimize=False)
+    after = bench_scenes(screen, font, args.frames, optimize=True)
+    for scene in before:
+        print(f"{scene:>6}: アルファ合成のみ {before[scene] * 1000:7.3f}ms  "
+              f"形式を選んだ場合 {after[scene] * 1000:7.3f}ms  "
+              f"({before[scene] / after[scene]:.2f}倍)")
+
+    print("\n画像ごとの形式:")
+    for name, modes in sorted(get_alpha_report().items()):
+        summary = ", ".join(f"{mode} {count}" for mode, count in sorted(modes.items()))
+        print(f"  {name}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
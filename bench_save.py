@@ -0,0 +1,198 @@
+# bench_save.py
+# 機能：セーブ/ロードのベンチマーク
+# 手持ち6匹から1万匹までの大きなセーブデータを作り、形式ごとに
+# 時間・ピークメモリ・ファイルサイズを測って JSON に書き出す。
+#
+# 使い方: python bench_save.py [--sizes 6,100,1000,10000] [--repeat 3] [--output bench_save_results.json]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+# 画面を開かずに GameManager を作れるようにする
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game_flags import FLAG_REGISTRY, GameFlags
+from game_manager import GameManager
+from items_data import ITEM_DATABASE
+from monster import create_monster
+from monsters_data import MONSTER_DATABASE
+from save_binary import binary_save_path
+from save_journal import journal_segment_path, list_journal_segments
+
+DEFAULT_SIZES = [6, 100, 1000, 10000]
+FORMATS = ["json", "binary", "journal"]
+FLAG_COUNT = 300
+
+
+def _quiet():
+    """ゲーム側の print を計測に混ぜない"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def build_synthetic_game(game, monster_count):
+    """手持ち6匹 + 残りをボックスに入れた状態を作る"""
+    species_ids = list(MONSTER_DATABASE.keys())
+    game.player_party.clear()
+    game.storage.clear()
+    for i in range(monster_count):
+        monster = create_monster(species_ids[i % len(species_ids)], 5 + i % 60)
+        monster.take_damage(i % monster.max_hp)
+        if len(game.player_party.members) < 6:
+            game.player_party.add_monster(monster)
+        else:
+            game.storage.deposit(monster)
+
+    # ベンチマーク用のフラグをこのプロセスの中だけで登録する
+    game.game_flags = GameFlags()
+    for i in range(FLAG_COUNT):
+        name = f"event_{i:04d}"
+        FLAG_REGISTRY.register(name)
+        game.game_flags[name] = i % 3 == 0
+    for species_id in species_ids:
+        game.dex.mark_caught(species_id)
+    game.inventory.clear()
+    for i, item_id in enumerate(ITEM_DATABASE):
+        game.inventory.add_item(item_id, 99 - i, show_message=False)
+    game.play_time = 123456.7
+
+
+def _save_files(game, save_format):
+    """その形式で書かれるファイルの一覧"""
+    if save_format == "binary":
+        return [binary_save_path(game.save_file_path)]
+    files = [game.save_file_path]
+    files += [journal_segment_path(game.save_file_path, n) for n in list_journal_segments(game.save_file_path)]
+    return files
+
+
+def _measure(func):
+    """(戻り値, 経過秒数, ピークメモリのバイト数) を返す"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _clean_save_files(game):
+    for path in (game.save_file_path, binary_save_path(game.save_file_path)):
+        for suffix in ("", ".backup"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    for n in list_journal_segments(game.save_file_path):
+        os.remove(journal_segment_path(game.save_file_path, n))
+
+
+def bench_format(game, save_format, monster_count, repeat):
+    """1つの形式・サイズについて、セーブとロードを repeat 回測る"""
+    runs = []
+    for _ in range(repeat):
+        _clean_save_files(game)
+        build_synthetic_game(game, monster_count)
+        game.journal = None
+        game.save_format = "binary" if save_format == "binary" else "json"
+        if save_format == "journal":
+            game.enable_journal_mode()
+            # 基準のスナップショットを書いておき、差分1件の追記を測る
+            with _quiet():
+                game.save_game()
+            game.save_writer.wait_idle()
+            game.player_party.members[0].take_damage(1)
+            game.game_flags["event_0001"] = not game.game_flags.test("event_0001")
+
+        # メインスレッドが止まる時間（スナップショット作成）と、書き込み完了までの時間
+        def save_and_flush():
+            start = time.perf_counter()
+            game.save_game(incremental=True)  # ジャーナルではオートセーブと同じ差分の追記
+            main_thread_time = time.perf_counter() - start
+            game.save_writer.wait_idle()
+            return main_thread_time
+        with _quiet():
+            main_thread_time, flush_time, save_peak = _measure(save_and_flush)
+        # 書き込み完了イベントは使わないので捨てておく
+        pygame.event.clear()
+
+        file_size = sum(os.path.getsize(p) for p in _save_files(game, save_format) if os.path.exists(p))
+
+        with _quiet():
+            ok, load_time, load_peak = _measure(game.load_game)
+            _, resolve_time, resolve_peak = _measure(
+                lambda: [game.storage.get_box(i) for i in range(game.storage.get_box_count())]
+            )
+        if not ok:
+            raise RuntimeError(f"{save_format} のロードに失敗しました")
+
+        runs.append({
+            "save_main_thread_s": main_thread_time,
+            "save_total_s": flush_time,
+            "save_peak_bytes": save_peak,
+            "load_s": load_time,
+            "load_peak_bytes": load_peak,
+            "storage_resolve_s": resolve_time,
+            "storage_resolve_peak_bytes": resolve_peak,
+            "file_size_bytes": file_size,
+        })
+
+    # 各指標の最小値（ばらつきの影響が一番少ない値）を代表値にする
+    best = {key: min(run[key] for run in runs) for key in runs[0]}
+    best.update({"format": save_format, "monsters": monster_count, "repeat": repeat})
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="セーブ/ロードのベンチマーク")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="モンスターの数（カンマ区切り）")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="測る形式（カンマ区切り）")
+    parser.add_argument("--repeat", type=int, default=3, help="各条件の繰り返し回数")
+    parser.add_argument("--output", default="bench_save_results.json", help="結果を書き出すJSONファイル")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    formats = args.formats.split(",")
+    output_path = os.path.abspath(args.output)
+
+    with _quiet():
+        game = GameManager()
+
+    # セーブファイルは一時ディレクトリに書く
+    work_dir = tempfile.mkdtemp(prefix="bench_save_")
+    original_dir = os.getcwd()
+    os.chdir(work_dir)
+    results = []
+    try:
+        for monster_count in sizes:
+            for save_format in formats:
+                result = bench_format(game, save_format, monster_count, args.repeat)
+                results.append(result)
+                print(
+                    f"{save_format:>7} {monster_count:>6}匹: "
+                    f"セーブ {result['save_main_thread_s'] * 1000:8.2f}ms (完了まで {result['save_total_s'] * 1000:8.2f}ms)  "
+                    f"ロード {result['load_s'] * 1000:8.2f}ms  "
+                    f"ボックス展開 {result['storage_resolve_s'] * 1000:8.2f}ms  "
+                    f"{result['file_size_bytes'] / 1024:9.1f}KB"
+                )
+    finally:
+        game.save_writer.shutdown()
+        os.chdir(original_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({"sizes": sizes, "formats": formats, "results": results}, f, indent=2, ensure_ascii=False)
+    print(f"結果を書き出しました: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# build_sprites.py
+# 機能：pokemon_gifs/ のGIFをまとめてスプライトシートに変換するビルドコマンド
+#
+# 変換は複数プロセスで並列に行い、結果を sprites/manifest.json に記録する。
+# マニフェストには元GIFの内容のハッシュとフレーム情報を入れておくので、
+#   - 2回目以降は、中身が変わったGIFだけを変換し直す
+#   - ゲーム側はマニフェストを1回引くだけで、ファイルを探し回らずに読み込める
+#
+# デコードすると大きすぎるGIFはシートにせず、マニフェストに "stream" として記録する
+# （ゲーム側で StreamingGifFrames として少しずつ読み込む）。
+#
+# 最後に、全スプライトのフレームをアトラス（sprite_atlas.py）にまとめる。
+#
+# 使い方: python build_sprites.py [--jobs N] [--force]
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from sprite_atlas import build_atlas, is_atlas_stale
+
+GIF_DIR = "pokemon_gifs"
+SPRITE_DIR = "sprites"
+MANIFEST_PATH = os.path.join(SPRITE_DIR, "manifest.json")
+
+# 変換処理（出力の形式）を変えたら上げる。値が違うエントリはすべて作り直す
+BUILD_VERSION = 2
+
+# GIFのファイル名の末尾 → 向き（先に書いたものが優先）
+FACING_SUFFIXES = [("_f", "front"), ("_front", "front"), ("_b", "back"), ("_back", "back")]
+
+
+def file_sha256(path):
+    """ファイルの内容のSHA-256（16進文字列）"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _parse_gif_name(filename):
+    """"bulbasaur_f.gif" → ("bulbasaur", "front", 優先度)。向きの無い名前は正面扱い"""
+    stem = os.path.splitext(filename)[0]
+    for priority, (suffix, facing) in enumerate(FACING_SUFFIXES):
+        if stem.endswith(suffix):
+            return stem[:-len(suffix)], facing, priority
+    return stem, "front", len(FACING_SUFFIXES)
+
+
+def find_sources(gif_dir=GIF_DIR):
+    """
+    変換するGIFを {(種族, 向き): GIFのパス} で返す。
+    背面のGIFが無い種族は、正面のGIFを背面にも使う（ゲーム側の従来の動作と同じ）。
+    """
+    found = {}
+    for filename in sorted(os.listdir(gif_dir)):
+        if not filename.lower().endswith(".gif"):
+            continue
+        species, facing, priority = _parse_gif_name(filename)
+        current = found.get((species, facing))
+        if current is None or priority < current[1]:
+            found[(species, facing)] = (os.path.join(gif_dir, filename), priority)
+
+    sources = {key: path for key, (path, _) in found.items()}
+    for (species, facing), path in list(sources.items()):
+        if facing == "front" and (species, "back") not in sources:
+            sources[(species, "back")] = path
+    return sources
+
+
+def output_paths(species, facing, animation="idle"):
+    """スプライトシートとフレーム情報の出力先（ゲーム側が探すパスと同じ）"""
+    sprite_dir = os.path.join(SPRITE_DIR, species)
+    return (os.path.join(sprite_dir, f"{animation}_{facing}.png"),
+            os.path.join(sprite_dir, f"{animation}_{facing}_info.json"))
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {"version": BUILD_VERSION, "sprites": {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _stream_entry(gif_path, source_hash, gif):
+    """大きいGIFはシートにせず、使うフレームの番号だけを記録する（ゲーム側でストリーミング再生する）"""
+    from sprite_animation import scan_visible_gif_frames
+
+    frame_indices = scan_visible_gif_frames(gif)
+    if not frame_indices:
+        return None
+    return {
+        "source": gif_path.replace(os.sep, "/"),
+        "source_hash": source_hash,
+        "build_version": BUILD_VERSION,
+        "stream": True,
+        "info": {
+            "frame_width": gif.width,
+            "frame_height": gif.height,
+            "total_frames": len(frame_indices),
+            "original_frames": getattr(gif, "n_frames", 1),
+            "frame_indices": frame_indices
+        }
+    }
+
+
+def _convert_job(job):
+    """1つのGIFを変換する（ワーカープロセスで実行される）"""
+    from PIL import Image
+    from sprite_animation import STREAMING_MIN_BYTES, gif_decoded_bytes, gif_to_spritesheet_clean
+
+    species, facing, gif_path, source_hash = job
+    with Image.open(gif_path) as gif:
+        if gif_decoded_bytes(gif) >= STREAMING_MIN_BYTES:
+            entry = _stream_entry(gif_path, source_hash, gif)
+            return job, entry, None if entry else "有効なフレームがありません"
+
+    sheet_path, info_path = output_paths(species, facing)
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        ok = gif_to_spritesheet_clean(gif_path, sheet_path, info_path)
+    if not ok:
+        return job, None, log.getvalue()
+
+    with open(info_path, 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    entry = {
+        "source": gif_path.replace(os.sep, "/"),
+        "source_hash": source_hash,
+        "build_version": BUILD_VERSION,
+        "sheet": sheet_path.replace(os.sep, "/"),
+        "info": info
+    }
+    return job, entry, None
+
+
+def _is_up_to_date(entry, source_hash):
+    return (entry is not None
+            and entry.get("source_hash") == source_hash
+            and entry.get("build_version") == BUILD_VERSION
+            and (entry.get("stream") or os.path.exists(entry.get("sheet", ""))))
+
+
+def build_sprites(jobs=None, force=False, gif_dir=GIF_DIR, manifest_path=MANIFEST_PATH):
+    """
+    変更のあったGIFだけを並列に変換し、マニフェストを書き直す。
+    戻り値: (変換した数, 変換を省略した数, 失敗した数)
+    """
+    manifest = load_manifest(manifest_path)
+    old_sprites = manifest.get("sprites", {})
+    new_sprites = {}
+
+    # 同じGIFを複数の向きで使う場合もあるので、ハッシュはファイルごとに1回だけ計算する
+    sources = find_sources(gif_dir)
+    hashes = {path: file_sha256(path) for path in set(sources.values())}
+
+    pending = []
+    skipped = 0
+    for (species, facing), gif_path in sorted(sources.items()):
+        source_hash = hashes[gif_path]
+        entry = old_sprites.get(species, {}).get(facing, {}).get("idle")
+        if not force and _is_up_to_date(entry, source_hash) and entry.get("source") == gif_path.replace(os.sep, "/"):
+            new_sprites.setdefault(species, {}).setdefault(facing, {})["idle"] = entry
+            skipped += 1
+        else:
+            pending.append((species, facing, gif_path, source_hash))
+
+    failed = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for job, entry, log in executor.map(_convert_job, pending):
+                species, facing, gif_path, _ = job
+                if entry is None:
+                    failed += 1
+                    print(f"[ERROR] 変換に失敗: {gif_path}\n{log}")
+                    continue
+                new_sprites.setdefault(species, {}).setdefault(facing, {})["idle"] = entry
+                if entry.get("stream"):
+                    print(f"ストリーミング再生にします: {gif_path} ({entry['info']['total_frames']}フレーム)")
+                else:
+                    print(f"変換しました: {gif_path} → {entry['sheet']} ({entry['info']['total_frames']}フレーム)")
+
+    manifest = {"version": BUILD_VERSION, "sprites": new_sprites}
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+    # シートが変わったときだけアトラスを作り直す
+    if pending or force or is_atlas_stale(manifest):
+        pages = build_atlas(manifest)
+        print(f"アトラスを作成しました: {pages}ページ")
+    return len(pending) - failed, skipped, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GIFをスプライトシートに変換する")
+    parser.add_argument("--jobs", type=int, default=None, help="並列に動かすプロセス数（省略時はCPU数）")
+    parser.add_argument("--force", action="store_true", help="変更の無いGIFも変換し直す")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    built, skipped, failed = build_sprites(jobs=args.jobs, force=args.force)
+    print(f"変換: {built}  省略（変更なし）: {skipped}  失敗: {failed}")
+    print(f"マニフェストを書き出しました: {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
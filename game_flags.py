@@ -0,0 +1,251 @@
+# game_flags.py
+# 機能：イベントフラグと図鑑（見つけた・つかまえた）をビットセットで管理する
+#
+# フラグの名前は FlagRegistry でビットの位置に対応づける。
+# セーブデータには名前ではなくビット列（base64）だけを書くので、
+# フラグが何千個に増えてもセーブデータはほとんど大きくならない。
+# 登録されていない名前や真偽値以外の値は、従来どおり辞書（extra）に入れる。
+
+import base64
+
+from monsters_data import MONSTER_DATABASE
+
+# 1バイトに立っているビットの数（count 用）
+_POPCOUNT = bytes(bin(i).count("1") for i in range(256))
+
+
+class BitSet:
+    """bytearray 上のビットの集合。必要に応じて自動で伸びる"""
+    def __init__(self, size=0):
+        self.data = bytearray((size + 7) // 8)
+
+    def test(self, index):
+        byte = index >> 3
+        return byte < len(self.data) and bool(self.data[byte] & (1 << (index & 7)))
+
+    def set(self, index, value=True):
+        byte = index >> 3
+        if byte >= len(self.data):
+            if not value:
+                return
+            self.data.extend(bytes(byte + 1 - len(self.data)))
+        if value:
+            self.data[byte] |= 1 << (index & 7)
+        else:
+            self.data[byte] &= ~(1 << (index & 7)) & 0xFF
+
+    def clear(self, index):
+        self.set(index, False)
+
+    def count(self):
+        """立っているビットの数"""
+        return sum(self.data.translate(_POPCOUNT))
+
+    def __iter__(self):
+        """立っているビットの位置を昇順に返す"""
+        for byte_index, byte in enumerate(self.data):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield byte_index * 8 + bit
+
+    def copy(self):
+        bitset = BitSet()
+        bitset.data = bytearray(self.data)
+        return bitset
+
+    def encode(self):
+        """セーブ用の短い文字列（末尾の0バイトは省く）"""
+        return base64.b64encode(bytes(self.data).rstrip(b"\0")).decode('ascii')
+
+    @classmethod
+    def decode(cls, text):
+        bitset = cls()
+        bitset.data = bytearray(base64.b64decode(text or ""))
+        return bitset
+
+
+class FlagRegistry:
+    """フラグの名前 ⇔ ビットの位置 の対応表"""
+    def __init__(self, names=()):
+        self.names = []
+        self._index = {}
+        for name in names:
+            self.register(name)
+
+    def register(self, name):
+        """名前を登録してビットの位置を返す（登録済みならその位置）"""
+        if name not in self._index:
+            self._index[name] = len(self.names)
+            self.names.append(name)
+        return self._index[name]
+
+    def index_of(self, name):
+        """登録されていなければ None"""
+        return self._index.get(name)
+
+    def __len__(self):
+        return len(self.names)
+
+
+# ゲームで使うイベントフラグ。ビットの位置がずれるので、必ず後ろに追加していくこと
+STORY_FLAGS = [
+    "received_starter",
+    "visited_pokecenter",
+]
+
+FLAG_REGISTRY = FlagRegistry(STORY_FLAGS)
+
+
+class GameFlags:
+    """
+    イベントフラグ。これまでの辞書（game_flags[name]）と同じように使える。
+    登録済みの名前の真偽値はビットセットに、それ以外は extra に入れる。
+    登録済みの名前は、立っていなくても False として存在する（KeyError になるのは未登録の名前だけ）。
+    """
+    def __init__(self, registry=FLAG_REGISTRY):
+        self.registry = registry
+        self.bits = BitSet(len(registry))
+        self.extra = {}
+
+    def _bit_index(self, name, value):
+        if isinstance(value, bool):
+            return self.registry.index_of(name)
+        return None
+
+    def __getitem__(self, name):
+        if name in self.extra:
+            return self.extra[name]
+        index = self.registry.index_of(name)
+        if index is None:
+            raise KeyError(name)
+        return self.bits.test(index)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __setitem__(self, name, value):
+        index = self._bit_index(name, value)
+        if index is None:
+            self.extra[name] = value
+            return
+        self.extra.pop(name, None)
+        self.bits.set(index, value)
+
+    def set(self, name, value=True):
+        self[name] = value
+
+    def test(self, name):
+        """フラグが立っているかどうか（O(1)）"""
+        index = self.registry.index_of(name)
+        if index is not None and self.bits.test(index):
+            return True
+        return bool(self.extra.get(name))
+
+    def __contains__(self, name):
+        return name in self.extra or self.registry.index_of(name) is not None
+
+    def __delitem__(self, name):
+        if name in self.extra:
+            del self.extra[name]
+            return
+        index = self.registry.index_of(name)
+        if index is None:
+            raise KeyError(name)
+        self.bits.clear(index)
+
+    def count(self):
+        """立っているフラグの数"""
+        return self.bits.count() + sum(1 for value in self.extra.values() if value)
+
+    def to_dict(self):
+        """従来の辞書形式（ツールやデバッグ表示用）"""
+        result = {self.registry.names[i]: True for i in self.bits if i < len(self.registry)}
+        result.update(self.extra)
+        return result
+
+    def copy(self):
+        flags = GameFlags(self.registry)
+        flags.bits = self.bits.copy()
+        flags.extra = dict(self.extra)
+        return flags
+
+    def encode(self):
+        """セーブ用の形式"""
+        encoded = {"bits": self.bits.encode()}
+        if self.extra:
+            encoded["extra"] = dict(self.extra)
+        return encoded
+
+    @classmethod
+    def from_save(cls, save_data, registry=FLAG_REGISTRY):
+        """
+        セーブデータから復元する。
+        新しい形式（"flags"）が無ければ、以前の辞書形式（"game_flags"）を読み込む。
+        """
+        flags = cls(registry)
+        encoded = save_data.get("flags")
+        if encoded is not None:
+            flags.bits = BitSet.decode(encoded.get("bits"))
+            flags.extra = dict(encoded.get("extra", {}))
+        else:
+            for name, value in save_data.get("game_flags", {}).items():
+                flags[name] = value
+        return flags
+
+
+def dex_number(monster_id):
+    """種族IDから図鑑番号を返す（登録されていなければ None）"""
+    return MONSTER_DATABASE.get(monster_id, {}).get("dex_no")
+
+
+class Pokedex:
+    """図鑑の「見つけた」「つかまえた」を図鑑番号のビットセットで持つクラス"""
+    def __init__(self):
+        self.seen = BitSet()
+        self.caught = BitSet()
+
+    def mark_seen(self, monster_id):
+        number = dex_number(monster_id)
+        if number is not None:
+            self.seen.set(number)
+
+    def mark_caught(self, monster_id):
+        """つかまえたモンスターは見つけたことにもなる"""
+        number = dex_number(monster_id)
+        if number is not None:
+            self.seen.set(number)
+            self.caught.set(number)
+
+    def is_seen(self, monster_id):
+        number = dex_number(monster_id)
+        return number is not None and self.seen.test(number)
+
+    def is_caught(self, monster_id):
+        number = dex_number(monster_id)
+        return number is not None and self.caught.test(number)
+
+    def seen_count(self):
+        return self.seen.count()
+
+    def caught_count(self):
+        return self.caught.count()
+
+    def copy(self):
+        dex = Pokedex()
+        dex.seen = self.seen.copy()
+        dex.caught = self.caught.copy()
+        return dex
+
+    def encode(self):
+        return {"seen": self.seen.encode(), "caught": self.caught.encode()}
+
+    @classmethod
+    def decode(cls, encoded):
+        dex = cls()
+        dex.seen = BitSet.decode(encoded.get("seen"))
+        dex.caught = BitSet.decode(encoded.get("caught"))
+        return dex
@@ -1,11 +1,22 @@
 # game_manager.py
 import pygame
 import sys
+import io
 import json
 import os
+import weakref
 from monster import create_monster
 from party import Party
 from inventory import Inventory
+from storage import PCStorage, default_box_sizes
+from autosave import AutosaveScheduler
+from game_flags import GameFlags, Pokedex
+from save_slots import SaveSlotIndex, slot_save_path, build_slot_summary
+from save_writer import SaveWriter, SAVE_COMPLETE_EVENT
+from save_binary import binary_save_path, write_binary_save, BinarySaveReader, EncodedRecords, MONSTER_RECORD
+from save_journal import (SaveJournal, DEFAULT_COMPACT_THRESHOLD, load_with_journal,
+                          list_journal_segments, remove_journal_segments)
+from ui.glyph_atlas import build_glyph_atlas
 
 class GameManager:
     """ゲーム全体を管理するクラス"""
@@ -22,9 +33,21 @@ class GameManager:
         except:
             print("[WARNING] pkmn_w.ttf が見つからないため、デフォルトフォントを使用します")
             self.font = pygame.font.Font(None, 28)
+        build_glyph_atlas(self.font) # 使う文字を前もってラスタライズしておく
         
         self.clock = pygame.time.Clock()
-        self.save_file_path = "save_data.json" # セーブファイルの名前を定義
+        self.current_slot = 1 # 使用中のセーブスロット
+        self.slot_chosen = False # このセッションでスロットを選んだか（選ぶまではオートセーブしない）
+        self.save_file_path = slot_save_path(self.current_slot) # セーブファイルの名前を定義
+        self.save_index = SaveSlotIndex() # スロット一覧用のインデックス
+        self.save_writer = SaveWriter() # セーブ書き込み用のバックグラウンドスレッド
+        self.save_format = "json" # セーブ形式: "json" または "binary"
+        self.journal = None # ジャーナルモード（enable_journal_mode で有効化）
+        self.use_journal = True # JSON形式のセーブで、オートセーブを差分の追記にするかどうか
+        if self.use_journal and self.save_format == "json":
+            self.enable_journal_mode()
+        # オートセーブは差分だけをジャーナルに追記する（手動セーブはスナップショットを書き直す）
+        self.autosave = AutosaveScheduler(lambda: self.save_game(incremental=True), is_busy=self.save_writer.is_busy)
         
         # ゲーム状態
         self.running = True
@@ -33,11 +56,17 @@ class GameManager:
         # プレイヤーデータ
         self.player_party = Party()
         self.inventory = Inventory()
+        self.storage = PCStorage(self._deserialize_monster)  # パソコンのボックス
+        # セーブ用のキャッシュ（変更が無ければ前回のシリアライズ結果を使い回す）
+        self._record_cache = weakref.WeakKeyDictionary()  # Monster → (_version, 辞書)
+        self._party_cache = (None, None)      # (各モンスターの版, 辞書のリスト)
+        self._inventory_cache = (None, None)  # (Inventory の版, {id: 所持数})
         self.player_world_x = 500  # 主人公の初期位置X
         self.player_world_y = 500  # 主人公の初期位置Y
         
         # ゲーム進行データ
-        self.game_flags = {}  # イベントフラグなど
+        self.game_flags = GameFlags()  # イベントフラグなど（ビットセット）
+        self.dex = Pokedex()  # 図鑑（見つけた・つかまえた）
         self.play_time = 0    # プレイ時間（秒）
         
         self._initialize_player_data()
@@ -50,6 +79,8 @@ class GameManager:
         self.player_party.add_monster(create_monster("bulbasaur", level=5))
         self.player_party.add_monster(create_monster("squirtle", level=5))
         self.player_party.add_monster(create_monster("pidgey", level=5))
+        for monster in self.player_party.members:
+            self.dex.mark_caught(monster.base_stats['id'])
 
         # ★初期アイテムを設定
         self.inventory.add_item("monster_ball", 10)
@@ -65,6 +96,7 @@ class GameManager:
             self.player_world_x = self.current_scene.player_world_x
             self.player_world_y = self.current_scene.player_world_y
         enemy_monster = create_monster(enemy_monster_id, enemy_level)
+        self.dex.mark_seen(enemy_monster_id)
         battle_scene = BattleScene(self.screen, self.font, self.player_party, self.inventory, enemy_monster)
         self.change_scene(battle_scene)
     
@@ -81,7 +113,7 @@ class GameManager:
         if self.current_scene and isinstance(self.current_scene, FieldScene):
             self.player_world_x = self.current_scene.player_world_x
             self.player_world_y = self.current_scene.player_world_y
-        menu_scene = MenuScene(self.screen, self.font, self.player_party, self.inventory)
+        menu_scene = MenuScene(self.screen, self.font, self.player_party, self.inventory, self.current_slot)
         self.push_scene(menu_scene)
 
     def start_bag(self):
@@ -115,14 +147,28 @@ class GameManager:
             self.running = False
 
     def _serialize_monster(self, monster):
+        """
+        モンスターオブジェクトを辞書形式にシリアライズ。
+        前回から変更が無ければ（_version が同じなら）前回の辞書をそのまま返す。
+        返した辞書は書き込みスレッドやジャーナルと共有するので、書き換えないこと。
+        """
+        cached = self._record_cache.get(monster)
+        if cached and cached[0] == monster._version:
+            return cached[1]
+        record = self._encode_monster(monster)
+        self._record_cache[monster] = (monster._version, record)
+        return record
+
+    def _encode_monster(self, monster):
+        """モンスターを辞書にする（キャッシュを使わない）"""
         moves_to_save = []
         for move in monster.moves:
             moves_to_save.append({
                 "id": move.get('id', move['name']),
                 "current_pp": move.get('current_pp', 0)
             })
-        """モンスターオブジェクトを辞書形式にシリアライズ"""
         return {
+            "uid": monster.uid,
             "id": monster.base_stats['id'],
             "name": monster.name,
             "level": monster.level,
@@ -135,8 +181,8 @@ class GameManager:
             "sleep_counter": monster.sleep_counter,
             # 能力ランク補正は保存しない（バトル外では常に0）
             "types": monster.types.copy(),
-            # 覚えている技のIDのみを保存（技データは moves_data.py から復元）
-            "move_ids": [move.get('id', move['name']) for move in monster.moves]
+            # 覚えている技のIDと残りPPを保存（技データは moves_data.py から復元）
+            "moves": moves_to_save
         }
     
     def _deserialize_monster(self, monster_data):
@@ -147,6 +193,7 @@ class GameManager:
         monster = create_monster(monster_data["id"], monster_data["level"])
         
         # 保存されたデータで上書き
+        monster.uid = monster_data.get("uid", monster.uid)
         monster.current_hp = monster_data["current_hp"]
         monster.max_hp = monster_data["max_hp"]
         monster.exp = monster_data["exp"]
@@ -184,109 +231,167 @@ class GameManager:
         
         return monster
 
-    def save_game(self):
-        """現在のゲームの状態をJSONファイルに保存する。"""
+    def _sync_player_position(self):
+        """フィールドシーンにいる場合、主人公の座標を取り込む"""
+        from scenes.field_scene import FieldScene
+        if self.current_scene and isinstance(self.current_scene, FieldScene):
+            self.player_world_x = self.current_scene.player_world_x
+            self.player_world_y = self.current_scene.player_world_y
+
+    def _build_save_data(self, keep_encoded=False):
+        """
+        セーブする状態のスナップショットを作る（メインスレッドで呼ぶ）。
+        戻り値には Monster などのゲームのオブジェクトは入らないので、別スレッドに渡したあとでゲームが進んでも内容は変わらない。
+        ただし、変更の無いモンスター・持ち物・手持ちの辞書は前回のセーブと共有する（_record_cache など）。
+        変更があれば新しい辞書を作るので、共有した辞書が書き換わることはない。受け取った側も書き換えないこと。
+        keep_encoded=True の場合、開いていないボックスは EncodedRecords のまま入る（バイナリで書くときだけ使う）。
+        """
+        self._sync_player_position()
+        
+        # 保存するデータをまとめる
+        save_data = {
+            "version": "1.0",  # セーブデータのバージョン
+            "timestamp": pygame.time.get_ticks(),  # 保存時刻
+            "play_time": self.play_time,
+            "player_position": {
+                "x": self.player_world_x,
+                "y": self.player_world_y
+            },
+            "flags": self.game_flags.encode(),
+            "dex": self.dex.encode(),
+            "inventory": self._snapshot_inventory(),
+            "player_party": self._snapshot_party()
+        }
+        
+        # ボックスのモンスター（未展開のボックスは読み込んだデータをそのまま使う）
+        save_data["storage"], save_data["storage_box_sizes"] = self.storage.serialize(
+            self._serialize_monster, keep_encoded=keep_encoded)
+        
+        return save_data
+
+    def _snapshot_inventory(self):
+        """持ち物の {id: 所持数}。前回から変わっていなければ同じ辞書を返す"""
+        version, snapshot = self._inventory_cache
+        if version != self.inventory._version:
+            snapshot = {item_id: info['count'] for item_id, info in self.inventory.items.items()}
+            self._inventory_cache = (self.inventory._version, snapshot)
+        return snapshot
+
+    def _snapshot_party(self):
+        """手持ちの辞書のリスト。並びも中身も変わっていなければ同じリストを返す"""
+        versions, records = self._party_cache
+        current = (self.player_party._version,) + tuple(m._version for m in self.player_party.members)
+        if versions != current:
+            records = [self._serialize_monster(monster) for monster in self.player_party.members]
+            self._party_cache = (current, records)
+        return records
+
+    def save_game(self, incremental=False):
+        """
+        現在のゲームの状態をセーブファイル（save_format に応じてJSONかバイナリ）に保存する。
+        スナップショットだけ作って書き込みはバックグラウンドに任せるので、
+        フレームを止めない。完了は SAVE_COMPLETE_EVENT で通知される。
+        ジャーナルモードでは、incremental=True（オートセーブ）なら前回との差分だけを追記し、
+        そうでなければ（手動セーブ）スナップショットを書き直す。
+        """
         print("レポートを きろくしています...")
         
         try:
-            # 現在のシーンから座標を取得
-            from scenes.field_scene import FieldScene
-            if self.current_scene and isinstance(self.current_scene, FieldScene):
-                self.player_world_x = self.current_scene.player_world_x
-                self.player_world_y = self.current_scene.player_world_y
-            
-            # 保存するデータをまとめる
-            save_data = {
-                "version": "1.0",  # セーブデータのバージョン
-                "timestamp": pygame.time.get_ticks(),  # 保存時刻
-                "play_time": self.play_time,
-                "player_position": {
-                    "x": self.player_world_x,
-                    "y": self.player_world_y
-                },
-                "game_flags": self.game_flags.copy(),
-                "player_party": []
-            }
-            
-            # パーティのモンスターをシリアライズ
-            for monster in self.player_party.members:
-                save_data["player_party"].append(self._serialize_monster(monster))
-            
-            # バックアップファイルを作成（既存のセーブファイルがあれば）
-            if os.path.exists(self.save_file_path):
-                backup_path = self.save_file_path + ".backup"
-                try:
-                    os.rename(self.save_file_path, backup_path)
-                except OSError as e:
-                    print(f"バックアップ作成に失敗: {e}")
-            
-            # JSONファイルに書き出す
-            with open(self.save_file_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
-            
-            print("レポートに しっかり かきのこした！")
-            return True
-            
+            # バイナリで書く場合、開いていないボックスは読み込んだときのレコードのまま書き戻す
+            save_data = self._build_save_data(keep_encoded=not self.journal and self.save_format == "binary")
         except Exception as e:
             print(f"セーブに失敗しました: {e}")
-            # エラーが発生した場合、バックアップから復元を試行
-            backup_path = self.save_file_path + ".backup"
-            if os.path.exists(backup_path):
-                try:
-                    os.rename(backup_path, self.save_file_path)
-                    print("バックアップから復元しました。")
-                except OSError:
-                    pass
             return False
+        
+        # スロット一覧用の概要。本体の書き込みが成功したときだけ、書き込みスレッドでインデックスに書く
+        summary = build_slot_summary(save_data, "journal" if self.journal else self.save_format)
+        slot = self.current_slot
+        write_index = lambda: self._write_slot_index(slot, summary)
+        
+        if self.journal:
+            if incremental:
+                self.journal.record(save_data, after_write=write_index)  # 前回との差分だけを追記する
+            else:
+                self.journal.compact(save_data, after_write=write_index, notify=True)
+        elif self.save_format == "binary":
+            self.save_writer.submit(binary_save_path(self.save_file_path), save_data,
+                                    write_func=write_binary_save, after_write=write_index)
+        else:
+            # 以前のジャーナルが残っていれば、このセーブで上書きされたものとして扱う
+            save_path = self.save_file_path
+            segments = list_journal_segments(save_path)
+            after_write = write_index
+            if segments:
+                save_data["journal_segment"] = segments[-1]
+                def after_write():
+                    remove_journal_segments(save_path, segments[-1])
+                    write_index()
+            self.save_writer.submit(save_path, save_data, after_write=after_write)
+        return True
+
+    def _write_slot_index(self, slot, summary):
+        """
+        スロット一覧を更新する（書き込みスレッドで、セーブ本体が書けたあとに呼ばれる）。
+        一覧は表示用なので、失敗してもセーブ自体の失敗にはしない。
+        """
+        try:
+            self.save_index.write_slot(self.save_index.path, (slot, summary))
+        except Exception as e:
+            print(f"[WARNING] セーブ一覧の書き込みに失敗: {e}")
+
+    def set_save_slot(self, slot):
+        """使用するセーブスロットを切り替える"""
+        self.current_slot = slot
+        self.save_file_path = slot_save_path(slot)
+        if self.journal:
+            # ジャーナルはセーブファイルごとに持つので作り直す
+            self.journal = SaveJournal(self.save_file_path, self.save_writer, self.journal.compact_threshold)
+
+    def enable_journal_mode(self, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        """
+        ジャーナルモードを有効にする。
+        以後のオートセーブ（save_game(incremental=True)）は差分をジャーナルに追記し、
+        ジャーナルがしきい値を超えるとバックグラウンドでスナップショットに圧縮する。
+        JSON形式のセーブでは GameManager の作成時に有効になる（use_journal）。
+        スナップショットは常にJSON形式で書く（save_format は使わない）。
+        """
+        self.journal = SaveJournal(self.save_file_path, self.save_writer, compact_threshold)
+
+    def _on_save_complete(self, event):
+        """バックグラウンドの書き込みが終わったときの処理"""
+        if event.success:
+            print("レポートに しっかり かきのこした！")
+        else:
+            # 一時ファイル経由で書き込んでいるので、元のセーブファイルは壊れていない
+            print(f"セーブに失敗しました: {event.error}")
+            if self._is_save_body_path(event.path):
+                # save_game は依頼した時点で成功扱いにしているので、オートセーブにやり直させる
+                self.autosave.mark_dirty("save failed")
+
+    def _is_save_body_path(self, path):
+        """今のスロットのセーブ本体（JSON・バイナリ・ジャーナル）のパスかどうか"""
+        save_path = self.save_file_path
+        return (path in (save_path, binary_save_path(save_path))
+                or path.startswith(save_path + ".journal."))
 
     def load_game(self):
-        """JSONファイルからゲームの状態を復元する。"""
-        if not os.path.exists(self.save_file_path):
+        """セーブファイル（と未反映のジャーナル）からゲームの状態を復元する。"""
+        if self.save_format == "binary" and not self.journal:
+            return self._load_binary_game()
+        
+        if not os.path.exists(self.save_file_path) and not list_journal_segments(self.save_file_path):
             print("レポートがありません。")
             return False
 
         print("レポートを よみこんでいます...")
         
         try:
-            with open(self.save_file_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            # バージョンチェック
-            version = save_data.get("version", "0.0")
-            if version != "1.0":
-                print(f"警告: セーブデータのバージョンが異なります ({version})")
-            
-            # プレイヤーの位置を復元
-            player_pos = save_data.get("player_position", {"x": 500, "y": 500})
-            self.player_world_x = player_pos["x"]
-            self.player_world_y = player_pos["y"]
-            
-            # ゲーム進行データを復元
-            self.play_time = save_data.get("play_time", 0)
-            self.game_flags = save_data.get("game_flags", {})
-            
-            # 手持ちパーティを復元
-            self.player_party.members.clear()
-            party_data = save_data.get("player_party", [])
-            
-            if not party_data:
-                print("警告: パーティデータが空です。")
+            save_data, last_segment = load_with_journal(self.save_file_path)
+            if not save_data or not self._apply_save_data(save_data):
                 return False
             
-            for monster_data in party_data:
-                try:
-                    monster = self._deserialize_monster(monster_data)
-                    if monster:
-                        self.player_party.add_monster(monster)
-                    else:
-                        print(f"警告: モンスター {monster_data.get('name', '不明')} の復元に失敗")
-                except Exception as e:
-                    print(f"警告: モンスターデータの復元エラー: {e}")
-                    continue
-            
-            if not self.player_party.members:
-                print("エラー: 有効なポケモンが1匹も復元できませんでした。")
-                return False
+            if self.journal:
+                self.journal.resume(save_data, last_segment)
             
             print("レポートを よみこみました。")
             print(f"復元されたポケモン: {len(self.player_party.members)}匹")
@@ -301,6 +406,111 @@ class GameManager:
         except Exception as e:
             print(f"ロードに失敗しました: {e}")
             return False
+
+    def _load_binary_game(self):
+        """
+        バイナリ形式のセーブファイルからゲームの状態を復元する。
+        ボックスのレコードはバイト列のまま保持し、開いたときに初めてデコードする。
+        """
+        path = binary_save_path(self.save_file_path)
+        if not os.path.exists(path):
+            print("レポートがありません。")
+            return False
+        
+        print("レポートを よみこんでいます...")
+        
+        try:
+            # ファイルは一度で読み切る（あとで上書きセーブされても、ボックスの展開に影響しない）
+            with open(path, 'rb') as f:
+                reader = BinarySaveReader(io.BytesIO(f.read()))
+            save_data = dict(reader.meta)
+            save_data["player_party"] = list(reader.iter_party())
+            storage_bytes = reader.read_storage_bytes()
+            
+            def make_storage_loader(start, count):
+                begin = start * MONSTER_RECORD.size
+                return EncodedRecords(memoryview(storage_bytes)[begin:begin + count * MONSTER_RECORD.size], reader.strings)
+            
+            if not self._apply_save_data(save_data, make_storage_loader, reader.storage_count):
+                return False
+            print("レポートを よみこみました。")
+            print(f"復元されたポケモン: {len(self.player_party.members)}匹")
+            return True
+        except Exception as e:
+            print(f"ロードに失敗しました: {e}")
+            return False
+
+    def _apply_save_data(self, save_data, make_storage_loader=None, storage_count=None):
+        """
+        セーブデータの内容をゲームに反映する。
+        save_data はジャーナルの比較元としても使うので、中身は書き換えない。
+        
+        フィールドに出るのに必要なもの（位置・フラグ・持ち物・手持ち）だけをここで復元し、
+        ボックスは未展開のまま登録する（開いたとき、または先読みスレッドで展開される）。
+        make_storage_loader を省略した場合は save_data["storage"] から読む。
+        """
+        # バージョンチェック
+        version = save_data.get("version", "0.0")
+        if version != "1.0":
+            print(f"警告: セーブデータのバージョンが異なります ({version})")
+        
+        # プレイヤーの位置を復元
+        player_pos = save_data.get("player_position", {"x": 500, "y": 500})
+        self.player_world_x = player_pos["x"]
+        self.player_world_y = player_pos["y"]
+        
+        # ゲーム進行データを復元
+        self.play_time = save_data.get("play_time", 0)
+        self.game_flags = GameFlags.from_save(save_data)  # 古い辞書形式も読める
+        
+        # 持ち物を復元（古いセーブデータには無いので、その場合は初期の持ち物のまま）
+        if "inventory" in save_data:
+            self.inventory.clear()
+            for item_id, count in save_data["inventory"].items():
+                self.inventory.add_item(item_id, count, show_message=False)
+        
+        # 手持ちパーティを復元
+        self.player_party.clear()
+        party_data = save_data.get("player_party", [])
+        
+        if not party_data:
+            print("警告: パーティデータが空です。")
+            return False
+        
+        for monster_data in party_data:
+            try:
+                monster = self._deserialize_monster(monster_data)
+                if monster:
+                    self.player_party.add_monster(monster)
+                else:
+                    print(f"警告: モンスター {monster_data.get('name', '不明')} の復元に失敗")
+            except Exception as e:
+                print(f"警告: モンスターデータの復元エラー: {e}")
+                continue
+        
+        if not self.player_party.members:
+            print("エラー: 有効なポケモンが1匹も復元できませんでした。")
+            return False
+        
+        # ボックスを復元（ここでは Monster を作らない）
+        if make_storage_loader is None:
+            storage_records = save_data.get("storage", [])
+            storage_count = len(storage_records)
+            make_storage_loader = lambda start, count: (lambda: storage_records[start:start + count])
+        box_sizes = save_data.get("storage_box_sizes") or default_box_sizes(storage_count or 0)
+        self.storage.load_lazy(box_sizes, make_storage_loader)
+        
+        # 図鑑を復元（図鑑の無い古いセーブは、手持ちとボックスの中身から作り直す）
+        if "dex" in save_data:
+            self.dex = Pokedex.decode(save_data["dex"])
+        else:
+            self.dex = Pokedex()
+            for monster in self.player_party.members:
+                self.dex.mark_caught(monster.base_stats['id'])
+            for monster_data in save_data.get("storage", []):
+                self.dex.mark_caught(monster_data.get("id"))
+        
+        return True
     
     def create_backup(self):
         """手動バックアップ作成"""
@@ -320,8 +530,30 @@ class GameManager:
             print(f"バックアップ作成に失敗: {e}")
             return False
     
+    def _is_quiet_scene(self):
+        """オートセーブしてもよい落ち着いたシーンかどうか"""
+        from scenes.field_scene import FieldScene
+        from scenes.menu_scene import MenuScene
+        from scenes.bag_scene import BagScene
+        return isinstance(self.current_scene, (FieldScene, MenuScene, BagScene))
+
+    def _update_autosave(self):
+        """
+        条件がそろっていればオートセーブする（タイトル画面ではしない）。
+        プレイヤーがスロットを選ぶ（ロード・はじめからでの選択・セーブ）までは、
+        既定のスロット1にある別のレポートを上書きしないように何もしない。
+        """
+        from scenes.title_scene import TitleScene
+        if self.current_scene is None or isinstance(self.current_scene, TitleScene) or not self.slot_chosen:
+            return
+        self.autosave.update(self.clock.get_rawtime(), self._is_quiet_scene())
+
     def handle_scene_result(self, result):
         """シーンの結果を処理"""
+        # 状態が変わる遷移ではオートセーブの印をつける（書き込みは後でまとめて行う）
+        if result in ("battle_victory", "battle_defeat", "escaped", "back"):
+            self.autosave.mark_dirty(result)
+        
         if result == "battle_victory":
             print("バトル勝利！")
             self.start_field()
@@ -333,6 +565,11 @@ class GameManager:
             self.start_field()
         elif result == "to_field":
             self.start_field()
+        elif result.startswith("new_game|"):
+            # "new_game|スロット番号": はじめから。選んだスロットに書く
+            self.set_save_slot(int(result.split("|")[1]))
+            self.slot_chosen = True
+            self.start_field()
         elif result == "to_battle":
             self.start_battle("charmander", 5)
         elif result == "to_menu":
@@ -352,11 +589,25 @@ class GameManager:
                 enemy_id = parts[1]
                 enemy_level = int(parts[2])
                 self.start_battle(enemy_id, enemy_level)
-        elif result == "save_game":
-            self.save_game()
-        elif result == "load_game":
+        elif result == "save_game" or result.startswith("save_game|"):
+            # "save_game|スロット番号" の形式で書き込むスロットを指定できる
+            parts = result.split("|")
+            if len(parts) == 2 and int(parts[1]) != self.current_slot:
+                self.set_save_slot(int(parts[1]))
+            if self.save_game():
+                self.slot_chosen = True
+                self.autosave.mark_clean()
+        elif result == "load_game" or result.startswith("load_game|"):
+            # "load_game|スロット番号" の形式でスロットを指定できる
+            parts = result.split("|")
+            if len(parts) == 2:
+                self.set_save_slot(int(parts[1]))
             if self.load_game():
+                self.slot_chosen = True
+                self.autosave.mark_clean()
                 self.start_field()
+                # フィールドに入ってから、ボックスをバックグラウンドで展開する
+                self.storage.preload_in_background()
             else:
                 self.start_title() # ロード失敗時はタイトルへ
         elif result == "create_backup":
@@ -377,6 +628,9 @@ class GameManager:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == SAVE_COMPLETE_EVENT:
+                    self._on_save_complete(event)
+                    continue
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_F4 and pygame.key.get_pressed()[pygame.K_LALT]:
                         self.running = False
@@ -408,6 +662,11 @@ class GameManager:
                 self.current_scene.draw()
             
             pygame.display.flip()
+            
+            # フレームの処理に余裕があればオートセーブ
+            self._update_autosave()
         
+        # 書き込み中のセーブがあれば終わるまで待つ
+        self.save_writer.shutdown()
         pygame.quit()
         sys.exit()
\ No newline at end of file
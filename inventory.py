@@ -7,6 +7,7 @@ class Inventory:
     def __init__(self):
         # {"item_id": {"data": item_data, "count": count}} の形式
         self.items = {} 
+        self._version = 0 # 所持数が変わるたびに増える（セーブ用）
         # 本家を参考にポケットを定義
         self.pockets = ["どうぐ", "ボール", "わざマシン", "きのみ", "たいせつなもの"]
 
@@ -22,6 +23,7 @@ class Inventory:
         else:
             # アイテムデータをコピーして所持数（count）を追加
             self.items[item_id] = {'data': item_data.copy(), 'count': count}
+        self._version += 1
         
         if show_message:
             # ★★★ ここを修正 ★★★
@@ -34,6 +36,12 @@ class Inventory:
             self.items[item_id]['count'] -= count
             if self.items[item_id]['count'] <= 0:
                 del self.items[item_id]
+            self._version += 1
+
+    def clear(self):
+        """持ち物をすべて捨てる（ロード時に使う）"""
+        self.items.clear()
+        self._version += 1
 
     def get_items_by_pocket(self, pocket_name):
         """指定されたポケットのアイテムリストを返す"""
@@ -1,11 +1,43 @@
 # monster.py
 
+import uuid
 from monsters_data import MONSTER_DATABASE
 from moves_data import MOVE_DATABASE
 from exp_data import get_exp_for_level
 
+
+_UNSET = object()
+
+
+class _TrackedField:
+    """
+    値が変わるたびにモンスターの _version を進める属性（セーブの差分検出用）。
+    __get__ を定義しないので、読み出しは通常の属性と同じ速さ（インスタンスの辞書から直接読む）。
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __set__(self, obj, value):
+        d = obj.__dict__
+        if d.get(self.name, _UNSET) != value:
+            d[self.name] = value
+            d["_version"] += 1
+
+
 class Monster:
+    # セーブデータに書く値。書き換えると _version が進む
+    level = _TrackedField()
+    current_hp = _TrackedField()
+    max_hp = _TrackedField()
+    exp = _TrackedField()
+    exp_to_next_level = _TrackedField()
+    status_condition = _TrackedField()
+    toxic_counter = _TrackedField()
+    sleep_counter = _TrackedField()
+    moves = _TrackedField()
+
     def __init__(self, name, types, level, base_stats, moves, growth_rate, learnset):
+        self._version = 0  # 変更のたびに増える（セーブ用のキャッシュが古いかどうかの判定に使う）
         self.name = name
         self.types = types
         self.level = level
@@ -13,6 +45,7 @@ class Monster:
         self.moves = moves
         self.growth_rate = growth_rate
         self.learnset = learnset
+        self.uid = uuid.uuid4().hex  # セーブデータ上で個体を識別するID
         self.status_condition = None
         self.toxic_counter = 0
         self.sleep_counter = 0
@@ -41,6 +74,20 @@ class Monster:
         self.sp_defense = int(self.base_stats['base_sp_defense'] * self.level / 50) + 5
         self.speed = int(self.base_stats['base_speed'] * self.level / 50) + 5
 
+    def mark_dirty(self):
+        """技のPPなど、属性の代入を通らない変更をしたときに呼ぶ"""
+        self._version += 1
+
+    def use_pp(self, move, amount=1):
+        """技のPPを消費する"""
+        move['current_pp'] = max(0, move.get('current_pp', 0) - amount)
+        self.mark_dirty()
+
+    def replace_move(self, index, move_data):
+        """index 番目の技を忘れて、新しい技を覚える"""
+        self.moves[index] = move_data
+        self.mark_dirty()
+
     def take_damage(self, damage):
         self.current_hp -= damage
         if self.current_hp < 0:
@@ -142,6 +189,7 @@ class Monster:
                 if len(self.moves) < 4:
                     # 技スロットに空きがあればそのまま覚える
                     self.moves.append(move_data)
+                    self.mark_dirty()
                     messages.append(f"{self.name}は {move_data['name']}を おぼえた！")
                 else:
                     # 技スロットが満杯なら技習得選択画面へ
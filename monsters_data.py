@@ -3,6 +3,7 @@
 # モンスターの「種族値」データを定義
 MONSTER_DATABASE = {
     "bulbasaur": {
+        "dex_no": 1, # 図鑑番号（図鑑のビットセットの位置）
         "name": "フシギダネネ",
         "types": ["grass", "poison"],
         "growth_rate": "medium_slow",
@@ -20,6 +21,7 @@ MONSTER_DATABASE = {
         "moves": ["tackle", "ice_beam", "ember", "swords_dance"]
     },
     "charmander": {
+        "dex_no": 4, # 図鑑番号（図鑑のビットセットの位置）
         "name": "ヒトカゲ",
         "types": ["fire"],
         "growth_rate": "medium_slow",
@@ -36,6 +38,7 @@ MONSTER_DATABASE = {
         "moves": ["tackle"]
     },
     "squirtle": {
+        "dex_no": 7, # 図鑑番号（図鑑のビットセットの位置）
         "name": "ゼニガメ",
         "types": ["water"],
         "growth_rate": "medium_slow",
@@ -52,6 +55,7 @@ MONSTER_DATABASE = {
         "moves": ["tackle", "ice_beam"]
     },
     "pidgey": {
+        "dex_no": 16, # 図鑑番号（図鑑のビットセットの位置）
         "name": "ポッポ",
         "types": ["normal", "flying"],
         "growth_rate": "medium_fast",
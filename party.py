@@ -4,6 +4,7 @@ from monster import Monster
 class Party:
     def __init__(self):
         self.members = [] # 手持ちモンスターのリスト
+        self._version = 0 # 入れ替え・追加のたびに増える（セーブ用）
 
     def add_monster(self, monster):
         # 追加しようとしているのがNoneでないかチェック
@@ -13,9 +14,19 @@ class Party:
 
         if len(self.members) < 6:
             self.members.append(monster)
+            self._version += 1
         else:
             print("手持ちがいっぱいです！")
 
+    def swap(self, i, j):
+        """i 番目と j 番目のモンスターを入れ替える"""
+        self.members[i], self.members[j] = self.members[j], self.members[i]
+        self._version += 1
+
+    def clear(self):
+        self.members.clear()
+        self._version += 1
+
     def get_active_monster(self):
         # 戦闘に出せる、ひんしでない最初のモンスターを返す
         for monster in self.members:
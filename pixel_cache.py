@@ -0,0 +1,101 @@
+# pixel_cache.py
+# 機能：デコード済みのピクセル（RGBA）をディスクに置いておき、PNGのデコードを省く
+#
+# 1回目に読み込んだ画像は、RGBAのバイト列を小さなヘッダー付きでキャッシュのディレクトリに書く。
+# 2回目以降はそのファイルを mmap して pygame.image.frombuffer で包むだけなので、
+# PNGの展開は行われず、ファイルのページインだけで済む。
+# ヘッダーには元のファイルの内容のハッシュを入れておき、元の画像が変わっていたら作り直す。
+#
+# ファイルの形式: ヘッダー（マジック, 形式の版, 幅, 高さ, 元ファイルのSHA-256）+ 幅x高さx4 バイトのRGBA
+
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+
+PIXEL_CACHE_DIR = ".pixel_cache"
+PIXEL_CACHE_VERSION = 1
+
+_HEADER = struct.Struct("<4sIII32s")
+_MAGIC = b"RGBA"
+
+_stats = {"hits": 0, "misses": 0, "write_errors": 0}
+
+
+def _source_digest(path):
+    """元ファイルの内容のSHA-256（バイト列）"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def cache_path_for(path, cache_dir=PIXEL_CACHE_DIR):
+    """元画像のパスに対応するキャッシュファイルのパス"""
+    name = os.path.normpath(path).replace(os.sep, "__")
+    return os.path.join(cache_dir, name + ".rgba")
+
+
+def _read_cache(cache_path, digest):
+    """キャッシュが使えれば ((幅, 高さ), RGBAのバッファ) を返す。無い・古い・壊れている場合は None"""
+    try:
+        with open(cache_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # 空のファイルは ValueError
+        return None
+    if len(mapped) < _HEADER.size:
+        return None
+    magic, version, width, height, source_digest = _HEADER.unpack_from(mapped)
+    if (magic != _MAGIC or version != PIXEL_CACHE_VERSION or source_digest != digest
+            or len(mapped) != _HEADER.size + width * height * 4):
+        return None
+    # mmap はバッファを使う側（frombuffer の Surface など）が手放したときに閉じられる
+    return (width, height), memoryview(mapped)[_HEADER.size:]
+
+
+def _write_cache(cache_path, digest, size, data):
+    """キャッシュを書く（途中で止まっても壊れたファイルが残らないように、別名で書いてから置き換える）"""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, PIXEL_CACHE_VERSION, size[0], size[1], digest))
+            f.write(data)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        _stats["write_errors"] += 1
+        print(f"[WARNING] ピクセルキャッシュを書けませんでした: {cache_path} ({e})")
+
+
+def load_pixels(path, cache_dir=PIXEL_CACHE_DIR):
+    """
+    画像を ((幅, 高さ), RGBAのバイト列) で返す。キャッシュがあればデコードしない。
+    別スレッドから呼んでもよい（表示用の Surface への変換はしない）。
+    """
+    digest = _source_digest(path)
+    cache_path = cache_path_for(path, cache_dir)
+    cached = _read_cache(cache_path, digest)
+    if cached is not None:
+        _stats["hits"] += 1
+        return cached
+
+    _stats["misses"] += 1
+    image = pygame.image.load(path)  # 読めない場合は今までと同じ例外になる
+    size = image.get_size()
+    data = pygame.image.tobytes(image, "RGBA")
+    _write_cache(cache_path, digest, size, data)
+    return size, data
+
+
+def load_image(path, cache_dir=PIXEL_CACHE_DIR):
+    """pygame.image.load(path).convert_alpha() と同じ Surface を、キャッシュを使って作る"""
+    size, data = load_pixels(path, cache_dir)
+    return pygame.image.frombuffer(data, size, "RGBA").convert_alpha()
+
+
+def pixel_cache_stats():
+    """診断用の統計"""
+    return dict(_stats)
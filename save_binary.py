@@ -0,0 +1,306 @@
+# save_binary.py
+# 機能：コンパクトなバイナリ形式のセーブデータ（JSONとの相互変換つき）
+#
+# レイアウト（すべてリトルエンディアン）:
+#   ヘッダー     HEADER（マジック, スキーマのバージョン, レコード長, 各セクションの長さと件数）
+#   メタデータ   JSON（位置・プレイ時間・フラグ・持ち物など、モンスター以外）
+#   文字列表     JSON（種族ID・技IDのリスト。レコードからは番号で参照する）
+#   パーティ     固定長レコード × party_count
+#   ボックス     固定長レコード × storage_count
+#
+# モンスターは固定長レコードなので、先頭から順に少しずつ読み出したり、
+# 特定のレコードまで読み飛ばしたりできる。
+
+import json
+import os
+import shutil
+import struct
+import uuid
+
+from monsters_data import MONSTER_DATABASE
+
+MAGIC = b"PKSV"
+SCHEMA_VERSION = 1
+
+# マジック, バージョン, レコード長, メタデータ長, 文字列表の長さ, パーティ数, ボックスの匹数
+HEADER = struct.Struct("<4sHHIIII")
+
+# 個体ID(16バイト), 種族, レベル, HP, 最大HP, 経験値, 次のレベルの経験値,
+# 状態異常, もうどくカウンタ, ねむりカウンタ, 技ID×4, PP×4
+MONSTER_RECORD = struct.Struct("<16sHBHHIIBBB4H4B")
+
+MAX_MOVES = 4
+NO_MOVE = 0xFFFF
+
+# 状態異常の番号（0 は状態異常なし）。後ろに追加していくこと
+STATUS_CODES = [None, "poison", "paralysis", "toxic", "burn", "sleep", "freeze"]
+_STATUS_TO_CODE = {status: code for code, status in enumerate(STATUS_CODES)}
+
+# 一度に読み込むレコード数（ストリーミング読み込み用）
+READ_CHUNK_RECORDS = 256
+
+
+def binary_save_path(json_path):
+    """JSONセーブのパスに対応するバイナリセーブのパス"""
+    return os.path.splitext(json_path)[0] + ".bin"
+
+
+class _StringTable:
+    """文字列 ⇔ 番号 の対応表（エンコード用）"""
+    def __init__(self):
+        self.strings = []
+        self._index = {}
+
+    def index_of(self, text):
+        if text not in self._index:
+            self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return self._index[text]
+
+
+def _encode_uid(uid):
+    if not uid:
+        uid = uuid.uuid4().hex
+    return bytes.fromhex(uid)
+
+
+def _encode_monster(monster_data, table):
+    """シリアライズ済みのモンスター（辞書）を固定長レコードにする"""
+    move_ids = [NO_MOVE] * MAX_MOVES
+    pps = [0] * MAX_MOVES
+    if "moves" in monster_data:
+        moves = [(m.get("id"), m.get("current_pp", 0)) for m in monster_data["moves"]]
+    else:
+        # 古いセーブ形式（PPなし）は最大PPとして扱う
+        from moves_data import MOVE_DATABASE
+        moves = [(move_id, MOVE_DATABASE.get(move_id, {}).get("pp", 0)) for move_id in monster_data.get("move_ids", [])]
+    for i, (move_id, pp) in enumerate(moves[:MAX_MOVES]):
+        move_ids[i] = table.index_of(move_id)
+        pps[i] = pp
+
+    return MONSTER_RECORD.pack(
+        _encode_uid(monster_data.get("uid")),
+        table.index_of(monster_data["id"]),
+        monster_data["level"],
+        monster_data["current_hp"],
+        monster_data["max_hp"],
+        monster_data["exp"],
+        monster_data["exp_to_next_level"],
+        _STATUS_TO_CODE[monster_data.get("status_condition")],
+        monster_data.get("toxic_counter", 0),
+        monster_data.get("sleep_counter", 0),
+        *move_ids,
+        *pps
+    )
+
+
+def _decode_monster(fields, strings):
+    """固定長レコードを、_deserialize_monster が受け取れる辞書に戻す"""
+    uid, species, level, current_hp, max_hp, exp, exp_to_next_level, status, toxic, sleep = fields[:10]
+    move_ids = fields[10:10 + MAX_MOVES]
+    pps = fields[10 + MAX_MOVES:]
+
+    monster_id = strings[species]
+    species_data = MONSTER_DATABASE.get(monster_id, {})
+    return {
+        "uid": uid.hex(),
+        "id": monster_id,
+        "name": species_data.get("name", monster_id),
+        "level": level,
+        "current_hp": current_hp,
+        "max_hp": max_hp,
+        "exp": exp,
+        "exp_to_next_level": exp_to_next_level,
+        "status_condition": STATUS_CODES[status],
+        "toxic_counter": toxic,
+        "sleep_counter": sleep,
+        "types": list(species_data.get("types", [])),
+        "moves": [
+            {"id": strings[move_id], "current_pp": pp}
+            for move_id, pp in zip(move_ids, pps) if move_id != NO_MOVE
+        ]
+    }
+
+
+def decode_monster_records(raw, strings, start=0, count=None):
+    """レコードが並んだバイト列から、start 匹目から count 匹ぶんを辞書にして返す"""
+    view = memoryview(raw)
+    if count is None:
+        count = len(view) // MONSTER_RECORD.size - start
+    begin = start * MONSTER_RECORD.size
+    chunk = view[begin:begin + count * MONSTER_RECORD.size]
+    return [_decode_monster(fields, strings) for fields in MONSTER_RECORD.iter_unpack(chunk)]
+
+
+class EncodedRecords:
+    """
+    バイナリセーブから読んだまま、デコードしていないモンスターのレコード（と、その文字列表）。
+    呼ぶとデコードした辞書のリストを返すので、PCStorage の未展開ボックスの loader として使える。
+    一度も開かれなかったボックスは、セーブのときにこのまま書き戻す（encode_binary_save を参照）。
+    """
+    def __init__(self, raw, strings):
+        self.raw = raw
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.raw) // MONSTER_RECORD.size
+
+    def __call__(self):
+        return decode_monster_records(self.raw, self.strings)
+
+
+def _encode_records(encoded, table):
+    """EncodedRecords を table の番号で書き直す（番号が同じならそのままコピー）"""
+    strings = encoded.strings
+    if table.strings[:len(strings)] == strings:
+        return bytes(encoded.raw)
+    remapped = []
+    for fields in MONSTER_RECORD.iter_unpack(encoded.raw):
+        fields = list(fields)
+        fields[1] = table.index_of(strings[fields[1]])
+        for i in range(10, 10 + MAX_MOVES):
+            if fields[i] != NO_MOVE:
+                fields[i] = table.index_of(strings[fields[i]])
+        remapped.append(MONSTER_RECORD.pack(*fields))
+    return b"".join(remapped)
+
+
+def encode_binary_save(save_data):
+    """
+    セーブデータ（辞書）をバイナリにする。
+    save_data["storage"] には辞書のほかに EncodedRecords（読み込んだままのボックス）が混ざっていてもよい。
+    """
+    table = _StringTable()
+    party = save_data.get("player_party", [])
+    storage = save_data.get("storage", [])
+    # 読み込んだままのレコードがあれば、その文字列表から始める（番号が変わらないので、デコードせずにコピーできる）
+    for entry in storage:
+        if isinstance(entry, EncodedRecords):
+            for text in entry.strings:
+                table.index_of(text)
+            break
+    records = b"".join(_encode_monster(m, table) for m in party)
+    storage_count = 0
+    for entry in storage:
+        if isinstance(entry, EncodedRecords):
+            records += _encode_records(entry, table)
+            storage_count += len(entry)
+        else:
+            records += _encode_monster(entry, table)
+            storage_count += 1
+
+    meta = {k: v for k, v in save_data.items() if k not in ("player_party", "storage")}
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    strings_bytes = json.dumps(table.strings, separators=(",", ":")).encode('utf-8')
+
+    header = HEADER.pack(
+        MAGIC, SCHEMA_VERSION, MONSTER_RECORD.size,
+        len(meta_bytes), len(strings_bytes), len(party), storage_count
+    )
+    return header + meta_bytes + strings_bytes + records
+
+
+def write_binary_save(path, save_data):
+    """バイナリ形式で書き込む（SaveWriter の write_func としても使える）"""
+    from save_writer import write_file_atomic
+    payload = encode_binary_save(save_data)
+    if os.path.exists(path):
+        shutil.copy2(path, path + ".backup")
+    write_file_atomic(path, payload)
+
+
+class BinarySaveReader:
+    """
+    バイナリセーブを先頭から順に読むクラス。
+    ヘッダー・メタデータ・文字列表だけを先に読み、
+    モンスターのレコードは必要になった分だけ読み出せる。
+    """
+    def __init__(self, f):
+        self.f = f
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("バイナリセーブのヘッダーが短すぎます")
+        magic, version, record_size, meta_len, strings_len, party_count, storage_count = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("バイナリセーブではありません")
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"新しすぎるセーブデータです (スキーマ {version})")
+        if record_size != MONSTER_RECORD.size:
+            raise ValueError(f"レコード長が一致しません ({record_size} != {MONSTER_RECORD.size})")
+
+        self.version = version
+        self.party_count = party_count
+        self.storage_count = storage_count
+        self.meta = json.loads(f.read(meta_len).decode('utf-8'))
+        self.strings = json.loads(f.read(strings_len).decode('utf-8'))
+        # パーティとボックスのレコードの開始位置（ファイル先頭からのバイト数）
+        self.party_offset = HEADER.size + meta_len + strings_len
+        self.storage_offset = self.party_offset + party_count * MONSTER_RECORD.size
+
+    def iter_records(self, offset, count, chunk_records=READ_CHUNK_RECORDS):
+        """offset から count 匹ぶんのモンスターを少しずつ読み出して返す"""
+        self.f.seek(offset)
+        remaining = count
+        while remaining > 0:
+            n = min(chunk_records, remaining)
+            chunk = self.f.read(n * MONSTER_RECORD.size)
+            if len(chunk) < n * MONSTER_RECORD.size:
+                raise ValueError("バイナリセーブのレコードが途中で切れています")
+            for fields in MONSTER_RECORD.iter_unpack(chunk):
+                yield _decode_monster(fields, self.strings)
+            remaining -= n
+
+    def read_storage_bytes(self):
+        """ボックスのレコードを、デコードせずにバイト列のまま読み出す"""
+        self.f.seek(self.storage_offset)
+        return self.f.read(self.storage_count * MONSTER_RECORD.size)
+
+    def iter_party(self):
+        return self.iter_records(self.party_offset, self.party_count)
+
+    def iter_storage(self, start=0, count=None):
+        """ボックスの start 匹目から count 匹ぶんを読み出す"""
+        if count is None:
+            count = self.storage_count - start
+        count = max(0, min(count, self.storage_count - start))
+        return self.iter_records(self.storage_offset + start * MONSTER_RECORD.size, count)
+
+
+def read_binary_save(path):
+    """バイナリセーブをすべて読み込み、JSONと同じ形の辞書にして返す"""
+    with open(path, 'rb') as f:
+        reader = BinarySaveReader(f)
+        save_data = dict(reader.meta)
+        save_data["player_party"] = list(reader.iter_party())
+        if reader.storage_count:
+            save_data["storage"] = list(reader.iter_storage())
+    return save_data
+
+
+def json_to_binary(json_path, binary_path):
+    """JSONセーブをバイナリセーブに変換する"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        save_data = json.load(f)
+    write_binary_save(binary_path, save_data)
+
+
+def binary_to_json(binary_path, json_path):
+    """バイナリセーブをJSONセーブに変換する"""
+    from save_writer import write_file_atomic
+    save_data = read_binary_save(binary_path)
+    write_file_atomic(json_path, json.dumps(save_data, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 4 or sys.argv[1] not in ("to-bin", "to-json"):
+        print("使い方: python save_binary.py to-bin <入力.json> <出力.bin>")
+        print("        python save_binary.py to-json <入力.bin> <出力.json>")
+        sys.exit(1)
+
+    if sys.argv[1] == "to-bin":
+        json_to_binary(sys.argv[2], sys.argv[3])
+    else:
+        binary_to_json(sys.argv[2], sys.argv[3])
+    print(f"変換しました: {sys.argv[2]} → {sys.argv[3]}")
@@ -0,0 +1,290 @@
+# save_journal.py
+# 機能：セーブデータの差分を追記していくジャーナル（オートセーブ用）
+#
+# ファイル構成:
+#   save_data.json            … 全体のスナップショット（"journal_segment": N を持つ）
+#   save_data.json.journal.M  … 差分ログ（1行1件のJSON）。M > N のものだけが未反映
+#
+# スナップショットには「どのセグメントまで反映済みか」を記録しているので、
+# 圧縮（スナップショットの書き直し）の途中で落ちても、
+# 古いスナップショット + 残っているセグメントから同じ状態を復元できる。
+
+import json
+import os
+
+# 現在のセグメントがこのバイト数を超えたらスナップショットに圧縮する
+DEFAULT_COMPACT_THRESHOLD = 64 * 1024
+
+# 差分を個別に扱うトップレベルのキー
+_FLAG_KEY = "flags"  # GameFlags.encode() の {"bits": ..., "extra": {...}}
+_LEGACY_FLAG_KEY = "game_flags"  # 以前の辞書形式（古いセグメントの "flag" 操作の適用先）
+_INVENTORY_KEY = "inventory"
+_PARTY_KEY = "player_party"
+# ジャーナルの管理情報（差分の対象外）
+_SEGMENT_KEY = "journal_segment"
+
+
+def journal_segment_path(save_path, segment):
+    return f"{save_path}.journal.{segment}"
+
+
+def list_journal_segments(save_path):
+    """存在するジャーナルのセグメント番号を昇順で返す"""
+    directory = os.path.dirname(os.path.abspath(save_path))
+    prefix = os.path.basename(save_path) + ".journal."
+    segments = []
+    for filename in os.listdir(directory):
+        if filename.startswith(prefix):
+            suffix = filename[len(prefix):]
+            if suffix.isdigit():
+                segments.append(int(suffix))
+    return sorted(segments)
+
+
+def remove_journal_segments(save_path, up_to_segment):
+    """スナップショットに反映済みのセグメントを削除する"""
+    for segment in list_journal_segments(save_path):
+        if segment <= up_to_segment:
+            try:
+                os.remove(journal_segment_path(save_path, segment))
+            except OSError as e:
+                print(f"[WARNING] ジャーナルの削除に失敗: {e}")
+
+
+def diff_save_data(old, new):
+    """2つのセーブデータの差分を操作（op）のリストにする"""
+    ops = []
+
+    # フラグ: ビット列は短いので変わったら丸ごと、extra は1つずつ
+    old_flags, new_flags = old.get(_FLAG_KEY) or {}, new.get(_FLAG_KEY) or {}
+    if _FLAG_KEY in old and _FLAG_KEY not in new:
+        ops.append({"op": "del", "key": _FLAG_KEY})
+    elif _FLAG_KEY in new and old_flags.get("bits") != new_flags.get("bits"):
+        ops.append({"op": "flag_bits", "value": new_flags.get("bits", "")})
+    old_extra, new_extra = old_flags.get("extra", {}), new_flags.get("extra", {})
+    for key, value in new_extra.items():
+        if key not in old_extra or old_extra[key] != value:
+            ops.append({"op": "flag_extra", "key": key, "value": value})
+    for key in old_extra:
+        if key not in new_extra:
+            ops.append({"op": "flag_extra_del", "key": key})
+
+    # 持ち物は所持数の変化だけ（0なら削除）
+    old_items, new_items = old.get(_INVENTORY_KEY, {}), new.get(_INVENTORY_KEY, {})
+    for item_id in set(old_items) | set(new_items):
+        count = new_items.get(item_id, 0)
+        if old_items.get(item_id, 0) != count:
+            ops.append({"op": "item", "key": item_id, "count": count})
+
+    # パーティは個体ID（uid）で対応づける
+    old_party, new_party = old.get(_PARTY_KEY, []), new.get(_PARTY_KEY, [])
+    old_uids = [m.get("uid") for m in old_party]
+    new_uids = [m.get("uid") for m in new_party]
+    if None in new_uids or sorted(old_uids, key=str) != sorted(new_uids, key=str):
+        # メンバーが入れ替わった場合はパーティごと書く（最大6匹なので小さい）
+        ops.append({"op": "party", "value": new_party})
+    else:
+        if old_uids != new_uids:
+            ops.append({"op": "party_order", "uids": new_uids})
+        old_by_uid = {m["uid"]: m for m in old_party}
+        for monster in new_party:
+            before = old_by_uid[monster["uid"]]
+            fields = {k: v for k, v in monster.items() if before.get(k) != v}
+            if fields:
+                ops.append({"op": "monster", "uid": monster["uid"], "fields": fields})
+
+    # それ以外（位置・プレイ時間など）はキーごとに丸ごと置き換える
+    handled = (_FLAG_KEY, _INVENTORY_KEY, _PARTY_KEY, _SEGMENT_KEY)
+    for key, value in new.items():
+        if key not in handled and old.get(key) != value:
+            ops.append({"op": "set", "key": key, "value": value})
+    for key in old:
+        if key not in handled and key not in new:
+            ops.append({"op": "del", "key": key})
+
+    return ops
+
+
+def apply_ops(save_data, ops):
+    """diff_save_data の操作をセーブデータに適用する（その場で書き換える）"""
+    for op in ops:
+        kind = op["op"]
+        if kind == "set":
+            save_data[op["key"]] = op["value"]
+        elif kind == "del":
+            save_data.pop(op["key"], None)
+        elif kind == "flag_bits":
+            save_data.setdefault(_FLAG_KEY, {})["bits"] = op["value"]
+        elif kind == "flag_extra":
+            save_data.setdefault(_FLAG_KEY, {}).setdefault("extra", {})[op["key"]] = op["value"]
+        elif kind == "flag_extra_del":
+            flags = save_data.setdefault(_FLAG_KEY, {})
+            flags.get("extra", {}).pop(op["key"], None)
+            if not flags.get("extra", True):
+                del flags["extra"]
+        elif kind == "flag":  # 以前の形式で書かれたセグメント
+            save_data.setdefault(_LEGACY_FLAG_KEY, {})[op["key"]] = op["value"]
+        elif kind == "flag_del":
+            save_data.setdefault(_LEGACY_FLAG_KEY, {}).pop(op["key"], None)
+        elif kind == "item":
+            items = save_data.setdefault(_INVENTORY_KEY, {})
+            if op["count"] > 0:
+                items[op["key"]] = op["count"]
+            else:
+                items.pop(op["key"], None)
+        elif kind == "party":
+            save_data[_PARTY_KEY] = op["value"]
+        elif kind == "party_order":
+            by_uid = {m["uid"]: m for m in save_data.get(_PARTY_KEY, [])}
+            save_data[_PARTY_KEY] = [by_uid[uid] for uid in op["uids"]]
+        elif kind == "monster":
+            for monster in save_data.get(_PARTY_KEY, []):
+                if monster.get("uid") == op["uid"]:
+                    monster.update(op["fields"])
+                    break
+        else:
+            print(f"[WARNING] 不明なジャーナル操作: {kind}")
+    return save_data
+
+
+def read_journal_segment(path):
+    """セグメントを読み、操作のリストを返す（途中で切れた最終行は無視する）"""
+    ops = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # 書き込み中に落ちた行
+            try:
+                ops.extend(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"[WARNING] ジャーナルの破損した行を無視します: {path}")
+                break
+    return ops
+
+
+def load_with_journal(save_path):
+    """
+    スナップショットを読み、未反映のジャーナルを順に再生する。
+    再生量は圧縮のしきい値で頭打ちになるので、長時間遊んでも読み込みは速い。
+    戻り値: (セーブデータ, 最後に再生したセグメント番号)。何もなければ (None, 0)。
+    """
+    save_data = None
+    if os.path.exists(save_path):
+        with open(save_path, 'r', encoding='utf-8') as f:
+            save_data = json.load(f)
+
+    base_segment = save_data.get(_SEGMENT_KEY, 0) if save_data else 0
+    last_segment = base_segment
+    for segment in list_journal_segments(save_path):
+        if segment <= base_segment:
+            continue
+        ops = read_journal_segment(journal_segment_path(save_path, segment))
+        if save_data is None:
+            save_data = {}
+        apply_ops(save_data, ops)
+        last_segment = segment
+
+    return save_data, last_segment
+
+
+def _append_lines(path, payload):
+    """ジャーナルに追記して fsync する（SaveWriter のスレッドで呼ばれる）"""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class SaveJournal:
+    """
+    セーブデータの差分をジャーナルに追記するクラス。
+    書き込みはすべて SaveWriter のスレッドに順番に依頼するので、
+    追記と圧縮の順序が入れ替わることはない。
+
+    差分は「前回依頼した状態」との差なので、途中の追記が失敗すると、その後の追記は
+    ディスクに無い状態を前提にしたものになってしまう。そこで書き込みに失敗したら _broken を立て、
+    次の圧縮が成功するまで追記はしない（失敗として扱う）。次の record では差分ではなく
+    スナップショットを書き直すので、失われた差分の分も含めて元に戻る。
+    """
+    def __init__(self, save_path, save_writer, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        self.save_path = save_path
+        self.save_writer = save_writer
+        self.compact_threshold = compact_threshold
+        self._last_state = None  # 最後に書き込みを依頼した状態
+        self._broken = False  # 書き込みに失敗し、スナップショットの書き直しが必要（書き込みスレッドが立てる）
+        # 追記先のセグメント番号（前回のプレイで残ったセグメントより後ろから始める）
+        self._segment = max(list_journal_segments(save_path), default=0) + 1
+        self._segment_bytes = 0  # 追記先のセグメントに書いたバイト数
+
+    def resume(self, save_data, last_segment):
+        """読み込んだ状態から追記を再開する（新しいセグメントに書き始める）"""
+        self._last_state = save_data
+        self._segment = last_segment + 1
+        self._segment_bytes = 0
+
+    def record(self, save_data, after_write=None):
+        """
+        新しい状態を記録する。前回との差分だけを追記し、
+        セグメントが大きくなったらスナップショットに圧縮する。
+        save_data は以後変更されないスナップショットであること。
+        after_write はこの状態の書き込みが成功したときに書き込みスレッドで呼ばれる（差分が無ければ呼ばれない）。
+        """
+        if self._last_state is None or self._broken:
+            # 基準となる状態がまだない、または前の書き込みに失敗した場合は、スナップショットを書く
+            self.compact(save_data, after_write)
+            return
+
+        ops = diff_save_data(self._last_state, save_data)
+        self._last_state = save_data
+        if not ops:
+            return
+
+        payload = json.dumps(ops, ensure_ascii=False, separators=(",", ":")) + "\n"
+        path = journal_segment_path(self.save_path, self._segment)
+        self.save_writer.submit(path, payload, write_func=self._append, after_write=after_write, notify=False)
+        self._segment_bytes += len(payload.encode('utf-8'))
+
+        if self._segment_bytes >= self.compact_threshold:
+            self.compact(save_data)
+
+    def _append(self, path, payload):
+        """追記する（書き込みスレッド）。前の書き込みが失敗していたら、圧縮まで追記しない"""
+        if self._broken:
+            raise OSError("前のジャーナルの書き込みに失敗したため、スナップショットを書き直すまで追記しません")
+        try:
+            _append_lines(path, payload)
+        except Exception:
+            self._broken = True
+            raise
+
+    def _write_snapshot(self, path, snapshot):
+        """スナップショットを書く（書き込みスレッド）。成功すれば、それまでの失敗は取り戻せている"""
+        from save_writer import write_json_save
+        try:
+            write_json_save(path, snapshot)
+        except Exception:
+            self._broken = True
+            raise
+        self._broken = False
+
+    def compact(self, save_data, after_write=None, notify=False):
+        """
+        現在の状態をスナップショットとして書き、反映済みのセグメントを消す（手動セーブでも使う）。
+        notify=True なら、成功したときに SAVE_COMPLETE_EVENT を送る（失敗は常に送られる）。
+        """
+        covered_segment = self._segment
+        snapshot = dict(save_data)
+        snapshot[_SEGMENT_KEY] = covered_segment
+
+        def on_written():
+            remove_journal_segments(self.save_path, covered_segment)
+            if after_write:
+                after_write()
+
+        self.save_writer.submit(
+            self.save_path, snapshot, write_func=self._write_snapshot,
+            after_write=on_written, notify=notify
+        )
+        self._last_state = save_data
+        self._segment = covered_segment + 1
+        self._segment_bytes = 0
@@ -0,0 +1,83 @@
+# save_slots.py
+# 機能：複数のセーブスロットと、その概要をまとめたインデックスファイルを管理する
+#
+# タイトル画面ではインデックス（save_index.json）だけを読めば、
+# 各スロットのプレイ時間・手持ち・場所・保存日時を表示できる。
+# セーブ本体がどれだけ大きくなっても、一覧の表示コストは変わらない。
+
+import json
+import os
+import threading
+import time
+
+SAVE_INDEX_PATH = "save_index.json"
+MAX_SAVE_SLOTS = 3
+
+
+def slot_save_path(slot):
+    """スロット番号に対応するセーブファイルのパス（スロット1は従来の save_data.json）"""
+    if slot == 1:
+        return "save_data.json"
+    return f"save_data_{slot}.json"
+
+
+def build_slot_summary(save_data, save_format="json"):
+    """セーブデータからスロット一覧に表示する概要を作る"""
+    position = save_data.get("player_position", {})
+    return {
+        "play_time": save_data.get("play_time", 0),
+        "party": [
+            {"id": m.get("id"), "name": m.get("name"), "level": m.get("level")}
+            for m in save_data.get("player_party", [])
+        ],
+        "location": {"map": "field", "x": position.get("x"), "y": position.get("y")},
+        "timestamp": time.time(),
+        "format": save_format
+    }
+
+
+class SaveSlotIndex:
+    """スロットごとの概要を1つの小さなJSONファイルで管理するクラス"""
+    def __init__(self, path=SAVE_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {"slots": {}}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARNING] セーブ一覧の読み込みに失敗: {e}")
+            return {"slots": {}}
+
+    def list_slots(self):
+        """
+        (スロット番号, 概要) のリストを返す。
+        インデックスに無いスロットは、ファイルがあれば概要 {}（詳細不明）、なければ None。
+        """
+        slots = self._read().get("slots", {})
+        result = []
+        for slot in range(1, MAX_SAVE_SLOTS + 1):
+            summary = slots.get(str(slot))
+            if summary is None and os.path.exists(slot_save_path(slot)):
+                summary = {}  # インデックス導入前のセーブ
+            result.append((slot, summary))
+        return result
+
+    def has_any_save(self):
+        return any(summary is not None for _, summary in self.list_slots())
+
+    def write_slot(self, path, slot_and_summary):
+        """
+        スロットの概要を更新し、インデックスを書き直す。
+        SaveWriter の write_func として、セーブ本体の書き込みの後に呼ばれる。
+        """
+        from save_writer import write_file_atomic
+
+        slot, summary = slot_and_summary
+        with self._lock:
+            index = self._read()
+            index.setdefault("slots", {})[str(slot)] = summary
+            write_file_atomic(path, json.dumps(index, ensure_ascii=False, indent=2))
@@ -0,0 +1,110 @@
+# save_writer.py
+# 機能：セーブデータの書き込みをバックグラウンドスレッドで行う
+
+import json
+import os
+import queue
+import shutil
+import threading
+import pygame
+
+# 書き込み完了をメインループに知らせるイベント
+# event.path: 書き込んだファイル, event.success: 成否, event.error: 失敗時のメッセージ
+SAVE_COMPLETE_EVENT = pygame.USEREVENT + 1
+
+
+def write_file_atomic(path, payload):
+    """
+    一時ファイルに書いて fsync してから rename する。
+    途中で落ちても、元のファイルか新しいファイルのどちらかが必ず残る。
+    """
+    tmp_path = path + ".tmp"
+    mode = 'wb' if isinstance(payload, (bytes, bytearray, memoryview)) else 'w'
+    encoding = None if mode == 'wb' else 'utf-8'
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # rename自体をディスクに反映させる（ディレクトリのfsyncはPOSIXのみ）
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_json_save(path, save_data):
+    """セーブデータをJSONにして書き込む（既存ファイルは .backup に退避）"""
+    payload = json.dumps(save_data, ensure_ascii=False, separators=(",", ":"))
+    if os.path.exists(path):
+        shutil.copy2(path, path + ".backup")
+    write_file_atomic(path, payload)
+
+
+class SaveWriter:
+    """
+    セーブデータを書き込む専用スレッド。
+    メインスレッドは不変なスナップショットを渡すだけで、
+    シリアライズとファイル書き込みはすべてこのスレッドで行う。
+    """
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, snapshot, write_func=write_json_save, after_write=None, notify=True):
+        """
+        書き込みを依頼する（すぐに戻る）。
+        write_func(path, snapshot) が実際の書き込みを行い、
+        成功すると after_write() が書き込みスレッド上で呼ばれる。
+        notify=False の場合、成功時のイベントは送らない（失敗時は必ず送る）。
+        """
+        self._queue.put((path, snapshot, write_func, after_write, notify))
+
+    def is_busy(self):
+        """未完了の書き込みがあるかどうか"""
+        return self._queue.unfinished_tasks > 0
+
+    def wait_idle(self):
+        """依頼済みの書き込みがすべて終わるまで待つ"""
+        self._queue.join()
+
+    def shutdown(self):
+        """残りの書き込みを終えてからスレッドを終了する"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                path, snapshot, write_func, after_write, notify = job
+                try:
+                    write_func(path, snapshot)
+                    if after_write:
+                        after_write()
+                except Exception as e:
+                    self._post_result(path, False, str(e))
+                else:
+                    if notify:
+                        self._post_result(path, True, None)
+            finally:
+                self._queue.task_done()
+
+    def _post_result(self, path, success, error):
+        """結果をイベントキュー経由でメインスレッドに知らせる"""
+        try:
+            pygame.event.post(pygame.event.Event(SAVE_COMPLETE_EVENT, path=path, success=success, error=error))
+        except pygame.error:
+            # ディスプレイ未初期化（ツールやベンチマークから使う場合）は通知しない
+            pass
@@ -1,6 +1,7 @@
 # scenes/base_scene.py
 from abc import ABC, abstractmethod
 import pygame
+from ui.text_cache import render_text
 
 class BaseScene(ABC):
     """全てのシーンの基底クラス"""
@@ -60,7 +61,7 @@ class BaseScene(ABC):
         if color is None:
             color = self.BLACK
         
-        text_surface = self.font.render(text, True, color)
+        text_surface = render_text(self.font, text, color)
         
         if center:
             text_rect = text_surface.get_rect()
@@ -85,7 +86,7 @@ class BaseScene(ABC):
         pygame.draw.rect(self.screen, border_color, rect, border_width)
         
         # テキスト
-        text_surface = self.font.render(text, True, text_color)
+        text_surface = render_text(self.font, text, text_color)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
\ No newline at end of file
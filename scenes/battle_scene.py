@@ -1,7 +1,7 @@
 # scenes/battle_scene.py - 完全版
 import pygame
 from scenes.base_scene import BaseScene
-from ui.components import Button, HPBar, ImageMessageBox, PokemonInfoPanel, NumberDisplay
+from ui.components import Button, HPBar, ImageMessageBox, PokemonInfoPanel, NumberDisplay, load_ui_image
 from battle import Battle
 
 # スプライトシステムの読み込み
@@ -12,6 +12,29 @@ except ImportError:
     SPRITES_AVAILABLE = False
     print("Warning: sprite_animation.py not found, using simple rectangles")
 
+# バトル画面でのスプライトの表示倍率（拡大済みフレームを前もって作っておく）
+PLAYER_SPRITE_SCALE = 3.0
+ENEMY_SPRITE_SCALE = 2.5
+
+# バトル画面が使うUI画像（フィールドで先読みしておく）
+BATTLE_UI_IMAGES = [
+    "ui/textbox.png",
+    "ui/action_panel.png",
+    "ui/move_panel.png",
+    "ui/assets/panel_player.png",
+    "ui/assets/panel_enemy.png",
+    "ui/assets/hp_bar_green.png",
+    "ui/assets/hp_bar_yellow.png",
+    "ui/assets/hp_bar_red.png",
+    "ui/assets/exp_bar.png",
+] + [f"ui/assets/num_{i}.png" for i in range(10)]
+
+
+def _prebuild_sprite(sprite, scale):
+    """拡大済みフレームを前もって作る（SimplePokemonSprite などは何もしない）"""
+    if hasattr(sprite, "prebuild_scales"):
+        sprite.prebuild_scales([scale])
+
 class SimplePokemonSprite:
     """スプライトが利用できない場合の代替クラス"""
     def __init__(self, pokemon_id, facing_direction="front"):
@@ -164,18 +187,15 @@ class BattleScene(BaseScene):
         self.message_box.add_message(f"あ！ やせいの {enemy_monster.name}が とびだしてきた！")
 
         try:
-            panel_image = pygame.image.load("ui/action_panel.png").convert_alpha()
-            # パネルのサイズに合わせて画像をリサイズ
-            self.action_panel_image = pygame.transform.scale(panel_image, (360, 130))
+            # パネルのサイズに合わせてリサイズした画像を読み込み
+            self.action_panel_image = load_ui_image("ui/action_panel.png", (360, 130))
         except pygame.error:
             print("[WARNING] アクションパネルの画像 'ui/action_panel.png' が見つかりません。")
             self.action_panel_image = None # 画像がない場合はNoneに設定
         
         try:
-            # 新しい一枚絵のパネル画像を読み込む
-            panel_image = pygame.image.load("ui/move_panel.png").convert_alpha()
-            # パネルのサイズを画面下部に合わせて調整
-            self.move_panel_image = pygame.transform.scale(panel_image, (800, 130))
+            # 新しい一枚絵のパネル画像を、画面下部に合わせたサイズで読み込む
+            self.move_panel_image = load_ui_image("ui/move_panel.png", (800, 130))
         except pygame.error:
             print("[WARNING] 技選択パネルの画像 'ui/move_panel.png' が見つかりません。")
             self.move_panel_image = None
@@ -191,7 +211,7 @@ class BattleScene(BaseScene):
 
         try:
             # 経験値バーの画像を読み込み
-            self.exp_bar_image = pygame.image.load("ui/assets/exp_bar.png").convert_alpha()
+            self.exp_bar_image = load_ui_image("ui/assets/exp_bar.png")
         except pygame.error:
             print("[WARNING] 経験値バーの画像 'ui/assets/exp_bar.png' が見つかりません。")
             self.exp_bar_image = None # 画像がない場合はNoneに設定
@@ -233,6 +253,9 @@ class BattleScene(BaseScene):
             self.player_sprite = SimplePokemonSprite(player_id, "back")
             self.enemy_sprite = SimplePokemonSprite(enemy_id, "front")
 
+        _prebuild_sprite(self.player_sprite, PLAYER_SPRITE_SCALE)
+        _prebuild_sprite(self.enemy_sprite, ENEMY_SPRITE_SCALE)
+
     def _setup_action_message(self):
         """アクション選択時のメッセージを設定"""
         action_text = f"{self.battle.player_monster.name} は どうする？"
@@ -363,7 +386,7 @@ class BattleScene(BaseScene):
             return # ターン処理を中断
 
         # PPを1消費する
-        selected_move['current_pp'] -= 1
+        self.battle.player_monster.use_pp(selected_move)
         turn_messages = self.battle.execute_turn(selected_move)
         for msg in turn_messages:
             self.message_box.add_message(msg)
@@ -385,6 +408,7 @@ class BattleScene(BaseScene):
                 self.player_sprite = PokemonSprite(player_id)
         else:
             self.player_sprite = SimplePokemonSprite(player_id, "back")
+        _prebuild_sprite(self.player_sprite, PLAYER_SPRITE_SCALE)
         
         self.player_hp_bar.set_hp_instant(monster)
         
@@ -484,7 +508,7 @@ class BattleScene(BaseScene):
                     self.message_box.add_message("PPがなくて わざが だせない！")
                     self.battle_state = "message_display"
                 else:
-                    selected_move['current_pp'] -= 1 # PPを1消費
+                    active_monster.use_pp(selected_move) # PPを1消費
                     turn_messages = self.battle.execute_turn(selected_move)
                     for msg in turn_messages:
                         self.message_box.add_message(msg)
@@ -561,7 +585,7 @@ class BattleScene(BaseScene):
             elif event.key in [pygame.K_RETURN, pygame.K_SPACE, pygame.K_z]:
                 if self.selected_learn_move_index < 4:  # 既存の技を選択
                     old_move_name = self.monster_learning.moves[self.selected_learn_move_index]['name']
-                    self.monster_learning.moves[self.selected_learn_move_index] = self.new_move
+                    self.monster_learning.replace_move(self.selected_learn_move_index, self.new_move)
                     self.message_box.add_message(f"そして {self.monster_learning.name}は...")
                     self.message_box.add_message(f"{old_move_name}を わすれて {self.new_move['name']}を おぼえた！")
                 elif self.selected_learn_move_index == 5:  # おぼえない
@@ -685,8 +709,8 @@ class BattleScene(BaseScene):
         self.enemy_hp_bar.draw(self.screen)
 
         if self.exp_bar_image:
-            # 設定した幅と高さに画像をリサイズ
-            scaled_exp_bar = pygame.transform.scale(self.exp_bar_image, (self.exp_bar_width, self.exp_bar_height))
+            # 設定した幅と高さにリサイズした画像（キャッシュされるので毎フレームの拡大はしない）
+            scaled_exp_bar = load_ui_image("ui/assets/exp_bar.png", (self.exp_bar_width, self.exp_bar_height))
             # 設定した座標に描画
             self.screen.blit(scaled_exp_bar, (self.exp_bar_x, self.exp_bar_y))
 
@@ -695,8 +719,8 @@ class BattleScene(BaseScene):
         self.enemy_level_display.draw(self.screen, self.battle.enemy_monster.level)
         
         # ポケモンスプライトを描画
-        self.player_sprite.draw(self.screen, 160, 350, scale=3.0)  # プレイヤー側（背面・左下）
-        self.enemy_sprite.draw(self.screen, 550, 180, scale=2.5)   # 敵側（正面・右上）
+        self.player_sprite.draw(self.screen, 160, 350, scale=PLAYER_SPRITE_SCALE)  # プレイヤー側（背面・左下）
+        self.enemy_sprite.draw(self.screen, 550, 180, scale=ENEMY_SPRITE_SCALE)   # 敵側（正面・右上）
         
         # 状態に応じたUI描画
         if self.battle_state == "choosing_action": 
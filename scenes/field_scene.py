@@ -3,6 +3,14 @@ import pygame
 import random
 from scenes.base_scene import BaseScene
 from ui.components import ImageMessageBox
+from scenes.battle_scene import BATTLE_UI_IMAGES, ENEMY_SPRITE_SCALE, PLAYER_SPRITE_SCALE
+
+# バトル前のスプライト先読み
+try:
+    from sprite_preloader import get_sprite_preloader
+    PRELOADER_AVAILABLE = True
+except ImportError:
+    PRELOADER_AVAILABLE = False
 
 class FieldScene(BaseScene):
     """フィールド（マップ移動）シーンクラス"""
@@ -33,6 +41,8 @@ class FieldScene(BaseScene):
         # エンカウント関連
         self.encounter_rate = 1  # 1%の確率
         self.steps_since_last_encounter = 0
+        self.encounter_table = ["pidgey"]  # このマップに出る野生ポケモン
+        self.preloader = get_sprite_preloader() if PRELOADER_AVAILABLE else None
         
         # UI
         self.message_box = ImageMessageBox(0, 450, 800, 150, font, "ui/textbox.png")
@@ -107,19 +117,33 @@ class FieldScene(BaseScene):
         
         return False
     
+    def _is_on_grass(self):
+        """草むらエリアかどうかの簡単な判定（緑の部分）"""
+        map_color = self.map_image.get_at((int(self.player_world_x), int(self.player_world_y)))
+        return map_color[1] > 100  # 緑っぽい色
+    
+    def _request_battle_preload(self):
+        """エンカウントに備えて、出てきそうなポケモンと手持ちのスプライト、バトルのUI画像を先読みする"""
+        if self.preloader is None:
+            return
+        for enemy_id in self.encounter_table:
+            self.preloader.request_sprite(enemy_id, "front", ENEMY_SPRITE_SCALE)
+        for pokemon in self.player_party.members:
+            self.preloader.request_sprite(pokemon.base_stats['id'], "back", PLAYER_SPRITE_SCALE)
+        self.preloader.request_ui_images(BATTLE_UI_IMAGES)
+    
     def _check_encounters(self):
         """野生ポケモンとのエンカウント判定"""
         self.steps_since_last_encounter += 1
         
-        # 草むらエリアかどうかの簡単な判定（緑の部分）
-        map_color = self.map_image.get_at((int(self.player_world_x), int(self.player_world_y)))
-        is_grass = map_color[1] > 100  # 緑っぽい色
+        is_grass = self._is_on_grass()
+        if is_grass:
+            self._request_battle_preload()
         
         if is_grass and random.random() < self.encounter_rate:
             self.steps_since_last_encounter = 0
             # ランダムな野生ポケモンと遭遇
-            wild_pokemon = ["pidgey"]
-            enemy_id = random.choice(wild_pokemon)
+            enemy_id = random.choice(self.encounter_table)
             enemy_level = 7#random.randint(6,7)
             
             return f"wild_battle|{enemy_id}|{enemy_level}"
@@ -196,6 +220,10 @@ class FieldScene(BaseScene):
     
     def update(self, dt):
         """更新処理"""
+        # 先読みの仕上げ（Surface への変換など）を少しずつ進める
+        if self.preloader is not None:
+            self.preloader.pump()
+        
         if self.show_message:
             return
         
@@ -2,15 +2,28 @@
 import pygame
 from scenes.base_scene import BaseScene
 from ui.components import Button, PokemonInfoPanel
+from ui.save_slot_menu import SaveSlotMenu
+from save_slots import SaveSlotIndex
+
+try:
+    from sprite_animation import PokemonSprite
+    SPRITES_AVAILABLE = True
+except ImportError:
+    SPRITES_AVAILABLE = False
+
+# ポケモン一覧に出すアイコンの大きさ
+POKEMON_ICON_SIZE = 40
 
 class MenuScene(BaseScene):
     """メニュー画面シーンクラス"""
     
-    def __init__(self, screen, font, player_party, inventory):
+    def __init__(self, screen, font, player_party, inventory, current_slot=None):
         super().__init__(screen, font)
         
         self.player_party = player_party
         self.inventory = inventory # ★ inventory を受け取って保存
+        self.current_slot = current_slot # 今遊んでいるセーブスロット（上書きの確認をしない）
+        self.slot_menu = None
         
         # メニューボタン
         self.menu_buttons = [
@@ -26,6 +39,7 @@ class MenuScene(BaseScene):
         self.pokemon_buttons = []
         self.selected_pokemon_index = 0
         self.rearranging_index = None
+        self._pokemon_icons = {}  # 種族ID → アイコン（並べ替えのたびに作り直さない）
         
         self._setup_pokemon_buttons()
         self._update_selection()
@@ -38,7 +52,22 @@ class MenuScene(BaseScene):
             button_text = f"{pokemon.name} Lv.{pokemon.level} ({status})"
             button = Button(300, 100 + i * 60, 400, 50, button_text, self.font)
             button.pokemon = pokemon
+            button.icon = self._get_pokemon_icon(pokemon)
             self.pokemon_buttons.append(button)
+
+    def _get_pokemon_icon(self, pokemon):
+        """一覧用のアイコン（スプライトが無ければ None）"""
+        if not SPRITES_AVAILABLE:
+            return None
+        pokemon_id = pokemon.base_stats.get('id')
+        if pokemon_id not in self._pokemon_icons:
+            try:
+                icon = PokemonSprite(pokemon_id, "front").get_icon(POKEMON_ICON_SIZE)
+            except Exception as e:
+                print(f"[WARN] アイコンを作れませんでした: {pokemon_id} ({e})")
+                icon = None
+            self._pokemon_icons[pokemon_id] = icon
+        return self._pokemon_icons[pokemon_id]
     
     def _update_selection(self):
         """選択状態を更新"""
@@ -69,6 +98,25 @@ class MenuScene(BaseScene):
         elif self.menu_state == "rearranging":
             return self._handle_rearranging_menu(event)
         # --- ここまで追加 ---
+        elif self.menu_state == "save":
+            return self._handle_save_menu(event)
+        return None
+    
+    def _open_save_menu(self):
+        """セーブするスロットを選ぶ（インデックスファイルだけを読む）"""
+        self.menu_state = "save"
+        self.slot_menu = SaveSlotMenu(self.font, SaveSlotIndex().list_slots(), "save", self.current_slot, y=150)
+    
+    def _handle_save_menu(self, event):
+        """セーブするスロットの選択"""
+        result = self.slot_menu.handle_event(event)
+        if result == "cancel":
+            self.menu_state = "main"
+            self._update_selection()
+        elif result is not None:
+            self.menu_state = "main"
+            self._update_selection()
+            return f"save_game|{result}"
         return None
     
     def _handle_main_menu(self, event):
@@ -88,7 +136,7 @@ class MenuScene(BaseScene):
                 elif self.selected_index == 1: # ★ どうぐ
                     return "to_bag"
                 elif self.selected_index == 2 and self.menu_buttons[2].is_enabled: # セーブ
-                    return "save_game"
+                    self._open_save_menu()
                 elif self.selected_index == 3:  # もどる
                     return "back"
             elif event.key == pygame.K_ESCAPE:
@@ -104,7 +152,7 @@ class MenuScene(BaseScene):
                     elif i == 1: # ★ どうぐ
                         return "to_bag"
                     elif i == 2 and button.is_enabled:
-                        return "save_game"
+                        self._open_save_menu()
                     elif i == 3:
                         return "back"
         
@@ -154,9 +202,7 @@ class MenuScene(BaseScene):
                 self._update_selection()
             elif event.key in [pygame.K_RETURN, pygame.K_SPACE]:
                 # 決定キーでポケモンを入れ替え
-                p = self.player_party.members
-                p[self.rearranging_index], p[self.selected_pokemon_index] = \
-                    p[self.selected_pokemon_index], p[self.rearranging_index]
+                self.player_party.swap(self.rearranging_index, self.selected_pokemon_index)
                 
                 # 並び替えモードを終了
                 self.rearranging_index = None
@@ -174,8 +220,7 @@ class MenuScene(BaseScene):
         elif event.type == pygame.MOUSEBUTTONDOWN:
             for i, button in enumerate(self.pokemon_buttons):
                 if button.is_clicked(event.pos):
-                    p = self.player_party.members
-                    p[self.rearranging_index], p[i] = p[i], p[self.rearranging_index]
+                    self.player_party.swap(self.rearranging_index, i)
                     self.rearranging_index = None
                     self.menu_state = "pokemon"
                     self._setup_pokemon_buttons()
@@ -197,6 +242,10 @@ class MenuScene(BaseScene):
             self._draw_main_menu()
         elif self.menu_state == "pokemon" or self.menu_state == "rearranging": # 変更
             self._draw_pokemon_menu()
+        elif self.menu_state == "save":
+            self.draw_text("どこに レポートを かきますか？", 400, 50, self.WHITE, center=True)
+            self.slot_menu.draw(self.screen)
+            self.draw_text("↑↓: 選択  Enter: 決定  Esc: もどる", 50, 550, self.WHITE)
     
     def _draw_main_menu(self):
         """メインメニュー描画"""
@@ -220,6 +269,9 @@ class MenuScene(BaseScene):
         # ポケモンリスト
         for button in self.pokemon_buttons:
             button.draw(self.screen)
+            if button.icon is not None:
+                icon_rect = button.icon.get_rect(center=(button.rect.x - 30, button.rect.centery))
+                self.screen.blit(button.icon, icon_rect)
         
         # 選択されたポケモンの詳細情報
         if self.pokemon_buttons and 0 <= self.selected_pokemon_index < len(self.pokemon_buttons):
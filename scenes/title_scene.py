@@ -1,8 +1,10 @@
 # scenes/title_scene.py
 import pygame
-import os
 from scenes.base_scene import BaseScene
 from ui.components import Button
+from ui.text_cache import render_text
+from ui.save_slot_menu import SaveSlotMenu
+from save_slots import SaveSlotIndex
 
 class TitleScene(BaseScene):
     """タイトル画面シーンクラス"""
@@ -22,7 +24,12 @@ class TitleScene(BaseScene):
         ]
         
         self.selected_index = 0
-        self.save_file_exists = os.path.exists("save_data.json")
+        
+        # セーブスロット一覧（インデックスファイルだけを読む）
+        self.menu_state = "main"  # "main" または "slots"
+        self.slot_menu = None
+        self.slots = SaveSlotIndex().list_slots()
+        self.save_file_exists = any(summary is not None for _, summary in self.slots)
         self._update_selection()
     
     def _update_selection(self):
@@ -36,6 +43,9 @@ class TitleScene(BaseScene):
                 button.is_enabled = False
     
     def handle_event(self, event):
+        if self.menu_state == "slots":
+            return self._handle_slot_selection(event)
+        
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_DOWN:
                 self.selected_index = (self.selected_index + 1) % len(self.menu_buttons)
@@ -45,9 +55,9 @@ class TitleScene(BaseScene):
                 self._update_selection()
             elif event.key in [pygame.K_RETURN, pygame.K_SPACE]:
                 if self.selected_index == 0:  # はじめから
-                    return "to_field"
+                    self._open_slot_selection("new")
                 elif self.selected_index == 1 and self.save_file_exists: # つづきから
-                    return "load_game" # ← 追加
+                    self._open_slot_selection("load")
                 elif self.selected_index == 3:  # おわる
                     return "quit"
         
@@ -55,14 +65,32 @@ class TitleScene(BaseScene):
             for i, button in enumerate(self.menu_buttons):
                 if button.is_clicked(event.pos):
                     if i == 0:
-                        return "to_field"
-                    elif i == 2:
-                        return "load_game"
+                        self._open_slot_selection("new")
+                    elif i == 1 and self.save_file_exists:
+                        self._open_slot_selection("load")
                     elif i == 3:
                         return "quit"
         
         return None
     
+    def _open_slot_selection(self, mode):
+        """
+        スロット選択に切り替える。
+        "load" はつづきから（レポートのあるスロットだけ）、"new" ははじめから（遊ぶスロットを選ぶ）。
+        """
+        self.menu_state = "slots"
+        self.slot_menu = SaveSlotMenu(self.font, self.slots, mode)
+    
+    def _handle_slot_selection(self, event):
+        """スロット選択時のイベント処理"""
+        result = self.slot_menu.handle_event(event)
+        if result == "cancel":
+            self.menu_state = "main"
+        elif result is not None:
+            action = "load_game" if self.slot_menu.mode == "load" else "new_game"
+            return f"{action}|{result}"
+        return None
+    
     def update(self, dt):
         """更新処理"""
         pass
@@ -73,20 +101,23 @@ class TitleScene(BaseScene):
         self.screen.fill((50, 50, 100))  # 夜空の色
         
         # タイトル
-        title_text = self.title_font.render("Pokemon（仮）", True, self.WHITE)
+        title_text = render_text(self.title_font, "Pokemon（仮）", self.WHITE)
         title_rect = title_text.get_rect()
         title_rect.center = (400, 150)
         self.screen.blit(title_text, title_rect)
         
         # サブタイトル
-        subtitle_text = self.font.render("Pygame Edition", True, self.LIGHT_GRAY)
+        subtitle_text = render_text(self.font, "Pygame Edition", self.LIGHT_GRAY)
         subtitle_rect = subtitle_text.get_rect()
         subtitle_rect.center = (400, 200)
         self.screen.blit(subtitle_text, subtitle_rect)
         
-        # メニューボタン
-        for button in self.menu_buttons:
-            button.draw(self.screen)
+        # メニューボタン（スロット選択中はスロット一覧）
+        if self.menu_state == "slots":
+            self.slot_menu.draw(self.screen)
+        else:
+            for button in self.menu_buttons:
+                button.draw(self.screen)
         
         # 操作説明
         #self.draw_text("↑↓: 選択  Enter/Space: 決定", 400, 550, self.WHITE, center=True)
\ No newline at end of file
@@ -0,0 +1,245 @@
+# sim_results.py
+# 機能：シミュレーション結果（対面・総当たり・バランス調整）をSQLiteに保存して再利用する
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import sqlite3
+import time
+
+from monsters_data import MONSTER_DATABASE
+from moves_data import MOVE_DATABASE
+
+# 結果の正しさに影響するエンジン側のソースファイル
+# （データ本体は種族・技ごとに個別にハッシュするので、ここには含めない）
+ENGINE_FILES = ["battle.py", "monster.py", "types_data.py", "stats_data.py", "exp_data.py"]
+
+# 全体のデータハッシュ用（どれか1つでも変われば値が変わる）
+DATA_FILES = ["monsters_data.py", "moves_data.py"] + ENGINE_FILES
+
+DEFAULT_DB_PATH = "sim_results.db"
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _sha256(*parts):
+    """文字列/バイト列を連結してSHA-256の16進文字列を返す"""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(part)
+        h.update(b"\x00")  # 区切り（"ab"+"c" と "a"+"bc" を区別する）
+    return h.hexdigest()
+
+
+def _hash_files(filenames):
+    """ソースファイルの内容をまとめてハッシュする"""
+    contents = []
+    for filename in filenames:
+        path = os.path.join(_BASE_DIR, filename)
+        with open(path, "rb") as f:
+            contents.append(f.read())
+    return _sha256(*contents)
+
+
+def _canonical_json(data):
+    """辞書を順序に依存しないJSON文字列にする（ハッシュ用）"""
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+
+def compute_engine_hash():
+    """戦闘エンジン（battle.py, types_data.py など）のハッシュ"""
+    return _hash_files(ENGINE_FILES)
+
+
+def compute_data_hash():
+    """monsters_data / moves_data / types_data / battle.py を含む全体のハッシュ"""
+    return _hash_files(DATA_FILES)
+
+
+def compute_species_hash(monster_id):
+    """
+    1種族ぶんの入力データのハッシュ。
+    種族値に加えて、その種族が使う可能性のある技（初期技・習得技）のデータも含める。
+    """
+    data = MONSTER_DATABASE[monster_id]
+    move_ids = set(data.get("moves", [])) | set(data.get("learnset", {}).values())
+    moves = {move_id: MOVE_DATABASE.get(move_id) for move_id in sorted(move_ids)}
+    return _sha256(_canonical_json(data), _canonical_json(moves))
+
+
+def matchup_key(spec, monster_a, monster_b, engine_hash=None, species_hashes=None):
+    """
+    対面1件ぶんの結果キー。
+    エンジンのハッシュ + 両種族のハッシュ + 実行条件 で決まるので、
+    無関係な種族や技を変更しても、この対面の結果は再利用できる。
+    """
+    if engine_hash is None:
+        engine_hash = compute_engine_hash()
+    if species_hashes is None:
+        species_hashes = {}
+    hash_a = species_hashes.get(monster_a) or compute_species_hash(monster_a)
+    hash_b = species_hashes.get(monster_b) or compute_species_hash(monster_b)
+    return _sha256("matchup", engine_hash, monster_a, hash_a, monster_b, hash_b, _canonical_json(spec))
+
+
+class SimResultStore:
+    """シミュレーション結果をローカルのSQLiteに保存するクラス"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                data_hash TEXT NOT NULL,
+                spec TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_data_hash ON results (data_hash)")
+        self.conn.commit()
+
+        self.data_hash = compute_data_hash()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """キーに対応する結果を返す（なければNone）"""
+        row = self.conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key, kind, spec, result):
+        """結果を保存する（同じキーがあれば上書き）"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (key, kind, data_hash, spec, result, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, kind, self.data_hash, _canonical_json(spec), json.dumps(result, ensure_ascii=False), time.time())
+        )
+        self.conn.commit()
+
+    def _touch(self, key):
+        """
+        再利用した結果の data_hash を現在の値に書き換える（prune_stale で消されないように）。
+        コミットは次の put / prune_stale / close でまとめて行う。
+        """
+        self.conn.execute(
+            "UPDATE results SET data_hash = ? WHERE key = ? AND data_hash != ?",
+            (self.data_hash, key, self.data_hash)
+        )
+
+    def get_or_compute(self, key, kind, spec, compute):
+        """保存済みの結果があれば再利用し、なければ compute() を実行して保存する"""
+        result = self.get(key)
+        if result is not None:
+            self.hits += 1
+            self._touch(key)
+            return result
+
+        self.misses += 1
+        result = compute()
+        self.put(key, kind, spec, result)
+        return result
+
+    def prune_stale(self):
+        """現在のデータハッシュで作られても再利用されてもいない結果を削除し、削除件数を返す"""
+        cursor = self.conn.execute("DELETE FROM results WHERE data_hash != ?", (self.data_hash,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def simulate_matchup(monster_a, monster_b, level=50, trials=100, seed=0, max_turns=100):
+    """
+    2種族を指定レベルで戦わせ、勝敗を集計する。
+    どちらの技もランダムに選ぶ（プレイヤー側も敵側と同じAI）。
+    """
+    from battle import Battle
+    from monster import create_monster
+
+    wins_a = wins_b = draws = total_turns = 0
+
+    # 乱数の状態を退避し、結果を seed で再現できるようにする
+    saved_state = random.getstate()
+    try:
+        # Battle / Monster のデバッグ出力は集計には不要なので捨てる
+        with contextlib.redirect_stdout(io.StringIO()):
+            for trial in range(trials):
+                random.seed(f"{seed}:{monster_a}:{monster_b}:{trial}")
+                a = create_monster(monster_a, level)
+                b = create_monster(monster_b, level)
+                battle = Battle(a, b)
+
+                while battle.turn <= max_turns and not a.is_fainted() and not b.is_fainted():
+                    usable_moves = [m for m in a.moves if m.get('current_pp', 0) > 0] or a.moves
+                    move = random.choice(usable_moves)
+                    move['current_pp'] = max(0, move.get('current_pp', 0) - 1)
+                    battle.execute_turn(move)
+
+                total_turns += battle.turn - 1
+                if b.is_fainted() and not a.is_fainted():
+                    wins_a += 1
+                elif a.is_fainted() and not b.is_fainted():
+                    wins_b += 1
+                else:
+                    draws += 1
+    finally:
+        random.setstate(saved_state)
+
+    return {
+        "monster_a": monster_a,
+        "monster_b": monster_b,
+        "trials": trials,
+        "wins_a": wins_a,
+        "wins_b": wins_b,
+        "draws": draws,
+        "win_rate_a": wins_a / trials if trials else 0.0,
+        "average_turns": total_turns / trials if trials else 0.0,
+    }
+
+
+def run_round_robin(store, species_ids=None, level=50, trials=100, seed=0):
+    """
+    総当たり戦を実行する。
+    データが変わっていない対面は保存済みの結果を使い、
+    変更された種族・技が関わる対面だけを再計算する。
+    """
+    if species_ids is None:
+        species_ids = list(MONSTER_DATABASE.keys())
+
+    spec = {"kind": "matchup", "level": level, "trials": trials, "seed": seed}
+    engine_hash = compute_engine_hash()
+    species_hashes = {monster_id: compute_species_hash(monster_id) for monster_id in species_ids}
+
+    results = {}
+    for monster_a in species_ids:
+        for monster_b in species_ids:
+            if monster_a == monster_b:
+                continue
+            key = matchup_key(spec, monster_a, monster_b, engine_hash, species_hashes)
+            results[f"{monster_a}|{monster_b}"] = store.get_or_compute(
+                key, "matchup", spec,
+                lambda a=monster_a, b=monster_b: simulate_matchup(a, b, level, trials, seed)
+            )
+    return results
+
+
+if __name__ == "__main__":
+    store = SimResultStore()
+    table = run_round_robin(store, trials=50)
+    for matchup, result in table.items():
+        print(f"{matchup}: 勝率 {result['win_rate_a']:.1%} (平均 {result['average_turns']:.1f} ターン)")
+    print(f"再利用: {store.hits}件 / 新規計算: {store.misses}件")
+    store.close()
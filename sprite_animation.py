@@ -4,6 +4,81 @@ from PIL import Image, ImageSequence
 import os
 import json
 
+from pixel_cache import load_image
+from surface_alpha import optimize_for_blit
+
+# build_sprites.py が書き出すマニフェスト（種族 → 向き → アニメーション → シートとフレーム情報）
+SPRITE_MANIFEST_PATH = "sprites/manifest.json"
+_sprite_manifest = None
+
+def load_sprite_manifest(path=SPRITE_MANIFEST_PATH):
+    """マニフェストを読み込む（プロセスで1回だけ）。無ければ空の辞書"""
+    global _sprite_manifest
+    if _sprite_manifest is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _sprite_manifest = json.load(f).get("sprites", {})
+        except (OSError, ValueError):
+            _sprite_manifest = {}
+    return _sprite_manifest
+
+def lookup_sprite_manifest(pokemon_id, facing_direction):
+    """{アニメーション名: エントリ} を返す。マニフェストに無ければ None"""
+    return load_sprite_manifest().get(pokemon_id, {}).get(facing_direction)
+
+# 別スレッドでデコード済みのスプライトシート（パス → Surface）。SpriteSheet が1回だけ使う
+_preloaded_sheet_images = {}
+
+def provide_sheet_image(path, image):
+    """先読みしたスプライトシートの画像を渡しておく（sprite_preloader から呼ばれる）"""
+    _preloaded_sheet_images[path] = image
+
+def analyze_frame_alpha(frame, threshold=30):
+    """
+    RGBAフレームのアルファを調べる（ピクセルごとのPythonループは使わない）。
+    戻り値: (不透明度 = アルファが threshold を超えるピクセルの割合,
+             少しでも色のあるピクセルを囲む矩形 (left, top, right, bottom)。完全に透明なら None)
+    """
+    alpha = frame.getchannel('A')
+    histogram = alpha.histogram()  # 256段階のアルファごとのピクセル数
+    total = frame.width * frame.height
+    opaque = sum(histogram[threshold + 1:])
+    return (opaque / total if total else 0.0), alpha.getbbox()
+
+# この不透明度より低い（ほとんど透明な）フレームは使わない
+MIN_FRAME_OPACITY = 0.1
+
+# デコードするとこのバイト数を超えるGIFは、シートにせずストリーミングで再生する（StreamingGifFrames）
+STREAMING_MIN_BYTES = 16 * 1024 * 1024
+
+def gif_frame_to_rgba(frame):
+    """GIFのフレーム（seek 済みの画像）をRGBAにする（合成はせず、パレットの透明色を考慮する）"""
+    if frame.mode == 'P':
+        # パレットモードの場合、透明色を考慮してRGBAに変換
+        if 'transparency' in frame.info:
+            return frame.convert('RGBA')
+        return frame.convert('RGB').convert('RGBA')
+    if frame.mode != 'RGBA':
+        return frame.convert('RGBA')
+    return frame
+
+def gif_decoded_bytes(gif):
+    """GIFの全フレームをRGBAでデコードしたときのバイト数"""
+    return getattr(gif, "n_frames", 1) * gif.width * gif.height * 4
+
+def scan_visible_gif_frames(gif):
+    """
+    使うフレーム（ほとんど透明なフレーム以外）の番号を返す。
+    1フレームずつデコードして調べるので、メモリは1フレーム分しか使わない。
+    """
+    indices = []
+    for index in range(getattr(gif, "n_frames", 1)):
+        gif.seek(index)
+        opacity, _ = analyze_frame_alpha(gif_frame_to_rgba(gif))
+        if opacity >= MIN_FRAME_OPACITY:
+            indices.append(index)
+    return indices
+
 def gif_to_spritesheet_clean(gif_path, output_path, info_path, frames_per_row=8):
     """GIFファイルをスプライトシートに変換（残像修正版）"""
     try:
@@ -12,37 +87,28 @@ def gif_to_spritesheet_clean(gif_path, output_path, info_path, frames_per_row=8)
         # GIFを開く
         gif = Image.open(gif_path)
         frames = []
+        frame_bboxes = []  # 各フレームの、透明でない部分を囲む矩形
         
         # GIFの全フレームを適切に処理
         for frame_index, frame in enumerate(ImageSequence.Iterator(gif)):
             print(f"[DEBUG] フレーム {frame_index} を処理中...")
             
             # 各フレームを個別に処理（合成しない）
-            if frame.mode == 'P':
-                # パレットモードの場合、透明色を考慮してRGBAに変換
-                if 'transparency' in frame.info:
-                    frame = frame.convert('RGBA')
-                else:
-                    frame = frame.convert('RGB').convert('RGBA')
-            elif frame.mode != 'RGBA':
-                frame = frame.convert('RGBA')
+            frame = gif_frame_to_rgba(frame)
             
-            # フレームの透明度をチェック（PILで直接チェック）
-            pixels = list(frame.getdata())
-            if len(pixels) > 0 and len(pixels[0]) == 4:  # RGBAチェック
-                alpha_values = [pixel[3] for pixel in pixels]
-                non_transparent_pixels = sum(1 for alpha in alpha_values if alpha > 30)
-                transparency_ratio = non_transparent_pixels / len(alpha_values)
-                
-                # 透明度が高すぎる（90%以上透明）フレームをスキップ
-                if transparency_ratio < 0.1:
-                    print(f"[WARNING] フレーム {frame_index} は透明度が高いためスキップします (不透明度: {transparency_ratio:.1%})")
-                    continue
-                
-                print(f"[DEBUG] フレーム {frame_index}: 不透明度 {transparency_ratio:.1%}")
+            # フレームの透明度をチェック（アルファのヒストグラムで数える）
+            transparency_ratio, bbox = analyze_frame_alpha(frame)
+            
+            # 透明度が高すぎる（90%以上透明）フレームをスキップ
+            if transparency_ratio < MIN_FRAME_OPACITY:
+                print(f"[WARNING] フレーム {frame_index} は透明度が高いためスキップします (不透明度: {transparency_ratio:.1%})")
+                continue
+            
+            print(f"[DEBUG] フレーム {frame_index}: 不透明度 {transparency_ratio:.1%}")
             
             # フレームをコピーして追加（参照ではなく実体をコピー）
             frames.append(frame.copy())
+            frame_bboxes.append(list(bbox) if bbox else None)
         
         print(f"[DEBUG] 有効なフレーム {len(frames)} 個を抽出完了")
         
@@ -90,7 +156,9 @@ def gif_to_spritesheet_clean(gif_path, output_path, info_path, frames_per_row=8)
             "sheet_width": sheet_width,
             "sheet_height": sheet_height,
             "original_frames": frame_index + 1,
-            "filtered_frames": total_frames
+            "filtered_frames": total_frames,
+            # フレーム内の [left, top, right, bottom]（切り詰めやアトラス作成に使う）
+            "frame_bboxes": frame_bboxes
         }
         
         with open(info_path, 'w', encoding='utf-8') as f:
@@ -110,17 +178,27 @@ def gif_to_spritesheet_clean(gif_path, output_path, info_path, frames_per_row=8)
 
 class SpriteSheet:
     """スプライトシートから個別フレームを切り出すクラス"""
-    def __init__(self, image_path, frame_width, frame_height, frames_per_row=None):
+    def __init__(self, image_path, frame_width, frame_height, frames_per_row=None, trim=False, bboxes=None):
+        """
+        trim=True なら、各フレームを透明でない部分だけに切り詰めて切り出し、
+        元のフレームの中での位置を offsets に入れる（FrameSet にそのまま渡せる）。
+        bboxes はフレーム番号ごとの (left, top, right, bottom)（info の frame_bboxes）。
+        無いフレームは読み込み時に調べる。
+        """
         # pygame.display が初期化されていない場合の対策
         if not pygame.get_init():
             pygame.init()
         if not pygame.display.get_init():
             pygame.display.set_mode((1, 1))
         
-        self.image = pygame.image.load(image_path).convert_alpha()
+        self.image = _preloaded_sheet_images.pop(image_path, None)
+        if self.image is None:
+            self.image = load_image(image_path)  # 2回目以降はデコード済みのピクセルを読むだけ
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.frames = []
+        self.offsets = [] if trim else None
+        self._bboxes = bboxes
         
         # スプライトシートから個別フレームを切り出し
         sheet_width, sheet_height = self.image.get_size()
@@ -143,7 +221,7 @@ class SpriteSheet:
                 # 範囲チェック
                 if x + frame_width <= sheet_width and y + frame_height <= sheet_height:
                     frame_rect = pygame.Rect(x, y, frame_width, frame_height)
-                    frame_surface = self.image.subsurface(frame_rect).copy()
+                    frame_view = self.image.subsurface(frame_rect)  # コピーせずに調べる
                     
                     # 基本的な透明度チェック（中心と4隅をサンプル）
                     test_points = [
@@ -157,14 +235,14 @@ class SpriteSheet:
                     alpha_sum = 0
                     for px, py in test_points:
                         if 0 <= px < frame_width and 0 <= py < frame_height:
-                            color = frame_surface.get_at((px, py))
+                            color = frame_view.get_at((px, py))
                             alpha_sum += color.a
                     
                     avg_alpha = alpha_sum / len(test_points)
                     
                     # より寛容な透明度チェック（少しでも不透明部分があれば採用）
                     if avg_alpha > 5:  # 閾値を下げる
-                        self.frames.append(frame_surface)
+                        self._add_frame(frame_view, row * frames_per_row + col)
                         print(f"  フレーム {len(self.frames)}: ({x}, {y}) - アルファ平均: {avg_alpha:.1f}")
                     else:
                         print(f"  スキップ: ({x}, {y}) - 透明フレーム (アルファ平均: {avg_alpha:.1f})")
@@ -181,14 +259,205 @@ class SpriteSheet:
                     
                     if x + frame_width <= sheet_width and y + frame_height <= sheet_height:
                         frame_rect = pygame.Rect(x, y, frame_width, frame_height)
-                        frame_surface = self.image.subsurface(frame_rect).copy()
-                        self.frames.append(frame_surface)
+                        self._add_frame(self.image.subsurface(frame_rect), row * frames_per_row + col)
             print(f"  強制追加フレーム数: {len(self.frames)}")
+    
+    def _add_frame(self, frame_view, index):
+        """シート上のフレームをコピーして追加する（trim のときは見えている部分だけ）"""
+        if self.offsets is None:
+            self.frames.append(frame_view.copy())
+            return
+        if self._bboxes and index < len(self._bboxes) and self._bboxes[index]:
+            left, top, right, bottom = self._bboxes[index]
+            rect = pygame.Rect(left, top, right - left, bottom - top)
+        else:
+            rect = frame_view.get_bounding_rect()
+        if rect.width == 0 or rect.height == 0:
+            rect = pygame.Rect(0, 0, 1, 1)  # 完全に透明なフレームは1ピクセルだけ残す（アトラスと同じ）
+        self.frames.append(frame_view.subsurface(rect).copy())
+        self.offsets.append(rect.topleft)
+
+def scale_trimmed_frame(frame, offset, frame_width, frame_height, scale):
+    """
+    切り詰めたフレームを拡大し、(拡大後のフレーム, 拡大後の元フレーム内の位置) を返す。
+    元のフレームを丸ごと拡大した場合とピクセル単位で同じ結果になるようにする。
+    """
+    if scale == int(scale):
+        # 整数倍なら切り詰めたまま拡大しても同じ
+        s = int(scale)
+        scaled = pygame.transform.scale(frame, (frame.get_width() * s, frame.get_height() * s))
+        return scaled, (offset[0] * s, offset[1] * s)
+    # 整数倍でないと最近傍のサンプル位置がずれるので、元の大きさに戻してから拡大して切り出す
+    full = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
+    full.blit(frame, offset, special_flags=pygame.BLEND_RGBA_ADD)  # 透明な面への加算＝そのままコピー
+    scaled = pygame.transform.scale(full, (int(frame_width * scale), int(frame_height * scale)))
+    rect = scaled.get_bounding_rect()
+    return scaled.subsurface(rect).copy(), rect.topleft
+
+class FrameSet:
+    """
+    1つのアニメーションのフレーム一式（SpriteSheet と同じく frames を持つ）。
+    フレームが透明な余白を切り詰めてある場合、offsets[i] は
+    元のフレーム（frame_width x frame_height）の中での左上の位置。
+    """
+    streaming = False  # フレームを必要になったときに読み込むか（StreamingGifFrames）
+    
+    def __init__(self, frames, frame_width, frame_height, offsets=None):
+        self.frames = frames
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.offsets = offsets
+        self.name = None   # "種族/アニメーション_向き"（アルファのレポート用）
+        self.on_grow = None  # 拡大済みフレームなどを作ったときに呼ぶ（バイト数を渡す。スプライトキャッシュが設定する）
+        self._scaled = {}  # (フレーム番号, 倍率) → (拡大したフレーム, 元フレーム内の位置)
+        self._icons = {}   # 大きさ → アイコン
+    
+    def get_scaled(self, index, scale):
+        """
+        拡大したフレームと、拡大後の元フレーム内での位置を返す。
+        初めて要求されたときだけ拡大し（描画の速い形式にもする）、以後は同じ Surface を返す。
+        """
+        key = (index, scale)
+        cached = self._scaled.get(key)
+        if cached is None:
+            frame = self.frames[index]
+            offset = self.offsets[index] if self.offsets else (0, 0)
+            cached = self._scale_frame(frame, offset, scale)
+            self._scaled[key] = cached
+            if cached[0] is not frame:
+                self._notify_grow(cached[0])
+        return cached
+    
+    def _notify_grow(self, surface):
+        if self.on_grow is not None:
+            from sprite_cache import surface_bytes
+            self.on_grow(surface_bytes(surface))
+    
+    def _scale_frame(self, frame, offset, scale):
+        """(拡大して描画の速い形式にしたフレーム, 拡大後の元フレーム内の位置)"""
+        if scale == 1.0:
+            scaled = frame
+        elif self.offsets:
+            scaled, offset = scale_trimmed_frame(frame, offset, self.frame_width, self.frame_height, scale)
+        else:
+            size = (int(frame.get_width() * scale), int(frame.get_height() * scale))
+            scaled = pygame.transform.scale(frame, size)
+        return optimize_for_blit(scaled, self.name), offset
+    
+    def iter_surfaces(self):
+        """持っている Surface（フレーム・拡大済みフレーム・アイコン）を順に返す"""
+        yield from self.frames
+        for scaled, _ in self._scaled.values():
+            yield scaled
+        yield from self._icons.values()
+    
+    def prebuild(self, scales):
+        """指定した倍率の全フレームを先に作っておく（描画中に拡大しないように）"""
+        for scale in scales:
+            for index in range(len(self.frames)):
+                self.get_scaled(index, scale)
+    
+    def get_icon(self, size):
+        """最初のフレームの見えている部分を size x size に収めたアイコン（手持ち一覧などに使う）"""
+        icon = self._icons.get(size)
+        if icon is None and self.frames:
+            frame = self.frames[0]
+            if not self.offsets:
+                frame = frame.subsurface(frame.get_bounding_rect())
+            factor = size / max(frame.get_width(), frame.get_height(), 1)
+            icon_size = (max(1, int(frame.get_width() * factor)), max(1, int(frame.get_height() * factor)))
+            icon = optimize_for_blit(pygame.transform.scale(frame, icon_size),
+                                     f"{self.name}@icon" if self.name else None)
+            self._icons[size] = icon
+            self._notify_grow(icon)
+        return icon
+
+class StreamingGifFrames(FrameSet):
+    """
+    GIFのフレームを必要になったときにデコードする FrameSet（長い・大きいアニメーション用）。
+    frames としてそのまま使える（len() と [番号]）。手元に置くのは、最後に要求されたフレームから
+    lookahead 枚先までだけなので、元のGIFのフレーム数にかかわらずメモリは一定。
+    再生は前から順に進むので、先読みの分は1フレームずつ続きをデコードするだけで済む。
+    """
+    streaming = True
+    
+    def __init__(self, gif_path, frame_indices=None, lookahead=4):
+        """frame_indices: 使うGIFのフレーム番号（build_sprites.py が記録したもの。無ければ開くときに調べる）"""
+        # pygame.display が初期化されていない場合の対策（SpriteSheet と同じ）
+        if not pygame.get_init():
+            pygame.init()
+        if not pygame.display.get_init():
+            pygame.display.set_mode((1, 1))
+        
+        self.gif_path = gif_path
+        self._gif = Image.open(gif_path)
+        if frame_indices is None:
+            frame_indices = scan_visible_gif_frames(self._gif)
+        if not frame_indices:
+            raise ValueError(f"有効なフレームが見つかりません: {gif_path}")
+        self.frame_indices = list(frame_indices)
+        self.lookahead = max(0, min(lookahead, len(self.frame_indices) - 1))
+        self._buffer = {}  # 番号 → (フレーム, {倍率: (拡大したフレーム, 位置)})
+        self._window_start = None
+        self.decoded_frames = 0  # デコードした回数（診断用）
+        super().__init__(self, self._gif.width, self._gif.height)
+    
+    def __len__(self):
+        return len(self.frame_indices)
+    
+    def __getitem__(self, index):
+        return self._entry(index)[0]
+    
+    def _entry(self, index):
+        count = len(self.frame_indices)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(index)
+        if index != self._window_start:
+            # index から lookahead 枚先まで（最後まで行ったら最初に戻る）を手元に置き、それ以外は捨てる
+            window = [(index + i) % count for i in range(self.lookahead + 1)]
+            for key in list(self._buffer):
+                if key not in window:
+                    del self._buffer[key]
+            for key in window:
+                if key not in self._buffer:
+                    self._buffer[key] = (self._decode(key), {})
+            self._window_start = index
+        return self._buffer[index]
+    
+    def _decode(self, index):
+        self._gif.seek(self.frame_indices[index])
+        frame = gif_frame_to_rgba(self._gif)
+        self.decoded_frames += 1
+        return pygame.image.frombuffer(frame.tobytes(), frame.size, "RGBA").convert_alpha()
+    
+    def get_scaled(self, index, scale):
+        """拡大したフレームも、元のフレームと一緒に先読みの範囲を出たら捨てる"""
+        frame, scaled = self._entry(index)
+        cached = scaled.get(scale)
+        if cached is None:
+            cached = scaled[scale] = self._scale_frame(frame, (0, 0), scale)
+        return cached
+    
+    def prebuild(self, scales):
+        """全フレームを前もって作ると一定のメモリに収まらないので、何もしない"""
+    
+    def max_resident_bytes(self):
+        """手元に置く元のフレームの最大のバイト数（スプライトキャッシュの見積もり用）"""
+        return (self.lookahead + 1) * self.frame_width * self.frame_height * 4
 
 class AnimatedSprite:
     """アニメーションスプライトクラス"""
     def __init__(self, sprite_sheet, animation_speed=0.12):
+        if not isinstance(sprite_sheet, FrameSet):
+            sprite_sheet = FrameSet(sprite_sheet.frames, sprite_sheet.frame_width, sprite_sheet.frame_height)
+        self.frame_set = sprite_sheet  # 拡大済みフレームのキャッシュも共有する
         self.frames = sprite_sheet.frames
+        # 切り詰めたフレームの場合の位置と、元のフレームの大きさ
+        self.offsets = sprite_sheet.offsets
+        self.frame_width = sprite_sheet.frame_width
+        self.frame_height = sprite_sheet.frame_height
         self.animation_speed = animation_speed
         self.current_frame = 0
         self.animation_timer = 0
@@ -217,6 +486,12 @@ class AnimatedSprite:
             return self.frames[self.current_frame]
         return None
     
+    def get_current_offset(self):
+        """現在のフレームの元のフレーム内での位置（切り詰めていなければ None）"""
+        if self.offsets and 0 <= self.current_frame < len(self.offsets):
+            return self.offsets[self.current_frame]
+        return None
+    
     def play(self):
         self.playing = True
     
@@ -245,18 +520,63 @@ class PokemonSprite:
         self.load_sprites()
     
     def load_sprites(self):
-        """スプライトファイルを読み込み"""
-        sprite_dir = f"sprites/{self.pokemon_id}"
-        
-        # まずGIFから変換を試行
-        self.convert_gifs_if_needed()
+        """スプライトを読み込み（フレームはプロセス全体のキャッシュで共有する）"""
+        from sprite_cache import get_sprite_cache
+        frame_sets = get_sprite_cache().get_frame_sets(
+            self.pokemon_id, self.facing_direction, self._load_frame_sets
+        )
+        # フレームは共有し、再生位置などの状態はこのスプライトごとに持つ
+        for animation, frame_set in frame_sets.items():
+            if frame_set.name is None:
+                frame_set.name = f"{self.pokemon_id}/{animation}_{self.facing_direction}"
+            self.sprite_sheets[animation] = AnimatedSprite(frame_set)
         
+        # デフォルトアニメーションを設定
+        if "idle" in self.sprite_sheets:
+            self.animated_sprite = self.sprite_sheets["idle"]
+            print(f"[DEBUG] デフォルトアニメーション設定: idle ({self.facing_direction})")
+        elif self.sprite_sheets:
+            first_animation = list(self.sprite_sheets.keys())[0]
+            self.animated_sprite = self.sprite_sheets[first_animation]
+            print(f"[DEBUG] デフォルトアニメーション設定: {first_animation} ({self.facing_direction})")
+    
+    def _load_frame_sets(self):
+        """{アニメーション名: FrameSet} を読み込む（キャッシュに無いときだけ呼ばれる）"""
         # 向きに応じたファイル名を設定
         if self.facing_direction == "back":
             file_suffix = "_back"
         else:
             file_suffix = "_front"
         
+        # アトラスがあれば、読み込み済みのページから切り出すだけ（ファイルの読み込みなし）
+        from sprite_atlas import get_sprite_atlas
+        atlas = get_sprite_atlas()
+        frame_sets = atlas.get_frame_sets(self.pokemon_id, self.facing_direction) if atlas else {}
+        if frame_sets:
+            return frame_sets
+        
+        # 次に、ビルド済み（build_sprites.py）ならマニフェストを1回引くだけで読み込める
+        entries = lookup_sprite_manifest(self.pokemon_id, self.facing_direction)
+        if entries:
+            for animation, entry in entries.items():
+                if entry.get("stream"):
+                    frame_set = self._open_stream(animation, entry, file_suffix)
+                else:
+                    frame_set = self._load_sheet(animation, entry["sheet"], entry["info"], file_suffix)
+                if frame_set:
+                    frame_sets[animation] = frame_set
+            return frame_sets
+        
+        return self._load_sprites_by_probing(file_suffix)
+    
+    def _load_sprites_by_probing(self, file_suffix):
+        """マニフェストが無い場合：GIFを必要に応じて変換し、ファイルを探して読み込む"""
+        frame_sets = {}
+        sprite_dir = f"sprites/{self.pokemon_id}"
+        
+        # まずGIFから変換を試行
+        self.convert_gifs_if_needed()
+        
         # 各アニメーション用のスプライトシートを読み込み
         animations = ["idle", "attack", "hurt", "faint"]
         
@@ -275,36 +595,53 @@ class PokemonSprite:
                     # フレーム情報を読み込み
                     with open(info_path, 'r', encoding='utf-8') as f:
                         frame_info = json.load(f)
-                    
-                    print(f"[INFO] {animation}{file_suffix} 情報: {frame_info.get('filtered_frames', 'N/A')}フレーム (元: {frame_info.get('original_frames', 'N/A')})")
-                    
-                    # 正しいフレームサイズでスプライトシートを読み込み
-                    sprite_sheet = SpriteSheet(
-                        sprite_path, 
-                        frame_info["frame_width"], 
-                        frame_info["frame_height"],
-                        frame_info["frames_per_row"]
-                    )
-                    
-                    if sprite_sheet.frames:
-                        self.sprite_sheets[animation] = AnimatedSprite(sprite_sheet)
-                        print(f"[DEBUG] {animation}{file_suffix} アニメーション読み込み完了")
-                    else:
-                        print(f"[WARNING] {animation}{file_suffix} のフレームが見つかりません")
-                        
                 except Exception as e:
-                    print(f"[ERROR] {animation}{file_suffix} の読み込みエラー: {e}")
-                    import traceback
-                    traceback.print_exc()
-        
-        # デフォルトアニメーションを設定
-        if "idle" in self.sprite_sheets:
-            self.animated_sprite = self.sprite_sheets["idle"]
-            print(f"[DEBUG] デフォルトアニメーション設定: idle ({self.facing_direction})")
-        elif self.sprite_sheets:
-            first_animation = list(self.sprite_sheets.keys())[0]
-            self.animated_sprite = self.sprite_sheets[first_animation]
-            print(f"[DEBUG] デフォルトアニメーション設定: {first_animation} ({self.facing_direction})")
+                    print(f"[ERROR] {animation}{file_suffix} の情報の読み込みエラー: {e}")
+                    continue
+                frame_set = self._load_sheet(animation, sprite_path, frame_info, file_suffix)
+                if frame_set:
+                    frame_sets[animation] = frame_set
+        return frame_sets
+    
+    def _load_sheet(self, animation, sprite_path, frame_info, file_suffix):
+        """1つのアニメーションのスプライトシートを読み込み、FrameSet を返す（失敗したら None）"""
+        try:
+            print(f"[INFO] {animation}{file_suffix} 情報: {frame_info.get('filtered_frames', 'N/A')}フレーム (元: {frame_info.get('original_frames', 'N/A')})")
+            
+            # 正しいフレームサイズでスプライトシートを読み込み
+            # （透明な余白は切り詰め、元のフレーム内の位置を残す。ビルド時に調べた範囲があれば使う）
+            sprite_sheet = SpriteSheet(
+                sprite_path, 
+                frame_info["frame_width"], 
+                frame_info["frame_height"],
+                frame_info["frames_per_row"],
+                trim=True,
+                bboxes=frame_info.get("frame_bboxes")
+            )
+            
+            if sprite_sheet.frames:
+                print(f"[DEBUG] {animation}{file_suffix} アニメーション読み込み完了")
+                # シート全体の画像は手放し、切り出したフレームだけを残す
+                return FrameSet(sprite_sheet.frames, sprite_sheet.frame_width, sprite_sheet.frame_height,
+                                sprite_sheet.offsets)
+            else:
+                print(f"[WARNING] {animation}{file_suffix} のフレームが見つかりません")
+                
+        except Exception as e:
+            print(f"[ERROR] {animation}{file_suffix} の読み込みエラー: {e}")
+            import traceback
+            traceback.print_exc()
+        return None
+    
+    def _open_stream(self, animation, entry, file_suffix):
+        """大きいGIFはシートにせず、元のGIFからフレームを順に読み込む（失敗したら None）"""
+        try:
+            frame_set = StreamingGifFrames(entry["source"], entry["info"].get("frame_indices"))
+            print(f"[DEBUG] {animation}{file_suffix} ストリーミング再生: {len(frame_set)}フレーム")
+            return frame_set
+        except Exception as e:
+            print(f"[ERROR] {animation}{file_suffix} の読み込みエラー: {e}")
+        return None
     
     def convert_gifs_if_needed(self):
         """必要に応じてGIFをスプライトシートに変換"""
@@ -365,22 +702,27 @@ class PokemonSprite:
         if self.animated_sprite:
             self.animated_sprite.update(dt)
     
+    def prebuild_scales(self, scales, animations=("idle",)):
+        """描画で使う倍率のフレームを先に作っておく"""
+        for animation in animations:
+            if animation in self.sprite_sheets:
+                self.sprite_sheets[animation].frame_set.prebuild(scales)
+    
+    def get_icon(self, size=32):
+        """手持ち一覧などに使う小さなアイコン（無ければ None）"""
+        animated = self.sprite_sheets.get("idle") or self.animated_sprite
+        return animated.frame_set.get_icon(size) if animated else None
+    
     def draw(self, screen, x, y, scale=1.0):
-        """スプライトを描画"""
-        if self.animated_sprite:
-            frame = self.animated_sprite.get_current_frame()
-            if frame:
-                if scale != 1.0:
-                    # スケーリング
-                    width = int(frame.get_width() * scale)
-                    height = int(frame.get_height() * scale)
-                    frame = pygame.transform.scale(frame, (width, height))
-                
-                # 中央揃えで描画
-                rect = frame.get_rect()
-                rect.center = (x, y)
-                screen.blit(frame, rect)
-                return True
+        """スプライトを描画（拡大したフレームはキャッシュを使うので、毎フレームの拡大はしない）"""
+        animated = self.animated_sprite
+        if animated and animated.frames and 0 <= animated.current_frame < len(animated.frames):
+            frame, offset = animated.frame_set.get_scaled(animated.current_frame, scale)
+            # 元のフレームを (x, y) を中心に置いたときの左上を基準に描く
+            left = x - int(animated.frame_width * scale) // 2
+            top = y - int(animated.frame_height * scale) // 2
+            screen.blit(frame, (left + offset[0], top + offset[1]))
+            return True
         return False
 
 def clean_and_convert_working_version():
@@ -0,0 +1,214 @@
+# sprite_atlas.py
+# 機能：全種族のスプライトのフレームを数枚の大きな画像（アトラス）にまとめる
+#
+# ビルド時（build_sprites.py から呼ばれる）:
+#   マニフェストにあるスプライトシートからフレームを切り出し、透明な余白を切り詰めて
+#   棚詰め（shelf packing）でページに並べる。位置は sprites/atlas_index.json に書く。
+# 実行時:
+#   ページ画像とインデックスを1回だけ読み込み、各フレームはページの subsurface（コピーなし）で返す。
+#   種族ごとのファイル読み込みやフレームのコピーは発生しない。
+
+import json
+import os
+
+from PIL import Image
+
+ATLAS_DIR = "sprites"
+ATLAS_INDEX_PATH = os.path.join(ATLAS_DIR, "atlas_index.json")
+ATLAS_PAGE_SIZE = 1024
+ATLAS_VERSION = 1
+
+
+def _iter_sheet_frames(entry):
+    """マニフェストのエントリから (フレーム番号, 切り詰めたフレーム, (x, y)) を順に返す"""
+    info = entry["info"]
+    frame_width, frame_height = info["frame_width"], info["frame_height"]
+    frames_per_row = info["frames_per_row"]
+    bboxes = info.get("frame_bboxes")
+
+    sheet = Image.open(entry["sheet"]).convert("RGBA")
+    for i in range(info["total_frames"]):
+        x = (i % frames_per_row) * frame_width
+        y = (i // frames_per_row) * frame_height
+        frame = sheet.crop((x, y, x + frame_width, y + frame_height))
+        bbox = bboxes[i] if bboxes and i < len(bboxes) else frame.getchannel('A').getbbox()
+        if not bbox:
+            bbox = (0, 0, 1, 1)  # 完全に透明なフレームは1ピクセルだけ残す
+        yield i, frame.crop(tuple(bbox)), (bbox[0], bbox[1])
+
+
+class _ShelfPacker:
+    """高さの揃った「棚」に左から順に詰めていく単純な詰め込み"""
+    def __init__(self, page_size):
+        self.page_size = page_size
+        self.pages = []  # 各ページの [棚の上端, 棚の高さ, 次に置くx]
+        self._new_page()
+
+    def _new_page(self):
+        self.pages.append([0, 0, 0])
+
+    def place(self, width, height):
+        """(ページ番号, x, y) を返す"""
+        if width > self.page_size or height > self.page_size:
+            raise ValueError(f"フレームがアトラスのページより大きい: {width}x{height}")
+        shelf = self.pages[-1]
+        if shelf[2] + width > self.page_size:
+            # 棚がいっぱいなら次の棚へ
+            shelf[0] += shelf[1]
+            shelf[1] = 0
+            shelf[2] = 0
+        if shelf[0] + height > self.page_size:
+            self._new_page()
+            shelf = self.pages[-1]
+        x, y = shelf[2], shelf[0]
+        shelf[2] += width
+        shelf[1] = max(shelf[1], height)
+        return len(self.pages) - 1, x, y
+
+
+def build_atlas(manifest, atlas_dir=ATLAS_DIR, index_path=ATLAS_INDEX_PATH, page_size=ATLAS_PAGE_SIZE):
+    """
+    マニフェスト（build_sprites.py の形式）にある全スプライトからアトラスを作る。
+    戻り値: 書き出したページ数
+    """
+    pieces = []  # (種族, 向き, アニメーション, フレーム番号, 画像, 位置)
+    entries = {}
+    for species, facings in manifest.get("sprites", {}).items():
+        for facing, animations in facings.items():
+            for animation, entry in animations.items():
+                if entry.get("stream"):
+                    continue  # ストリーミング再生のGIFはアトラスに入れない
+                entries[(species, facing, animation)] = entry
+                for i, image, offset in _iter_sheet_frames(entry):
+                    pieces.append((species, facing, animation, i, image, offset))
+
+    # 背の高い順に並べると棚の無駄が少ない
+    pieces.sort(key=lambda p: (-p[4].height, -p[4].width))
+    packer = _ShelfPacker(page_size)
+    placed = []
+    for piece in pieces:
+        placed.append((piece, packer.place(*piece[4].size)))
+
+    # ページごとに、実際に使った高さまでの画像を作る
+    page_heights = [shelf[0] + shelf[1] for shelf in packer.pages]
+    page_images = [Image.new("RGBA", (page_size, max(1, h)), (0, 0, 0, 0)) for h in page_heights]
+    sprites = {}
+    for (species, facing, animation, i, image, offset), (page, x, y) in placed:
+        page_images[page].paste(image, (x, y))
+        entry = entries[(species, facing, animation)]
+        record = sprites.setdefault(species, {}).setdefault(facing, {}).setdefault(animation, {
+            "frame_width": entry["info"]["frame_width"],
+            "frame_height": entry["info"]["frame_height"],
+            "source_hash": entry.get("source_hash"),
+            "frames": [None] * entry["info"]["total_frames"]
+        })
+        # [ページ, x, y, 幅, 高さ, 元フレーム内のx, 元フレーム内のy]
+        record["frames"][i] = [page, x, y, image.width, image.height, offset[0], offset[1]]
+
+    os.makedirs(atlas_dir, exist_ok=True)
+    page_paths = []
+    for n, image in enumerate(page_images):
+        path = os.path.join(atlas_dir, f"atlas_{n}.png")
+        image.save(path, "PNG")
+        page_paths.append(path.replace(os.sep, "/"))
+
+    index = {"version": ATLAS_VERSION, "pages": page_paths, "sprites": sprites}
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return len(page_paths)
+
+
+def is_atlas_stale(manifest, index_path=ATLAS_INDEX_PATH):
+    """アトラスがマニフェストの内容と食い違っていれば True"""
+    try:
+        index = load_atlas_index(index_path)
+    except (OSError, ValueError):
+        return True
+    if index.get("version") != ATLAS_VERSION:
+        return True
+    if not all(os.path.exists(page) for page in index.get("pages", [])):
+        return True
+    built = {
+        (species, facing, animation): record.get("source_hash")
+        for species, facings in index.get("sprites", {}).items()
+        for facing, animations in facings.items()
+        for animation, record in animations.items()
+    }
+    wanted = {
+        (species, facing, animation): entry.get("source_hash")
+        for species, facings in manifest.get("sprites", {}).items()
+        for facing, animations in facings.items()
+        for animation, entry in animations.items()
+        if not entry.get("stream")
+    }
+    return built != wanted
+
+
+class SpriteAtlas:
+    """実行時のアトラス。ページ画像は1回だけ読み込み、フレームは subsurface で返す"""
+    def __init__(self, index, page_images=None):
+        import pygame
+        # pygame.display が初期化されていない場合の対策（SpriteSheet と同じ）
+        if not pygame.get_init():
+            pygame.init()
+        if not pygame.display.get_init():
+            pygame.display.set_mode((1, 1))
+
+        self.sprites = index.get("sprites", {})
+        if page_images is not None:
+            self.pages = list(page_images)  # 先読み済み（sprite_preloader）
+        else:
+            from pixel_cache import load_image
+            self.pages = [load_image(path) for path in index.get("pages", [])]
+
+    def has_sprite(self, pokemon_id, facing_direction):
+        return bool(self.sprites.get(pokemon_id, {}).get(facing_direction))
+
+    def get_frame_sets(self, pokemon_id, facing_direction):
+        """{アニメーション名: FrameSet} を返す（無ければ空の辞書）"""
+        from sprite_animation import FrameSet
+
+        frame_sets = {}
+        for animation, record in self.sprites.get(pokemon_id, {}).get(facing_direction, {}).items():
+            frames = []
+            offsets = []
+            for page, x, y, w, h, ox, oy in record["frames"]:
+                frames.append(self.pages[page].subsurface((x, y, w, h)))
+                offsets.append((ox, oy))
+            frame_sets[animation] = FrameSet(frames, record["frame_width"], record["frame_height"], offsets)
+        return frame_sets
+
+
+_sprite_atlas = None
+_sprite_atlas_loaded = False
+
+
+def load_atlas_index(index_path=ATLAS_INDEX_PATH):
+    """アトラスのインデックスを読み込む（無い・壊れている場合は OSError / ValueError）"""
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_sprite_atlas_loaded():
+    return _sprite_atlas_loaded
+
+
+def get_loaded_sprite_atlas():
+    """読み込み済みならアトラスを返す（まだなら読み込まずに None）"""
+    return _sprite_atlas
+
+
+def get_sprite_atlas(index_path=ATLAS_INDEX_PATH, page_images=None):
+    """
+    プロセス全体で共有するアトラス（インデックスが無ければ None）。
+    page_images は先読みしたページ画像で、最初に読み込むときだけ使われる。
+    """
+    global _sprite_atlas, _sprite_atlas_loaded
+    if not _sprite_atlas_loaded:
+        _sprite_atlas_loaded = True
+        try:
+            _sprite_atlas = SpriteAtlas(load_atlas_index(index_path), page_images)
+        except (OSError, ValueError, RuntimeError) as e:  # pygame.error は RuntimeError
+            print(f"[INFO] スプライトアトラスを使わずに読み込みます: {e}")
+            _sprite_atlas = None
+    return _sprite_atlas
@@ -0,0 +1,176 @@
+# sprite_cache.py
+# 機能：デコード済みのスプライトのフレームをプロセス全体で共有するキャッシュ
+#
+# キーは (種族, 向き, アニメーション)、値は FrameSet。
+# 2回目以降のバトルで同じ種族が出てきても、ファイルの読み込みや
+# フレームの切り出しは行わず、キャッシュのフレームをそのまま使う。
+#
+# メモリはバイト単位で数える。登録したときのフレームに加えて、あとから作られる
+# 拡大済みフレームやアイコンも FrameSet から知らせてもらって足す。
+# 合計が上限を超えたら、最後に使ってから一番時間がたったアニメーションから捨てる（LRU）。
+
+from collections import OrderedDict
+import threading
+
+DEFAULT_SPRITE_CACHE_BUDGET = 64 * 1024 * 1024  # 64MB
+
+# バトルで使うアニメーション
+ANIMATIONS = ["idle", "attack", "hurt", "faint"]
+
+# 「このアニメーションは存在しない」ことを覚えておくための印（毎回探し直さないため）
+_MISSING = object()
+
+
+def surface_bytes(surface):
+    """Surface が自分で持っているピクセルデータのバイト数（subsurface は親と共有なので 0）"""
+    if surface.get_parent() is not None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+
+def frame_set_bytes(frame_set):
+    """FrameSet のフレーム・拡大済みフレーム・アイコンのバイト数（同じ Surface は1回だけ数える）"""
+    if frame_set.streaming:
+        # 全フレームを読み込むわけではないので、手元に置く分だけを数える
+        return frame_set.max_resident_bytes()
+    surfaces = {id(surface): surface for surface in frame_set.iter_surfaces()}
+    return sum(surface_bytes(surface) for surface in surfaces.values())
+
+
+class SpriteCache:
+    """(種族, 向き, アニメーション) → FrameSet の LRU キャッシュ"""
+    def __init__(self, budget_bytes=DEFAULT_SPRITE_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()  # キー → [FrameSet または _MISSING, バイト数]
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.peak_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        キャッシュにあれば (True, FrameSet または None) を返す（None は「存在しない」と分かっている）。
+        無ければ (False, None)。
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[0]
+            return True, (None if value is _MISSING else value)
+
+    def has(self, key):
+        """キャッシュにあるかどうか（統計や LRU の順番には影響しない）"""
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, frame_set):
+        """登録する（frame_set が None なら「存在しない」ことを登録する）"""
+        with self._lock:
+            self._remove(key)
+            if frame_set is None:
+                self._entries[key] = [_MISSING, 0]
+                return
+            self._entries[key] = [frame_set, frame_set_bytes(frame_set)]
+            # あとから拡大済みフレームなどが作られたら知らせてもらう
+            frame_set.on_grow = lambda size, key=key: self._grow(key, size)
+            self._add_bytes(self._entries[key][1])
+            self._evict(keep=key)
+
+    def _grow(self, key, size):
+        """キャッシュにある FrameSet に size バイトの Surface が増えた"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry[1] += size
+            self._add_bytes(size)
+            self._evict(keep=key)
+
+    def _add_bytes(self, size):
+        self.current_bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+            if entry[0] is not _MISSING:
+                entry[0].on_grow = None  # 捨てたあとに増えた分は数えない
+
+    def _evict(self, keep=None):
+        """上限を超えている間、古いものから捨てる（keep は今使っているところなので残す）"""
+        for key in list(self._entries):
+            if self.current_bytes <= self.budget_bytes:
+                break
+            if key == keep or self._entries[key][1] == 0:
+                continue  # 「存在しない」の印などは捨ててもメモリは減らない
+            self._remove(key)
+            self.evictions += 1
+
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self.current_bytes = 0
+
+    def get_frame_sets(self, pokemon_id, facing_direction, loader):
+        """
+        {アニメーション名: FrameSet} を返す。
+        どれかがキャッシュに無ければ loader() でその種族・向きのアニメーションをまとめて読み込む。
+        """
+        result = {}
+        for animation in ANIMATIONS:
+            found, frame_set = self.get((pokemon_id, facing_direction, animation))
+            if not found:
+                break
+            if frame_set is not None:
+                result[animation] = frame_set
+        else:
+            return result
+
+        loaded = loader()
+        for animation in set(ANIMATIONS) | set(loaded):
+            self.put((pokemon_id, facing_direction, animation), loaded.get(animation))
+        return loaded
+
+    def stats(self):
+        """診断用の統計"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "peak_bytes": self.peak_bytes,
+                "budget_bytes": self.budget_bytes,
+                "atlas_bytes": _atlas_bytes(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+def _atlas_bytes():
+    """読み込み済みのアトラスのページのバイト数（キャッシュとは別に、常に持っている分）"""
+    from sprite_atlas import get_loaded_sprite_atlas
+    atlas = get_loaded_sprite_atlas()
+    return sum(surface_bytes(page) for page in atlas.pages) if atlas else 0
+
+
+_sprite_cache = SpriteCache()
+
+
+def get_sprite_cache():
+    """プロセス全体で共有するスプライトキャッシュ"""
+    return _sprite_cache
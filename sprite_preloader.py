@@ -0,0 +1,174 @@
+# sprite_preloader.py
+# 機能：バトルが始まる前に、使いそうなスプライトとUI画像を裏で読み込んでおく
+#
+# フィールドで草むらを歩いている間に、出現しそうな野生ポケモン（正面）と
+# 手持ちのポケモン（背面）のスプライト、バトル画面のUI画像を先読みする。
+#   - PNGのデコード（またはピクセルキャッシュの読み込み）はワーカースレッドで行う
+#   - pygame の Surface への変換とキャッシュへの登録はメインスレッドで行う
+#     （pump() を毎フレーム呼ぶ。1回あたりの処理時間には上限がある）
+# エンカウントしたときには、BattleScene はキャッシュから取り出すだけになる。
+
+import queue
+import threading
+import time
+
+import pygame
+
+import sprite_atlas
+from pixel_cache import load_pixels
+from sprite_animation import PokemonSprite, lookup_sprite_manifest, provide_sheet_image
+from sprite_cache import get_sprite_cache
+from ui.components import is_ui_image_loaded, store_ui_image
+
+# pump() 1回あたりにメインスレッドで使ってよい時間（ミリ秒）
+DEFAULT_PUMP_BUDGET_MS = 4.0
+
+
+def _decode_rgba(path):
+    """PNGをRGBAのバイト列にする（ワーカースレッドで実行。ピクセルキャッシュがあればデコードしない）"""
+    return load_pixels(path)
+
+
+def _to_surface(decoded):
+    """デコード済みのバイト列を表示用の Surface にする（メインスレッドで実行）"""
+    size, data = decoded
+    return pygame.image.frombuffer(data, size, "RGBA").convert_alpha()
+
+
+class SpritePreloader:
+    """スプライトとUI画像の先読み"""
+    def __init__(self):
+        self._requests = queue.Queue()  # ワーカーへの依頼
+        self._steps = queue.Queue()     # メインスレッドで実行する処理（引数なしの関数）
+        self._pending = set()           # 依頼済みで、まだ終わっていないもの
+        self._thread = None
+        self._atlas_index = None
+        self._atlas_pages_decoded = False
+        self.completed = 0
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="SpritePreloader", daemon=True)
+            self._thread.start()
+
+    def request_sprite(self, pokemon_id, facing_direction, scale=None):
+        """スプライトを先読みする（scale を渡すと、その倍率の拡大フレームも作っておく）"""
+        key = ("sprite", pokemon_id, facing_direction)
+        if key in self._pending or get_sprite_cache().has((pokemon_id, facing_direction, "idle")):
+            return
+        self._pending.add(key)
+        self._ensure_thread()
+        self._requests.put((key, scale))
+
+    def request_ui_images(self, paths):
+        """UI画像を先読みする"""
+        for path in paths:
+            key = ("ui", path)
+            if key in self._pending or is_ui_image_loaded(path):
+                continue
+            self._pending.add(key)
+            self._ensure_thread()
+            self._requests.put((key, None))
+
+    def pump(self, budget_ms=DEFAULT_PUMP_BUDGET_MS):
+        """
+        メインスレッドで毎フレーム呼ぶ。先読みの仕上げを時間の許す範囲で行う。
+        戻り値: 実行した処理の数
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        done = 0
+        while True:
+            try:
+                step = self._steps.get_nowait()
+            except queue.Empty:
+                break
+            step()
+            done += 1
+            if time.perf_counter() >= deadline:
+                break
+        return done
+
+    def is_idle(self):
+        return not self._pending and self._steps.empty()
+
+    # --- ワーカースレッド ---
+
+    def _run(self):
+        while True:
+            key, scale = self._requests.get()
+            try:
+                if key[0] == "ui":
+                    self._decode_ui_image(key)
+                else:
+                    self._decode_sprite(key, scale)
+            except Exception as e:
+                print(f"[WARNING] 先読みに失敗しました: {key[1:]} ({e})")
+                self._steps.put(lambda key=key: self._pending.discard(key))
+
+    def _decode_ui_image(self, key):
+        decoded = _decode_rgba(key[1])
+
+        def finish():
+            store_ui_image(key[1], _to_surface(decoded))
+            self._finish(key)
+        self._steps.put(finish)
+
+    def _decode_sprite(self, key, scale):
+        _, pokemon_id, facing_direction = key
+        if self._atlas_index is None:
+            try:
+                self._atlas_index = sprite_atlas.load_atlas_index()
+            except (OSError, ValueError):
+                self._atlas_index = {}
+
+        if self._atlas_index.get("sprites", {}).get(pokemon_id, {}).get(facing_direction):
+            # アトラスにある場合は、ページ画像を1回デコードすれば全種族が使える
+            if not self._atlas_pages_decoded and not sprite_atlas.is_sprite_atlas_loaded():
+                self._atlas_pages_decoded = True
+                pages = [_decode_rgba(path) for path in self._atlas_index.get("pages", [])]
+                self._steps.put(lambda: sprite_atlas.get_sprite_atlas(
+                    page_images=[_to_surface(page) for page in pages]))
+            sheets = []
+        else:
+            entries = lookup_sprite_manifest(pokemon_id, facing_direction)
+            if not entries:
+                # ビルドされていない（GIFの変換が必要な）スプライトは先読みしない
+                self._steps.put(lambda: self._pending.discard(key))
+                return
+            # ストリーミング再生のGIFは、再生するときに少しずつ読み込むので先読みしない
+            sheets = [(entry["sheet"], _decode_rgba(entry["sheet"]))
+                      for entry in entries.values() if not entry.get("stream")]
+
+        self._steps.put(lambda: self._warm_sprite(key, scale, sheets))
+
+    # --- メインスレッド ---
+
+    def _warm_sprite(self, key, scale, sheets):
+        """スプライトキャッシュに載せ、拡大フレームを作る処理を1フレームずつ積む"""
+        _, pokemon_id, facing_direction = key
+        if not get_sprite_cache().has((pokemon_id, facing_direction, "idle")):
+            # その間にバトルで読み込まれていなければ、デコード済みのシートを使わせる
+            for path, decoded in sheets:
+                provide_sheet_image(path, _to_surface(decoded))
+        sprite = PokemonSprite(pokemon_id, facing_direction)
+        animated = sprite.sprite_sheets.get("idle")
+        if scale is not None and animated is not None and not animated.frame_set.streaming:
+            frame_set = animated.frame_set
+            for index in range(len(frame_set.frames)):
+                self._steps.put(lambda index=index: frame_set.get_scaled(index, scale))
+        self._steps.put(lambda: self._finish(key))
+
+    def _finish(self, key):
+        self._pending.discard(key)
+        self.completed += 1
+
+
+_sprite_preloader = None
+
+
+def get_sprite_preloader():
+    """プロセス全体で共有する先読み（最初に使うときにワーカーを起動する）"""
+    global _sprite_preloader
+    if _sprite_preloader is None:
+        _sprite_preloader = SpritePreloader()
+    return _sprite_preloader
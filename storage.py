@@ -0,0 +1,147 @@
+# storage.py
+# 機能：パソコンのボックス（手持ち以外のモンスター）を管理する
+#
+# セーブデータから読み込んだ直後のボックスは「未展開」の状態で、
+# モンスターのデータ（辞書）を取り出す関数だけを持っている。
+# 実際に Monster オブジェクトを作るのは、そのボックスを初めて開いたときか、
+# バックグラウンドの先読みスレッドが処理したとき。
+
+import threading
+
+from save_binary import EncodedRecords
+
+BOX_SIZE = 30  # 1ボックスに入るモンスターの数
+
+
+def default_box_sizes(total):
+    """ボックスごとの匹数が保存されていない場合の分け方（先頭から詰める）"""
+    return [min(BOX_SIZE, total - start) for start in range(0, total, BOX_SIZE)]
+
+
+class _PendingBox:
+    """まだ Monster に展開していないボックス"""
+    def __init__(self, count, loader):
+        self.count = count    # 入っているモンスターの数
+        self.loader = loader  # 呼ぶとモンスターの辞書のリストを返す関数
+
+
+class PCStorage:
+    """パソコンのボックスを管理するクラス"""
+    def __init__(self, deserializer):
+        """deserializer: モンスターの辞書を Monster に戻す関数"""
+        self.deserializer = deserializer
+        self.boxes = []  # 各要素は Monster のリスト、または _PendingBox
+        self._lock = threading.RLock()
+        self._preload_thread = None
+
+    def __len__(self):
+        """預けているモンスターの総数（未展開のボックスも展開せずに数える）"""
+        with self._lock:
+            return sum(self._box_len(box) for box in self.boxes)
+
+    @staticmethod
+    def _box_len(box):
+        return box.count if isinstance(box, _PendingBox) else len(box)
+
+    def get_box_count(self):
+        return len(self.boxes)
+
+    def is_box_loaded(self, index):
+        with self._lock:
+            return not isinstance(self.boxes[index], _PendingBox)
+
+    def get_box(self, index):
+        """ボックスの中身（Monster のリスト）を返す。未展開ならここで展開する"""
+        with self._lock:
+            box = self.boxes[index]
+            if isinstance(box, _PendingBox):
+                box = self._resolve(box)
+                self.boxes[index] = box
+            return box
+
+    def _resolve(self, pending_box):
+        monsters = []
+        for monster_data in pending_box.loader():
+            try:
+                monster = self.deserializer(monster_data)
+            except Exception as e:
+                print(f"警告: ボックスのモンスターの復元エラー: {e}")
+                continue
+            if monster:
+                monsters.append(monster)
+        return monsters
+
+    def deposit(self, monster):
+        """空きのある最初のボックスにモンスターを預ける"""
+        with self._lock:
+            for index, box in enumerate(self.boxes):
+                if self._box_len(box) < BOX_SIZE:
+                    self.get_box(index).append(monster)
+                    return index
+            self.boxes.append([monster])
+            return len(self.boxes) - 1
+
+    def withdraw(self, box_index, slot):
+        """ボックスからモンスターを引き取る"""
+        with self._lock:
+            return self.get_box(box_index).pop(slot)
+
+    def clear(self):
+        with self._lock:
+            self.boxes = []
+
+    def load_lazy(self, box_sizes, make_loader):
+        """
+        セーブデータからボックスを読み込む（展開はしない）。
+        box_sizes: 各ボックスの匹数
+        make_loader(start, count): 先頭から start 匹目以降 count 匹ぶんの辞書を返す関数を作る
+        """
+        with self._lock:
+            self.boxes = []
+            start = 0
+            for count in box_sizes:
+                if count:
+                    self.boxes.append(_PendingBox(count, make_loader(start, count)))
+                else:
+                    self.boxes.append([])
+                start += count
+
+    def preload_in_background(self):
+        """未展開のボックスを、バックグラウンドのスレッドで順に展開する"""
+        if self._preload_thread and self._preload_thread.is_alive():
+            return
+        self._preload_thread = threading.Thread(target=self._preload_all, name="StoragePreload", daemon=True)
+        self._preload_thread.start()
+
+    def _preload_all(self):
+        index = 0
+        while True:
+            # 1ボックスずつロックを取るので、メインスレッドを長く待たせない
+            with self._lock:
+                if index >= len(self.boxes):
+                    return
+                if isinstance(self.boxes[index], _PendingBox):
+                    self.get_box(index)
+            index += 1
+
+    def serialize(self, serializer, keep_encoded=False):
+        """
+        セーブ用に (モンスターの辞書のリスト, 各ボックスの匹数) を返す。
+        未展開のボックスは Monster を作らず、読み込んだときの辞書をそのまま使う。
+        keep_encoded=True の場合、バイナリセーブから読んだままのボックスはデコードせず、
+        EncodedRecords をそのまま1要素として入れる（バイナリで書くときだけ使える）。
+        """
+        with self._lock:
+            records = []
+            box_sizes = []
+            for box in self.boxes:
+                if isinstance(box, _PendingBox):
+                    if keep_encoded and isinstance(box.loader, EncodedRecords):
+                        records.append(box.loader)
+                    else:
+                        records.extend(box.loader())
+                    box_sizes.append(box.count)
+                else:
+                    records.extend(serializer(monster) for monster in box)
+                    box_sizes.append(len(box))
+            return records, box_sizes
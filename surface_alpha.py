@@ -0,0 +1,86 @@
+# surface_alpha.py
+# 機能：画像のアルファの使い方を調べて、一番速く描ける形式の Surface にする
+#
+#   "opaque"  : 全ピクセルが不透明        → アルファなし（convert）
+#   "binary"  : アルファが 0 か 255 だけ  → カラーキー + RLE（透明部分を飛ばして描ける）
+#   "blended" : 半透明のピクセルがある    → そのまま（ピクセルごとのアルファ合成）
+#
+# ドット絵のスプライトやUI部品はほとんど "binary" なので、
+# 毎フレームのアルファ合成の代わりに、不透明な部分のコピーだけで済むようになる。
+# どの画像をどの形式にしたかは get_alpha_report() で確認できる（bench_blit.py が表示する）。
+
+from collections import Counter
+
+import pygame
+
+# カラーキーに使う色の候補（画像の不透明な部分で使われていない色を選ぶ）
+COLORKEY_CANDIDATES = [(255, 0, 255), (0, 255, 255), (1, 254, 3), (254, 1, 253)]
+
+_enabled = True
+_report = {}  # 画像の名前 → Counter(形式 → 枚数)
+
+
+def classify_alpha(surface):
+    """Surface のアルファを "opaque" / "binary" / "blended" に分類する"""
+    width, height = surface.get_size()
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return "opaque"
+    visible = pygame.mask.from_surface(surface, 0).count()  # アルファ > 0
+    solid = pygame.mask.from_surface(surface, 254).count()  # アルファ = 255
+    if solid == width * height:
+        return "opaque"
+    if solid == visible:
+        return "binary"
+    return "blended"
+
+
+def _to_colorkey(surface):
+    """アルファが 0/255 だけの Surface をカラーキー + RLE の Surface にする（使える色が無ければ None）"""
+    width, height = surface.get_size()
+    solid = pygame.mask.from_surface(surface, 254)
+    solid_count = solid.count()
+    for key in COLORKEY_CANDIDATES:
+        keyed = surface.convert()  # 色はそのまま、アルファだけ落とす
+        solid.to_surface(keyed, setcolor=None, unsetcolor=key)  # 透明だった部分をキーの色で塗る
+        # 不透明な部分にキーと同じ色があると、そこまで透明になってしまう
+        same_as_key = pygame.mask.from_threshold(keyed, key, (1, 1, 1, 255)).count()
+        if same_as_key == width * height - solid_count:
+            keyed.set_colorkey(key, pygame.RLEACCEL)
+            return keyed
+    return None
+
+
+def optimize_for_blit(surface, name=None):
+    """
+    描画用に一番速い形式の Surface を返す（"blended" の場合や無効化されている場合はそのまま）。
+    結果は元の Surface とは別物になることがあるので、拡大などの元画像には元の Surface を使うこと。
+    name を渡すと、選んだ形式をレポートに記録する。
+    """
+    if not _enabled:
+        return surface
+    mode = classify_alpha(surface)
+    result = surface
+    if mode == "opaque":
+        result = surface.convert()
+    elif mode == "binary":
+        result = _to_colorkey(surface)
+        if result is None:
+            mode, result = "blended", surface
+    if name is not None:
+        _report.setdefault(name, Counter())[mode] += 1
+    return result
+
+
+def set_alpha_optimization(enabled):
+    """形式の変換を有効/無効にする（bench_blit.py で効果を比べるため）"""
+    global _enabled
+    _enabled = enabled
+
+
+def get_alpha_report():
+    """{画像の名前: {形式: 枚数}} を返す"""
+    return {name: dict(modes) for name, modes in _report.items()}
+
+
+def clear_alpha_report():
+    _report.clear()
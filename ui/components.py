@@ -2,6 +2,51 @@
 import pygame
 import os
 
+from pixel_cache import load_image
+from surface_alpha import optimize_for_blit
+from ui.glyph_atlas import get_glyph_atlas
+from ui.text_cache import render_text
+
+# 読み込み済みのUI画像。同じ画像をバトルのたびに読み直さない
+_ui_source_images = {}  # パス → convert_alpha した元画像（拡大の元にする）
+_ui_image_cache = {}    # (パス, 大きさ) → 描画用の Surface
+
+def _load_ui_source(path):
+    image = _ui_source_images.get(path)
+    if image is None:
+        image = load_image(path)
+        _ui_source_images[path] = image
+    return image
+
+def load_ui_image(path, size=None):
+    """
+    UI画像を読み込む（size を渡すとその大きさに拡大した画像）。
+    アルファの使い方に合わせて一番速く描ける形式にしてある（surface_alpha.py）。
+    画像はプロセス全体で共有するので、呼び出し側で書き換えないこと。
+    """
+    key = (path, size)
+    image = _ui_image_cache.get(key)
+    if image is None:
+        image = _load_ui_source(path)
+        name = path
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+            name = f"{path}@{int(size[0])}x{int(size[1])}"
+        image = optimize_for_blit(image, name)
+        _ui_image_cache[key] = image
+    return image
+
+def store_ui_image(path, image):
+    """別の場所で読み込んだ画像を登録する（sprite_preloader の先読み用）"""
+    _ui_source_images.setdefault(path, image)
+
+def is_ui_image_loaded(path):
+    return path in _ui_source_images
+
+def clear_ui_image_cache():
+    _ui_source_images.clear()
+    _ui_image_cache.clear()
+
 class Button:
     """ボタンクラス"""
     def __init__(self, x, y, width, height, text, font):
@@ -31,7 +76,7 @@ class Button:
         
         # テキスト
         text_color = self.text_color if self.is_enabled else (64, 64, 64)
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = render_text(self.font, self.text, text_color)
         text_rect = text_surface.get_rect()
         text_rect.center = self.rect.center
         screen.blit(text_surface, text_rect)
@@ -51,9 +96,9 @@ class HPBar:
 
         # HPバーの画像を読み込み、指定されたサイズにリサイズ
         self.bar_images = {
-            "green": pygame.transform.scale(pygame.image.load("ui/assets/hp_bar_green.png").convert_alpha(), (width, height)),
-            "yellow": pygame.transform.scale(pygame.image.load("ui/assets/hp_bar_yellow.png").convert_alpha(), (width, height)),
-            "red": pygame.transform.scale(pygame.image.load("ui/assets/hp_bar_red.png").convert_alpha(), (width, height)),
+            "green": load_ui_image("ui/assets/hp_bar_green.png", (width, height)),
+            "yellow": load_ui_image("ui/assets/hp_bar_yellow.png", (width, height)),
+            "red": load_ui_image("ui/assets/hp_bar_red.png", (width, height)),
         }
         
         self.max_hp = 1
@@ -108,9 +153,8 @@ class HPBar:
         current_width = int(self.width * hp_ratio)
         if current_width <= 0: return # 幅が0以下なら描画しない
         
-        # 計算した幅のサブサーフェス（画像の一部）を切り出して描画
-        bar_subsurface = bar_image.subsurface((0, 0, current_width, self.height))
-        screen.blit(bar_subsurface, (self.x, self.y))
+        # 計算した幅の部分だけを描画
+        screen.blit(bar_image, (self.x, self.y), (0, 0, current_width, self.height))
 
 class MessageBox:
     """文字を順に表示する機能を持つメッセージボックスクラス（従来版）"""
@@ -178,9 +222,15 @@ class MessageBox:
         
         # 表示する部分のテキストを切り出す
         text_to_draw = self.current_message[:int(self.visible_chars)]
-        text_surface = self.font.render(text_to_draw, True, self.text_color)
+        text_surface = render_text(self.font, text_to_draw, self.text_color)
         screen.blit(text_surface, (self.rect.x + 15, self.rect.y + 10))
 
+# 行の先頭に来てはいけない文字（句読点・閉じ括弧・小さいかな・長音など）
+NO_LINE_START = set("、。，．・：；？！゛゜ヽヾゝゞ々ー）］｝」』】〕〉》’”"
+                    "ぁぃぅぇぉっゃゅょゎァィゥェォッャュョヮヵヶ…!?,.:;)]}")
+# 行の末尾に来てはいけない文字（開き括弧）
+NO_LINE_END = set("（［｛「『【〔〈《‘“([{")
+
 class ImageMessageBox:
     """画像ベースのメッセージボックスクラス"""
     
@@ -204,6 +254,11 @@ class ImageMessageBox:
         self.max_lines = 4
         self.text_margin_x = 35  # 左右の余白を大きく
         self.text_margin_y = 25  # 上下の余白を大きく
+        self.text_color = (60, 60, 60)
+        
+        # 行の分け方と各行の画像（メッセージが変わったときだけ作り直す）
+        self._layout_key = None
+        self._lines = []  # (行の画像, メッセージ内での行の開始位置, 先頭k文字の幅のリスト)
         
         # 状態管理
         self.is_typing = False
@@ -214,9 +269,8 @@ class ImageMessageBox:
         """テキストボックス画像を読み込み"""
         try:
             if os.path.exists(image_path):
-                self.bg_image = pygame.image.load(image_path).convert_alpha()
-                # 指定されたサイズに画像をリサイズ
-                self.bg_image = pygame.transform.scale(self.bg_image, (self.width, self.height))
+                # 指定されたサイズにリサイズした画像を読み込み
+                self.bg_image = load_ui_image(image_path, (self.width, self.height))
                 print(f"[INFO] テキストボックス画像を読み込み: {image_path}")
             else:
                 print(f"[WARNING] 画像が見つかりません: {image_path}")
@@ -319,42 +373,94 @@ class ImageMessageBox:
         text_width = self.width - (self.text_margin_x * 2)
         
         if self.current_message:
-            # 現在表示中の文字列
-            display_text = self.current_message[:self.char_index]
-            
-            # テキストを行に分割して表示
-            self._draw_wrapped_text(screen, display_text, text_x, text_y, text_width)
+            # 行の画像のうち、表示済みの文字の分だけを描く
+            self._draw_revealed_lines(screen, text_x, text_y, text_width)
         
         # 入力待ちインジケーター
         if self.waiting_for_input:
             self._draw_input_indicator(screen)
     
-    def _draw_wrapped_text(self, screen, text, x, y, max_width):
-        """テキストを複数行に分けて描画"""
-        words = text.split(' ')
-        lines = []
-        current_line = ""
+    def _draw_revealed_lines(self, screen, x, y, max_width):
+        """
+        行の画像を、表示済みの文字の幅で切り取って描く（タイプライター表示）。
+        行の分け方と画像はメッセージごとに1回だけ作るので、1フレームの処理量はメッセージの長さによらない。
+        """
+        key = (self.current_message, max_width)
+        if key != self._layout_key:
+            self._layout_key = key
+            self._lines = []
+            for line, start in self._layout_message(self.current_message, max_width):
+                widths = [self.font.size(line[:k])[0] for k in range(len(line) + 1)]
+                self._lines.append((self._render_line(line), start, widths))
         
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            text_surface = self.font.render(test_line, True, (60, 60, 60))
-            
-            if text_surface.get_width() <= max_width:
-                current_line = test_line
+        for i, (surface, start, widths) in enumerate(self._lines[:self.max_lines]):
+            visible = self.char_index - start
+            if visible <= 0:
+                break
+            position = (x, y + i * self.line_height)
+            if visible >= len(widths) - 1:
+                screen.blit(surface, position)
             else:
-                if current_line:
-                    lines.append(current_line)
-                    current_line = word
+                screen.blit(surface, position, (0, 0, widths[visible], surface.get_height()))
+    
+    def _render_line(self, line):
+        """1行分の文字の画像（グリフのアトラスがあれば、ラスタライズせずに貼り合わせて作る）"""
+        atlas = get_glyph_atlas(self.font)
+        if atlas is not None:
+            return atlas.render(line, self.text_color)
+        return render_text(self.font, line, self.text_color)
+    
+    def _layout_message(self, text, max_width):
+        """
+        メッセージを行に分ける。戻り値: [(行の文字列, メッセージ内での開始位置)]
+        空白の位置で折り返す（今までと同じ）。空白の無い部分が1行に収まらない場合は、
+        禁則（句読点や閉じ括弧を行頭に、開き括弧を行末に置かない）を守って文字の間で折り返す。
+        改行文字では必ず改行する。
+        """
+        lines = []
+        paragraph_start = 0
+        for paragraph in text.split("\n"):
+            line_start = line_end = None
+            position = paragraph_start
+            for word in paragraph.split(" "):
+                word_start, word_end = position, position + len(word)
+                position = word_end + 1  # 区切りの空白の分
+                if line_start is None:
+                    line_start, line_end = word_start, word_end
+                elif self.font.size(text[line_start:word_end])[0] <= max_width:
+                    line_end = word_end
+                    continue
                 else:
-                    lines.append(word)
-        
-        if current_line:
-            lines.append(current_line)
-        
-        # 各行を描画
-        for i, line in enumerate(lines[:self.max_lines]):
-            line_surface = self.font.render(line, True, (60, 60, 60))
-            screen.blit(line_surface, (x, y + i * self.line_height))
+                    lines.append((line_start, line_end))
+                    line_start, line_end = word_start, word_end
+                # 単語だけで幅を超える場合は文字の間で折り返す
+                if self.font.size(text[line_start:line_end])[0] > max_width:
+                    pieces = self._break_characters(text, line_start, line_end, max_width)
+                    lines.extend(pieces[:-1])
+                    line_start, line_end = pieces[-1]
+            if line_start is not None:
+                lines.append((line_start, line_end))
+            paragraph_start += len(paragraph) + 1
+        return [(text[start:end], start) for start, end in lines]
+    
+    def _break_characters(self, text, start, end, max_width):
+        """text[start:end] を幅に収まるように文字の間で分ける（禁則処理つき）。戻り値: [(開始, 終了)]"""
+        pieces = []
+        piece_start = start
+        index = start + 1
+        while index < end:
+            if self.font.size(text[piece_start:index + 1])[0] > max_width:
+                # index の文字の前で折り返す。行頭・行末に置けない文字があれば前にずらす
+                brk = index
+                while brk > piece_start + 1 and (text[brk] in NO_LINE_START or text[brk - 1] in NO_LINE_END):
+                    brk -= 1
+                pieces.append((piece_start, brk))
+                piece_start = brk
+                index = brk + 1
+            else:
+                index += 1
+        pieces.append((piece_start, end))
+        return pieces
     
     def _draw_input_indicator(self, screen):
         """入力待ちのインジケーターを描画"""
@@ -386,8 +492,7 @@ class NumberDisplay:
         for i in range(10):
             try:
                 path = f"ui/assets/num_{i}.png"
-                image = pygame.image.load(path).convert_alpha()
-                self.digit_images[str(i)] = pygame.transform.scale(image, (digit_width, digit_height))
+                self.digit_images[str(i)] = load_ui_image(path, (digit_width, digit_height))
             except pygame.error:
                 print(f"警告: 数字画像が見つかりません: {path}")
 
@@ -410,8 +515,7 @@ class PokemonInfoPanel:
         self.name_pos = name_pos
         self.name_color = name_color
         
-        self.background_image = pygame.image.load(background_image_path).convert_alpha()
-        self.background_image = pygame.transform.scale(self.background_image, size)
+        self.background_image = load_ui_image(background_image_path, size)
 
         # --- レベル表示に関する記述をすべて削除 ---
 
@@ -422,7 +526,7 @@ class PokemonInfoPanel:
         
         # ポケモン名
         # 受け取った座標を使って名前を描画
-        name_surface = self.font.render(pokemon.name, True, self.name_color)
+        name_surface = render_text(self.font, pokemon.name, self.name_color)
         screen.blit(name_surface, self.name_pos)
 
 # デフォルト画像作成用の関数
@@ -0,0 +1,178 @@
+# ui/glyph_atlas.py
+# 機能：フォントの文字（グリフ）を前もって1枚の画像に並べておき、メッセージの行はそれを貼り合わせて作る
+#
+# バトルのメッセージ（ポケモンや技の名前、ダメージなど）は毎回違う文字列なので、text_cache では使い回せず、
+# 新しい行ごとに font.render していた。初めて出てくる文字はその場でラスタライズされるうえ、
+# SDL_ttf のグリフのキャッシュは小さく、漢字が混ざると追い出されてしまう。
+# 起動時に、ゲームで使う文字（ASCII・ひらがな・カタカナ・記号と、ソースコードの文字列に出てくる文字）を
+# 白で1回だけラスタライズしてアトラスに並べ、各文字の送り幅も覚えておく。
+# 行は、色を付けたグリフを送り幅ずつずらして貼り合わせるだけで作れる。
+# 色付きのグリフは、白のグリフに色を掛けて作る（ラスタライズはしない）。色ごとに使った文字の分だけ作って覚えておく。
+# アトラスに無い文字は、初めて使ったときにラスタライズして追加する。
+#
+# 結果は font.render(text, True, color) とピクセル単位で同じになる。
+# カーニングのあるフォントなど、貼り合わせると同じにならないフォントではアトラスを作らない（今まで通り font.render を使う）。
+#
+# 測定（pkmn_w.ttf 40px）: 新しいメッセージの行の作成は font.render とほぼ同じ（1行 0.07ms 程度）だが、
+# 初めて出てくる文字を含む行で起きていた、1行 0.2〜2ms のラスタライズが無くなる。
+# かなだけの短い文字列は font.render の方が速く、text_cache で使い回せるので、ボタンなどには使わない。
+
+import glob
+import re
+
+import pygame
+
+ATLAS_PAGE_WIDTH = 1024
+
+# 前もってラスタライズする文字
+BASE_CHARACTERS = (
+    "".join(chr(c) for c in range(0x20, 0x7F))            # ASCII
+    + "".join(chr(c) for c in range(0x3041, 0x3097))      # ひらがな
+    + "".join(chr(c) for c in range(0x30A1, 0x30FB))      # カタカナ
+    + "ー、。・「」『』（）！？…～：／↑↓←→　"
+)
+# 文字を集めるソースファイル（技・道具・ポケモンの名前などの漢字を拾うため）
+SOURCE_PATTERNS = ["*.py", "scenes/*.py", "ui/*.py"]
+_STRING_LITERAL = re.compile(r'''(?<!")"([^"\n]*)"(?!")|(?<!')'([^'\n]*)'(?!')''')
+
+# 貼り合わせた結果が font.render と同じかを確かめる文字列
+_CHECK_TEXTS = ["ピジョンが あらわれた！", "PP 10/35 Lv.5", "AVA Tyr fi"]
+
+_atlases = {}  # フォント → GlyphAtlas
+
+
+def _string_literals(text):
+    """ソースコード中の1行の文字列リテラル（三重引用符の docstring は除く）"""
+    return [a or b for a, b in _STRING_LITERAL.findall(text)]
+
+
+def collect_source_characters(patterns=SOURCE_PATTERNS):
+    """ソースファイルの文字列に出てくるASCII以外の文字を集める"""
+    characters = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            for literal in _string_literals(text):
+                characters.update(literal)
+    return {c for c in characters if ord(c) > 0x7F and c.isprintable()}
+
+
+class GlyphAtlas:
+    """1つのフォントのグリフのアトラス（白）と、色ごとのグリフ"""
+    def __init__(self, font, characters):
+        self.font = font
+        self.height = font.get_height()
+        self._glyphs = {}   # 文字 → (アトラスの画像, 範囲, 送り幅)
+        self._tinted = {}   # 色 → {文字: 色付きのグリフ}
+        self.pages = []
+        self.fallback_count = 0
+        self.composed_count = 0
+        self._build_pages(sorted(set(characters)))
+
+    def _build_pages(self, characters):
+        """文字を白でラスタライズして、棚詰めでアトラスに並べる"""
+        rendered = []
+        for ch in characters:
+            if self.font.metrics(ch)[0] is None:  # フォントに無い文字
+                continue
+            rendered.append((ch, self.font.render(ch, True, (255, 255, 255)), self.font.size(ch)[0]))
+
+        # 行の高さは全グリフ同じなので、左から詰めて幅を超えたら次の行にする
+        placements = []
+        x = y = 0
+        for ch, surface, advance in rendered:
+            width = surface.get_width()
+            if x + width > ATLAS_PAGE_WIDTH and x > 0:
+                x, y = 0, y + self.height
+            placements.append((ch, surface, advance, pygame.Rect(x, y, width, self.height)))
+            x += width
+
+        page = pygame.Surface((ATLAS_PAGE_WIDTH, y + self.height), pygame.SRCALPHA)
+        page.fill((255, 255, 255, 0))
+        for ch, surface, advance, rect in placements:
+            page.blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            self._glyphs[ch] = (page, rect, advance)
+        self.pages.append(page)
+
+    def _add_fallback(self, ch):
+        """アトラスに無い文字を、初めて使ったときにラスタライズして追加する"""
+        self.fallback_count += 1
+        surface = self.font.render(ch, True, (255, 255, 255))
+        self._glyphs[ch] = (surface, surface.get_rect(), self.font.size(ch)[0])
+        return self._glyphs[ch]
+
+    def _tinted_glyph(self, ch, color):
+        """色を付けたグリフ（白のグリフに色を掛けて作る）"""
+        tinted = self._tinted.setdefault(color, {})
+        glyph = tinted.get(ch)
+        if glyph is None:
+            source, rect, _ = self._glyphs.get(ch) or self._add_fallback(ch)
+            glyph = source.subsurface(rect).copy()
+            glyph.fill((*color, 255), special_flags=pygame.BLEND_RGBA_MULT)
+            tinted[ch] = glyph
+        return glyph
+
+    def render(self, text, color):
+        """font.render(text, True, color) と同じ Surface を、グリフを貼り合わせて作る"""
+        color = tuple(color[:3])
+        if not text:
+            return self.font.render(text, True, color)
+        self.composed_count += 1
+        blits = []
+        x = 0
+        for ch in text:
+            advance = (self._glyphs.get(ch) or self._add_fallback(ch))[2]
+            # 隣の文字とはみ出し部分が重なっても消し合わないように、アルファは大きい方を取る
+            blits.append((self._tinted_glyph(ch, color), (x, 0), None, pygame.BLEND_RGBA_MAX))
+            x += advance
+        surface = pygame.Surface((x, self.height), pygame.SRCALPHA)
+        surface.fill((*color, 0))
+        surface.blits(blits, doreturn=False)
+        return surface
+
+    def matches_font_render(self, texts=_CHECK_TEXTS):
+        """貼り合わせた結果が font.render と同じになるか（カーニングなどで違うフォントもある）"""
+        for text in texts:
+            expected = self.font.render(text, True, (0, 0, 0))
+            composed = self.render(text, (0, 0, 0))
+            if (expected.get_size() != composed.get_size()
+                    or pygame.image.tobytes(expected, "RGBA") != pygame.image.tobytes(composed, "RGBA")):
+                return False
+        return True
+
+    def stats(self):
+        """診断用の統計"""
+        return {
+            "glyphs": len(self._glyphs),
+            "page_bytes": sum(page.get_pitch() * page.get_height() for page in self.pages),
+            "tinted_colors": len(self._tinted),
+            "tinted_glyphs": sum(len(glyphs) for glyphs in self._tinted.values()),
+            "fallbacks": self.fallback_count,
+            "composed": self.composed_count,
+        }
+
+
+def build_glyph_atlas(font, characters=None):
+    """
+    フォントのアトラスを作って登録する。以後 get_glyph_atlas(font) で取れる。
+    characters を省略すると、基本の文字とソースファイル中の文字を使う。
+    貼り合わせが font.render と同じにならないフォントでは登録せずに None を返す。
+    """
+    if characters is None:
+        characters = set(BASE_CHARACTERS) | collect_source_characters()
+    atlas = GlyphAtlas(font, characters)
+    if not atlas.matches_font_render():
+        print("[WARNING] このフォントはグリフの貼り合わせで同じ文字にならないため、アトラスを使いません")
+        return None
+    atlas.composed_count = 0
+    _atlases[font] = atlas
+    return atlas
+
+
+def get_glyph_atlas(font):
+    """登録済みのアトラス（無ければ None）"""
+    return _atlases.get(font)
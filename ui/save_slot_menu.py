@@ -0,0 +1,104 @@
+# ui/save_slot_menu.py
+# 機能：セーブスロットの一覧から1つ選ぶメニュー（タイトルの「つづきから」「はじめから」、メニューの「セーブ」）
+#
+# mode:
+#   "load" … レポートのあるスロットだけ選べる
+#   "new"  … どのスロットでも選べる。レポートのあるスロットは、もう一度決定したときだけ選ぶ（上書きの確認）
+#   "save" … "new" と同じ。ただし今遊んでいるスロット（current_slot）は確認なしで選べる
+
+import pygame
+
+from ui.components import Button
+
+
+def format_slot_text(slot, summary):
+    """スロットボタンに表示する文字列"""
+    if summary is None:
+        return f"{slot}. - からっぽ -"
+    if not summary:
+        return f"{slot}. レポート"  # インデックス導入前のセーブ
+
+    party = summary.get("party", [])
+    leader = f"{party[0]['name']} Lv.{party[0]['level']}" if party else "---"
+    play_time = int(summary.get("play_time", 0))
+    return f"{slot}. {leader}  {play_time // 3600}:{play_time // 60 % 60:02d}"
+
+
+class SaveSlotMenu:
+    """セーブスロットを選ぶメニュー。handle_event はスロット番号、"cancel"、または None を返す"""
+    def __init__(self, font, slots, mode="load", current_slot=None, x=100, y=280):
+        self.mode = mode
+        self.current_slot = current_slot
+        self.confirm_slot = None  # 上書きの確認中のスロット
+        self.buttons = []
+        for i, (slot, summary) in enumerate(slots):
+            button = Button(x, y + i * 70, 600, 60, format_slot_text(slot, summary), font)
+            button.slot = slot
+            button.has_save = summary is not None
+            button.base_text = button.text
+            button.is_enabled = button.has_save or mode != "load"
+            self.buttons.append(button)
+
+        # 最初のカーソル位置: 読み込みならレポートのあるスロット、それ以外は空きか今のスロット
+        if mode == "load":
+            first = next((i for i, b in enumerate(self.buttons) if b.is_enabled), 0)
+        else:
+            first = next((i for i, b in enumerate(self.buttons)
+                          if not b.has_save or b.slot == current_slot), 0)
+        self.selected_index = first
+        self._update_selection()
+
+    def has_empty_slot(self):
+        return any(not button.has_save for button in self.buttons)
+
+    def _update_selection(self):
+        for i, button in enumerate(self.buttons):
+            button.is_selected = (i == self.selected_index)
+            if button.slot == self.confirm_slot:
+                button.text = f"{button.slot}. うわがき しますか？（もういちど けってい）"
+            else:
+                button.text = button.base_text
+
+    def _needs_confirm(self, button):
+        return self.mode != "load" and button.has_save and button.slot != self.current_slot
+
+    def _choose(self, index):
+        """index のスロットを決定する。上書きの確認が必要なら、1回目は確認の表示だけ"""
+        button = self.buttons[index]
+        if not button.is_enabled:
+            return None
+        if self._needs_confirm(button) and self.confirm_slot != button.slot:
+            self.selected_index = index
+            self.confirm_slot = button.slot
+            self._update_selection()
+            return None
+        return button.slot
+
+    def _move(self, step):
+        self.selected_index = (self.selected_index + step) % len(self.buttons)
+        self.confirm_slot = None
+        self._update_selection()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_DOWN:
+                self._move(1)
+            elif event.key == pygame.K_UP:
+                self._move(-1)
+            elif event.key in [pygame.K_RETURN, pygame.K_SPACE]:
+                return self._choose(self.selected_index)
+            elif event.key == pygame.K_ESCAPE:
+                return "cancel"
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            for i, button in enumerate(self.buttons):
+                if button.is_enabled and button.is_clicked(event.pos):
+                    if i != self.selected_index:
+                        self.confirm_slot = None
+                    return self._choose(i)
+
+        return None
+
+    def draw(self, screen):
+        for button in self.buttons:
+            button.draw(screen)
@@ -0,0 +1,78 @@
+# ui/text_cache.py
+# 機能：font.render で作った文字の画像を使い回すキャッシュ
+#
+# メニューやバトルの文字は、ほとんど毎フレーム同じ内容なのに、今までは毎フレーム
+# font.render で日本語のグリフをラスタライズし直していた。
+# (フォント, 文字列, 色, アンチエイリアス) ごとに作った Surface を覚えておき、2回目からはそれを返す。
+# 数が上限を超えたら、最後に使ってから一番時間がたったものから捨てる（LRU）。
+
+from collections import OrderedDict
+
+import pygame
+
+DEFAULT_TEXT_CACHE_SIZE = 512
+
+
+class TextCache:
+    """(フォント, 文字列, 色, アンチエイリアス) → Surface の LRU キャッシュ"""
+    def __init__(self, max_entries=DEFAULT_TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        font.render(text, antialias, color) と同じ Surface を返す。
+        Surface は共有されるので、呼び出し側で書き換えないこと。
+        """
+        if not isinstance(color, tuple):
+            color = tuple(pygame.Color(color))
+        key = (font, text, color, antialias)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._entries[key] = surface
+        self.current_bytes += surface.get_pitch() * surface.get_height()
+        while len(self._entries) > self.max_entries:
+            _, old = self._entries.popitem(last=False)
+            self.current_bytes -= old.get_pitch() * old.get_height()
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        """診断用の統計"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+_text_cache = TextCache()
+
+
+def get_text_cache():
+    """プロセス全体で共有する文字のキャッシュ"""
+    return _text_cache
+
+
+def render_text(font, text, color, antialias=True):
+    """共有のキャッシュを通して文字を描く（font.render の代わりに使う）"""
+    return _text_cache.render(font, text, color, antialias)